@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
-from domain.entities.account import Account
+from typing import Optional
+from domain.models.account import Account
 
 class AccountRepository(ABC):
     @abstractmethod
@@ -7,9 +8,10 @@ class AccountRepository(ABC):
         pass
     
     @abstractmethod
-    def get_account_by_id(self, account_id: str) -> Account:
+    def get_account_by_id(self, account_id: str) -> Optional[Account]:
         pass
     
     @abstractmethod
-    def update_account(self, account: Account) -> None:
-        pass
\ No newline at end of file
+    def update_account(self, account: Account, expected_version: int) -> None:
+        """Compare-and-swap: raises ConcurrentUpdateError if the stored version is no longer `expected_version`."""
+        pass
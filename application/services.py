@@ -1,11 +1,15 @@
 
 
-from typing import Protocol
-from domain.models import Account, Transaction, TransactionType # type: ignore
-from domain.exceptions import InsufficientFunds # type: ignore
+from typing import Callable, Protocol
+from domain.models import Account, Transaction
+from domain.models.account import CheckingAccount, SavingsAccount
+from domain.models.transaction import DepositTransaction, TransferTransaction, WithdrawalTransaction
+from domain.exceptions import InsufficientFunds
 import logging
 
-from domain.ports import account_repository, transaction_repository
+from application.account_repository import AccountRepository
+from application.transaction_repository import TransactionRepository
+from domain.services.optimistic_concurrency import retry_on_conflict
 
 
 class NotificationSender(Protocol):
@@ -16,72 +20,75 @@ class AccountCreationService:
     """
     Responsible for creating accounts. (In a complete solution, you might validate a minimum deposit.)
     """
-    def __init__(self, account_repository: account_repository):
+    def __init__(self, account_repository: AccountRepository):
         self.account_repository = account_repository
 
     def create_account(self, account_type: str, owner_id: str, initial_deposit: float = 0.0) -> str:
+        # An empty account id is replaced with a new UUID
         if account_type.upper() == "CHECKING":
-            from domain.models import CheckingAccount  
-            account = CheckingAccount(owner_id)
+            account = CheckingAccount("", owner_id=owner_id)
         elif account_type.upper() == "SAVINGS":
-            from domain.models import SavingsAccount
-            account = SavingsAccount(owner_id)
+            account = SavingsAccount("", owner_id=owner_id)
         else:
             raise ValueError("Unsupported account type.")
         
         if initial_deposit > 0:
-            account.balance += initial_deposit
+            account.deposit(initial_deposit)
         
         self.account_repository.create_account(account)
         return account.account_id
 
 
 class TransactionService:
-    def __init__(self, account_repository: account_repository,
-                 transaction_repository: transaction_repository,
+    def __init__(self, account_repository: AccountRepository,
+                 transaction_repository: TransactionRepository,
                  notification_sender: NotificationSender):
         self.account_repository = account_repository
         self.transaction_repository = transaction_repository
         self.notification_sender = notification_sender
 
+    def _update(self, account_id: str, operation: Callable[[Account], Transaction]) -> Transaction:
+        """Apply `operation` to the stored account, re-reading and retrying if a concurrent write wins."""
+        return retry_on_conflict(
+            lambda: self.account_repository.get_account_by_id(account_id),
+            operation,
+            self.account_repository.update_account,
+        )
+
     def deposit(self, account_id: str, amount: float) -> Transaction:
-        account = self.account_repository.get_account_by_id(account_id)
-        if account is None:
+        if self.account_repository.get_account_by_id(account_id) is None:
             raise ValueError("Account not found.")
         if amount <= 0:
             raise ValueError("Deposit amount must be positive.")
-        account.balance += amount
-        txn = Transaction(
-            transaction_type=TransactionType.DEPOSIT,
-            amount=amount,
-            account_id=account.account_id,
-            description="Deposit"
-        )
-        account.add_transaction(txn)
+
+        def apply(account: Account) -> Transaction:
+            txn = DepositTransaction(amount, account.account_id)
+            txn.description = "Deposit"
+            account.deposit(amount, txn)
+            return txn
+
+        txn = self._update(account_id, apply)
         self.transaction_repository.save_transaction(txn)
         self._notify(txn)
         logging.info("Deposit processed: %s", txn)
-        self.account_repository.update_account(account)
         return txn
 
     def withdraw(self, account_id: str, amount: float) -> Transaction:
-        account = self.account_repository.get_account_by_id(account_id)
-        if account is None:
+        if self.account_repository.get_account_by_id(account_id) is None:
             raise ValueError("Account not found.")
-        if not account.can_withdraw(amount):
-            raise InsufficientFunds("Insufficient funds or withdrawal not permitted.")
-        account.balance -= amount
-        txn = Transaction(
-            transaction_type=TransactionType.WITHDRAWAL,
-            amount=amount,
-            account_id=account.account_id,
-            description="Withdrawal"
-        )
-        account.add_transaction(txn)
+
+        def apply(account: Account) -> Transaction:
+            # Checked against the copy being written, so a retry sees the latest balance
+            txn = WithdrawalTransaction(amount, account.account_id)
+            txn.description = "Withdrawal"
+            if not account.withdraw(amount, txn):
+                raise InsufficientFunds("Insufficient funds or withdrawal not permitted.")
+            return txn
+
+        txn = self._update(account_id, apply)
         self.transaction_repository.save_transaction(txn)
         self._notify(txn)
         logging.info("Withdrawal processed: %s", txn)
-        self.account_repository.update_account(account)
         return txn
 
     def transfer(self, source_account_id: str, destination_account_id: str, amount: float) -> Transaction:
@@ -92,25 +99,24 @@ class TransactionService:
         if not source.can_withdraw(amount):
             raise InsufficientFunds("Source account cannot withdraw the requested amount.")
 
-        
-        self.withdraw(source_account_id, amount)
-        self.deposit(destination_account_id, amount)
-        
-        txn = Transaction(
-            transaction_type=TransactionType.TRANSFER,
-            amount=amount,
-            account_id=source.account_id,  
-            source_account_id=source.account_id,
-            destination_account_id=destination.account_id,
-            description=f"Transfer from {source.account_id} to {destination.account_id}"
-        )
-        source.add_transaction(txn)
-        destination.add_transaction(txn)
+        txn = TransferTransaction(amount, source.account_id, destination.account_id)
+        txn.description = f"Transfer from {source.account_id} to {destination.account_id}"
+
+        def debit(account: Account) -> Transaction:
+            if not account.withdraw(amount, txn):
+                raise InsufficientFunds("Source account cannot withdraw the requested amount.")
+            return txn
+
+        def credit(account: Account) -> Transaction:
+            account.deposit(amount, txn)
+            return txn
+
+        # The debit re-checks funds on the copy it writes, so the credit after it cannot fail
+        self._update(source_account_id, debit)
+        self._update(destination_account_id, credit)
         self.transaction_repository.save_transaction(txn)
         self._notify(txn)
         logging.info("Transfer processed: %s", txn)
-        self.account_repository.update_account(source)
-        self.account_repository.update_account(destination)
         return txn
 
     def _notify(self, txn: Transaction) -> None:
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from domain.entities.transaction import Transaction
+from domain.models.transaction import Transaction
 
 class TransactionRepository(ABC):
     @abstractmethod
@@ -8,4 +8,4 @@ class TransactionRepository(ABC):
     
     @abstractmethod
     def get_transactions_for_account(self, account_id: str) -> list[Transaction]:
-        pass
\ No newline at end of file
+        pass
@@ -0,0 +1,2 @@
+class InsufficientFunds(ValueError):
+    """Raised when a withdrawal or transfer would take an account below its minimum balance."""
@@ -3,7 +3,10 @@ from datetime import timedelta
 from decimal import Decimal
 from typing import Optional
 from domain.models.account import Account
+from domain.models.money import Money
 from domain.models.transaction import Transaction
+from domain.services.metrics_service import instrumented
+from domain.services.tracing import traced
 
 
 class FraudDetectionResult:
@@ -27,10 +30,10 @@ class FraudDetectionHandler(ABC):
 class HighAmountCheck(FraudDetectionHandler):
     def __init__(self, threshold: Decimal, next_handler: Optional[FraudDetectionHandler] = None):
         super().__init__(next_handler)
-        self._threshold = threshold
+        self._threshold = Money.of(threshold)
 
     def handle(self, transaction: Transaction, account: Account) -> FraudDetectionResult:
-        if Decimal(str(transaction.amount)) > self._threshold:
+        if Money.of(transaction.amount) > self._threshold:
             return FraudDetectionResult(
                 True,
                 f"Transaction amount {transaction.amount} exceeds threshold {self._threshold}"
@@ -75,5 +78,7 @@ class FraudDetectionService:
             )
         )
 
+    @instrumented("fraud_check", outcome=lambda result: "flagged" if result.is_fraud else "clean")
+    @traced("fraud_check")
     def check_transaction(self, transaction: Transaction, account: Account) -> FraudDetectionResult:
         return self._handler.handle(transaction, account)
\ No newline at end of file
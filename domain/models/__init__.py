@@ -2,17 +2,15 @@
 Banking domain models package.
 
 Exposes the core domain entities for import like:
-from models import Account, Transaction
+from domain.models import Account, Transaction
 """
 
-from ..entities.account import Account,AccountStatus
-from domain.entities.transaction import Transaction, TransactionType
-from domain.services.account_service import AccountService
+from domain.models.account import Account, AccountStatus
+from domain.models.transaction import Transaction, TransactionType
 
 __all__ = [
     'Account',
     'AccountStatus',
     'Transaction',
     'TransactionType',
-    'AccountService'
-]
\ No newline at end of file
+]
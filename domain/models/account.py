@@ -1,8 +1,13 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from datetime import datetime
 from enum import Enum
-from typing import Optional
+from typing import List, Optional, Union
 import uuid
 
+from domain.models.history import TransactionHistory
+from domain.models.money import Money, ZERO
+from domain.models.transaction import DepositTransaction, Transaction, WithdrawalTransaction
+
 class AccountType(Enum):
     CHECKING = "checking"
     SAVINGS = "savings"
@@ -15,47 +20,91 @@ class AccountStatus(Enum):
 @dataclass
 class Account:
     account_id: str
-    _balance: float = 0.0
+    _balance: Money = ZERO  # Floats and Decimals passed in are converted once, in __post_init__
     _account_type: AccountType = AccountType.CHECKING
     owner_id: Optional[str] = None
     status: AccountStatus = AccountStatus.ACTIVE
     minimum_balance: float = 0.0
-    interest_accrued: float = 0.0  # Track total interest accrued
+    interest_accrued: float = 0.0  # Track total interest accrued, kept to whole cents
+    version: int = 0  # Incremented on every balance change
+    _history: TransactionHistory = field(init=False, repr=False, compare=False)
 
     def __post_init__(self):
         if not self.account_id:
             self.account_id = str(uuid.uuid4())
-        self._balance = float(self._balance)
+        self._balance = Money.of(self._balance)
+        self.interest_accrued = float(Money.of(self.interest_accrued))
+        self._history = TransactionHistory(self._balance)
 
     @property
     def balance(self) -> float:
+        return float(self._balance)
+
+    @property
+    def money_balance(self) -> Money:
         return self._balance
 
-    def deposit(self, amount: float) -> bool:
-        if amount > 0:
+    @property
+    def account_type(self) -> AccountType:
+        return self._account_type
+
+    @property
+    def transaction_history(self) -> TransactionHistory:
+        return self._history
+
+    def get_transaction_history(self) -> List[Transaction]:
+        return list(self._history)
+
+    def balance_as_of(self, timestamp: datetime) -> Money:
+        """Balance after every transaction recorded at or before `timestamp`."""
+        return self._history.balance_as_of(timestamp)
+
+    def deposit(self, amount: Union[Money, float], transaction: Optional[Transaction] = None) -> bool:
+        """Credit the account and record it in the history under `transaction` (a plain deposit if omitted)."""
+        amount = Money.of(amount)
+        if amount.cents > 0:
             self._balance += amount
+            self.version += 1
+            self._history.append(transaction or DepositTransaction(float(amount), self.account_id), amount)
             return True
         return False
 
-    def withdraw(self, amount: float) -> bool:
-        if amount > 0 and self._balance - amount >= self.minimum_balance:
+    def withdraw(self, amount: Union[Money, float], transaction: Optional[Transaction] = None) -> bool:
+        """Debit the account and record it in the history under `transaction` (a plain withdrawal if omitted)."""
+        amount = Money.of(amount)
+        if amount.cents > 0 and self._balance - amount >= Money.of(self.minimum_balance):
             self._balance -= amount
+            self.version += 1
+            self._history.append(transaction or WithdrawalTransaction(float(amount), self.account_id), -amount)
             return True
         return False
 
-    def can_withdraw(self, amount: float) -> bool:
-        return amount > 0 and self._balance - amount >= self.minimum_balance
+    def revert(self, transaction: Transaction) -> None:
+        """Undo a deposit or withdrawal recorded under `transaction`, leaving no entry of it in the history."""
+        self._balance -= self._history.remove(transaction)
+        self.version += 1  # never reused, so a version still names exactly one state
 
-    def prepare_for_transfer(self, amount: float) -> bool:
+    def can_withdraw(self, amount: Union[Money, float]) -> bool:
+        amount = Money.of(amount)
+        return amount.cents > 0 and self._balance - amount >= Money.of(self.minimum_balance)
+
+    def prepare_for_transfer(self, amount: Union[Money, float]) -> bool:
         return self.can_withdraw(amount)
 
-    def complete_transfer(self, amount: float) -> bool:
-        return self.deposit(amount)
+    def complete_transfer(self, amount: Union[Money, float], transaction: Optional[Transaction] = None) -> bool:
+        return self.deposit(amount, transaction)
+
+    def record_interest(self, amount: Union[Money, float]) -> None:
+        """Track interest that has already been credited through a transaction."""
+        self.interest_accrued = float(Money.of(self.interest_accrued) + Money.of(amount))
 
-    def add_interest(self, amount: float) -> None:
+    def add_interest(self, amount: Union[Money, float]) -> None:
         """Add interest to the account and track it."""
-        self.interest_accrued += amount
-        self.deposit(amount)
+        amount = Money.of(amount)
+        self.record_interest(amount)
+        transaction = DepositTransaction(float(amount), self.account_id)
+        transaction.is_interest = True
+        self.deposit(amount, transaction)
 
 @dataclass
 class CheckingAccount(Account):
@@ -63,4 +112,5 @@ class CheckingAccount(Account):
 
 @dataclass
 class SavingsAccount(Account):
+    _account_type: AccountType = AccountType.SAVINGS
     minimum_balance: float = 100.0
\ No newline at end of file
@@ -0,0 +1,112 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import Enum
+from typing import Optional
+
+from domain.models.money import Money, ZERO
+
+
+class AccountEventType(Enum):
+    OPENED = "opened"
+    DEPOSITED = "deposited"
+    WITHDRAWN = "withdrawn"
+    TRANSFERRED_OUT = "transferred_out"
+    TRANSFERRED_IN = "transferred_in"
+    INTEREST_POSTED = "interest_posted"
+
+
+_DEBITS = {AccountEventType.WITHDRAWN, AccountEventType.TRANSFERRED_OUT}
+
+
+@dataclass(frozen=True)
+class AccountEvent:
+    """One balance change on one account. A transfer is two events sharing a transaction_id.
+
+    An OPENED event also carries the account's type and owner.
+    """
+    sequence: int
+    account_id: str
+    event_type: AccountEventType
+    amount: Money
+    timestamp: datetime
+    transaction_id: Optional[str] = None
+    related_account: Optional[str] = None
+    account_type: Optional[str] = None
+    owner_id: Optional[str] = None
+
+    @property
+    def signed_amount(self) -> Money:
+        return -self.amount if self.event_type in _DEBITS else self.amount
+
+    def to_record(self) -> dict:
+        record = {
+            "seq": self.sequence,
+            "account": self.account_id,
+            "type": self.event_type.value,
+            "cents": self.amount.cents,
+            "ts": self.timestamp.isoformat(),
+            "txn": self.transaction_id,
+            "related": self.related_account,
+        }
+        if self.event_type == AccountEventType.OPENED:
+            record["kind"] = self.account_type
+            record["owner"] = self.owner_id
+        return record
+
+    @classmethod
+    def from_record(cls, record: dict) -> "AccountEvent":
+        return cls(
+            sequence=record["seq"],
+            account_id=record["account"],
+            event_type=AccountEventType(record["type"]),
+            amount=Money(record["cents"]),
+            timestamp=datetime.fromisoformat(record["ts"]),
+            transaction_id=record.get("txn"),
+            related_account=record.get("related"),
+            account_type=record.get("kind"),
+            owner_id=record.get("owner"),
+        )
+
+
+@dataclass
+class AccountState:
+    """An account's balance, accrued interest and opening details as derived from its events.
+
+    A state can exist before its OPENED event: an import may post a transfer
+    to an account whose own first row comes later.
+    """
+    account_id: str
+    balance: Money = ZERO
+    interest_accrued: Money = ZERO
+    last_sequence: int = 0
+    event_count: int = field(default=0)
+    opened: bool = False
+    account_type: Optional[str] = None
+    owner_id: Optional[str] = None
+
+    def apply(self, event: AccountEvent) -> None:
+        self.balance += event.signed_amount
+        if event.event_type == AccountEventType.INTEREST_POSTED:
+            self.interest_accrued += event.amount
+        elif event.event_type == AccountEventType.OPENED:
+            self.opened = True
+            self.account_type = event.account_type
+            self.owner_id = event.owner_id
+        self.last_sequence = event.sequence
+        self.event_count += 1
+
+    def to_record(self) -> dict:
+        return {
+            "balance": self.balance.cents,
+            "interest": self.interest_accrued.cents,
+            "seq": self.last_sequence,
+            "events": self.event_count,
+            "opened": self.opened,
+            "kind": self.account_type,
+            "owner": self.owner_id,
+        }
+
+    @classmethod
+    def from_record(cls, account_id: str, record: dict) -> "AccountState":
+        return cls(account_id, Money(record["balance"]), Money(record["interest"]), record["seq"], record["events"],
+                   record.get("opened", True), record.get("kind"), record.get("owner"))
@@ -0,0 +1,121 @@
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import Iterator, List, Tuple
+
+from domain.models.money import Money, MoneyArray, ZERO
+from domain.models.transaction import Transaction
+
+
+DEFAULT_CHECKPOINT_INTERVAL = 64
+
+
+class TransactionHistory:
+    """An account's transactions in timestamp order, with periodic balance checkpoints.
+
+    Amounts are kept as integer cents in a MoneyArray, signed from the account's point of view (credits positive, debits
+    negative). Every `checkpoint_interval` entries the running balance is
+    kept, so the balance at any position is a checkpoint plus a replay of
+    fewer than `checkpoint_interval` amounts, and the balance at any moment
+    is a bisect on the timestamp column on top of that.
+    """
+    def __init__(self, opening_balance: Money = ZERO,
+                 checkpoint_interval: int = DEFAULT_CHECKPOINT_INTERVAL):
+        self._opening_balance = opening_balance
+        self._interval = checkpoint_interval
+        self._timestamps: List[datetime] = []
+        self._transactions: List[Transaction] = []
+        self._amounts = MoneyArray()
+        # _checkpoints[k] is the balance in cents after the first k * interval entries
+        self._checkpoints: List[int] = [opening_balance.cents]
+        self._closing_balance = opening_balance
+
+    def __deepcopy__(self, memo) -> "TransactionHistory":
+        """Copy the columns but share the posted transactions, which are records and never change."""
+        copied = TransactionHistory.__new__(TransactionHistory)
+        copied.__dict__.update(self.__dict__)
+        copied._timestamps = self._timestamps[:]
+        copied._transactions = self._transactions[:]
+        copied._amounts = MoneyArray()
+        copied._amounts.cents = self._amounts.cents[:]
+        copied._checkpoints = self._checkpoints[:]
+        memo[id(self)] = copied
+        return copied
+
+    def __len__(self) -> int:
+        return len(self._transactions)
+
+    def __iter__(self) -> Iterator[Transaction]:
+        return iter(self._transactions)
+
+    def __getitem__(self, index):
+        """Transactions by position or slice, so the history can be bisected and paged in place."""
+        return self._transactions[index]
+
+    @property
+    def opening_balance(self) -> Money:
+        return self._opening_balance
+
+    @property
+    def closing_balance(self) -> Money:
+        return self._closing_balance
+
+    def append(self, transaction: Transaction, amount: Money) -> None:
+        """Record `amount`, signed from this account's point of view."""
+        timestamp = transaction.timestamp
+        self._closing_balance += amount
+        if not self._timestamps or timestamp >= self._timestamps[-1]:
+            self._timestamps.append(timestamp)
+            self._transactions.append(transaction)
+            self._amounts.append(amount)
+        else:
+            # Back-dated entry: every checkpoint past it now covers one different amount
+            index = bisect_right(self._timestamps, timestamp)
+            self._timestamps.insert(index, timestamp)
+            self._transactions.insert(index, transaction)
+            self._amounts.insert(index, amount)
+            for k in range(index // self._interval + 1, len(self._checkpoints)):
+                self._checkpoints[k] += amount.cents - self._amounts.cents[k * self._interval]
+        if len(self._amounts) % self._interval == 0:
+            self._checkpoints.append(self._closing_balance.cents)
+
+    def remove(self, transaction: Transaction) -> Money:
+        """Take back the entry recorded under `transaction` as if it had never been appended; returns its amount."""
+        index = bisect_right(self._timestamps, transaction.timestamp) - 1
+        while index >= 0 and self._transactions[index] is not transaction:
+            index -= 1
+        if index < 0:
+            raise ValueError(f"Transaction {transaction.transaction_id} is not in this history")
+        length = len(self._amounts)
+        if length % self._interval == 0:
+            self._checkpoints.pop()  # the checkpoint this entry's append completed
+        amount = self._amounts.cents[index]
+        # Every checkpoint past it now covers the amount that slides into its range instead
+        for k in range(index // self._interval + 1, len(self._checkpoints)):
+            self._checkpoints[k] += self._amounts.cents[k * self._interval] - amount
+        del self._timestamps[index]
+        del self._transactions[index]
+        self._amounts.pop(index)
+        self._closing_balance -= Money(amount)
+        return Money(amount)
+
+    def bounds(self, start: datetime, end: datetime) -> Tuple[int, int]:
+        """Index range [lo, hi) of the transactions with start <= timestamp <= end."""
+        return bisect_left(self._timestamps, start), bisect_right(self._timestamps, end)
+
+    def balance_before(self, index: int) -> Money:
+        """Balance just before the transaction at `index` (or after the last one if index == len)."""
+        checkpoint = index // self._interval
+        return Money(self._checkpoints[checkpoint] + sum(self._amounts.cents[checkpoint * self._interval:index]))
+
+    def balance_as_of(self, timestamp: datetime) -> Money:
+        """Balance after every transaction recorded at or before `timestamp`."""
+        return self.balance_before(bisect_right(self._timestamps, timestamp))
+
+    def entries(self, lo: int = 0, hi: int = None) -> Iterator[Tuple[Transaction, Money, Money]]:
+        """(transaction, signed amount, balance after) for positions lo..hi-1."""
+        hi = len(self._transactions) if hi is None else hi
+        cents = self._amounts.cents
+        balance = self.balance_before(lo).cents
+        for i in range(lo, hi):
+            balance += cents[i]
+            yield self._transactions[i], Money(cents[i]), Money(balance)
@@ -0,0 +1,86 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import Enum
+from typing import Dict, Optional, Tuple
+import uuid
+
+from domain.models.money import Money
+from domain.models.transaction import Transaction, TransferTransaction
+
+
+class EntrySide(Enum):
+    DEBIT = "debit"    # money leaves the customer account
+    CREDIT = "credit"  # money arrives in the customer account
+
+
+@dataclass(frozen=True)
+class JournalLine:
+    account_id: str
+    side: EntrySide
+    amount: Money
+
+
+@dataclass(frozen=True)
+class JournalEntry:
+    """One balanced posting: its debit lines and credit lines total the same amount."""
+    lines: Tuple[JournalLine, ...]
+    entry_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    timestamp: datetime = field(default_factory=datetime.now)
+    description: Optional[str] = None
+    transaction: Optional[Transaction] = None  # recorded in each account's history, when given
+
+    def __post_init__(self):
+        if len(self.lines) < 2:
+            raise ValueError("A journal entry needs at least two lines")
+        if any(line.amount.cents <= 0 for line in self.lines):
+            raise ValueError("Journal line amounts must be positive")
+        if self.total(EntrySide.DEBIT) != self.total(EntrySide.CREDIT):
+            raise ValueError("Journal entry does not balance")
+
+    def total(self, side: EntrySide) -> Money:
+        return Money(sum(line.amount.cents for line in self.lines if line.side == side))
+
+    def net_by_account(self) -> Dict[str, int]:
+        """Signed cents per account, credits positive."""
+        net: Dict[str, int] = {}
+        for line in self.lines:
+            cents = line.amount.cents if line.side == EntrySide.CREDIT else -line.amount.cents
+            net[line.account_id] = net.get(line.account_id, 0) + cents
+        return net
+
+    @classmethod
+    def transfer(cls, source_account_id: str, destination_account_id: str, amount: Money,
+                 transaction: Optional[Transaction] = None) -> "JournalEntry":
+        if source_account_id == destination_account_id:
+            raise ValueError("Cannot transfer to the same account")
+        transaction = transaction or TransferTransaction(float(amount), source_account_id, destination_account_id)
+        return cls(
+            lines=(
+                JournalLine(source_account_id, EntrySide.DEBIT, amount),
+                JournalLine(destination_account_id, EntrySide.CREDIT, amount),
+            ),
+            entry_id=transaction.transaction_id,
+            timestamp=transaction.timestamp,
+            description=f"Transfer {source_account_id} -> {destination_account_id}",
+            transaction=transaction,
+        )
+
+
+@dataclass(frozen=True)
+class TrialBalance:
+    total_debits: Money
+    total_credits: Money
+    entries: int
+    # The same totals as the account balances actually moved, when known
+    account_debits: Optional[Money] = None
+    account_credits: Optional[Money] = None
+
+    @property
+    def is_reconciled(self) -> bool:
+        if self.account_debits is None or self.account_credits is None:
+            return True
+        return self.account_debits == self.total_debits and self.account_credits == self.total_credits
+
+    @property
+    def is_balanced(self) -> bool:
+        return self.total_debits == self.total_credits and self.is_reconciled
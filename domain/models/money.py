@@ -0,0 +1,176 @@
+from array import array
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Iterable, Iterator, Union
+
+# Floats within this many cents of a whole cent are taken as that cent; anything
+# further out carries sub-cent digits and is rounded through Decimal instead.
+_FLOAT_CENT_TOLERANCE = 1e-6
+
+
+class Money:
+    """A fixed-point amount held as an integer number of cents.
+
+    Addition, subtraction and comparison are plain int operations. Rounding
+    only happens when an amount is created from a value with sub-cent digits
+    or multiplied by a rate, and the rounding mode is explicit there
+    (ROUND_HALF_UP, as the interest strategies use, unless given).
+    """
+    __slots__ = ("_cents",)
+
+    def __init__(self, cents: int = 0):
+        self._cents = cents
+
+    @classmethod
+    def of(cls, value: Union["Money", int, float, str, Decimal], rounding: str = ROUND_HALF_UP) -> "Money":
+        """Convert a float, int, Decimal or decimal string in major units (dollars)."""
+        if isinstance(value, Money):
+            return value
+        if isinstance(value, float):
+            scaled = value * 100
+            cents = round(scaled)
+            if abs(scaled - cents) < _FLOAT_CENT_TOLERANCE:
+                return cls(cents)
+            value = Decimal(repr(value))
+        elif isinstance(value, int):
+            return cls(value * 100)
+        elif isinstance(value, str):
+            return cls._parse(value, rounding)
+        return cls(int((value * 100).to_integral_value(rounding=rounding)))
+
+    @classmethod
+    def _parse(cls, text: str, rounding: str) -> "Money":
+        text = text.strip()
+        whole, dot, fraction = text.lstrip("+-").partition(".")
+        whole_ok = whole.isdigit() or (dot and not whole)
+        fraction_ok = not dot or (fraction.isdigit() and len(fraction) <= 2)
+        if whole_ok and fraction_ok:
+            cents = int(whole or "0") * 100 + (int(fraction.ljust(2, "0")) if dot else 0)
+            return cls(-cents if text.startswith("-") else cents)
+        return cls(int((Decimal(text) * 100).to_integral_value(rounding=rounding)))
+
+    @property
+    def cents(self) -> int:
+        return self._cents
+
+    def to_decimal(self) -> Decimal:
+        return Decimal(self._cents).scaleb(-2)
+
+    def multiply(self, factor: Union[int, Decimal, float], rounding: str = ROUND_HALF_UP) -> "Money":
+        """Scale by a rate or ratio, rounding the result to the cent."""
+        if isinstance(factor, int):
+            return Money(self._cents * factor)
+        if isinstance(factor, float):
+            factor = Decimal(repr(factor))
+        return Money(int((self._cents * factor).to_integral_value(rounding=rounding)))
+
+    def __add__(self, other: "Money") -> "Money":
+        if isinstance(other, Money):
+            return Money(self._cents + other._cents)
+        return NotImplemented
+
+    def __radd__(self, other) -> "Money":
+        # Lets sum() start from its default 0
+        if other == 0:
+            return self
+        return NotImplemented
+
+    def __sub__(self, other: "Money") -> "Money":
+        if isinstance(other, Money):
+            return Money(self._cents - other._cents)
+        return NotImplemented
+
+    def __mul__(self, factor: int) -> "Money":
+        if isinstance(factor, int):
+            return Money(self._cents * factor)
+        return NotImplemented
+
+    __rmul__ = __mul__
+
+    def __neg__(self) -> "Money":
+        return Money(-self._cents)
+
+    def __abs__(self) -> "Money":
+        return Money(abs(self._cents))
+
+    def __bool__(self) -> bool:
+        return self._cents != 0
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Money):
+            return self._cents == other._cents
+        return NotImplemented
+
+    def __lt__(self, other: "Money") -> bool:
+        if isinstance(other, Money):
+            return self._cents < other._cents
+        return NotImplemented
+
+    def __le__(self, other: "Money") -> bool:
+        if isinstance(other, Money):
+            return self._cents <= other._cents
+        return NotImplemented
+
+    def __gt__(self, other: "Money") -> bool:
+        if isinstance(other, Money):
+            return self._cents > other._cents
+        return NotImplemented
+
+    def __ge__(self, other: "Money") -> bool:
+        if isinstance(other, Money):
+            return self._cents >= other._cents
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self._cents)
+
+    def __float__(self) -> float:
+        return self._cents / 100
+
+    def __str__(self) -> str:
+        whole, fraction = divmod(abs(self._cents), 100)
+        return f"{'-' if self._cents < 0 else ''}{whole}.{fraction:02d}"
+
+    def __format__(self, spec: str) -> str:
+        if not spec or spec == ".2f":
+            return str(self)
+        return format(self.to_decimal(), spec)
+
+    def __repr__(self) -> str:
+        return f"Money('{self}')"
+
+
+ZERO = Money(0)
+
+
+class MoneyArray:
+    """A growable column of amounts stored as int64 cents.
+
+    The `cents` array supports the buffer protocol, so it can be handed to
+    numpy (numpy.frombuffer(column.cents, dtype="int64")) or Arrow without a
+    copy; totals over ranges are C-level int sums.
+    """
+    __slots__ = ("cents",)
+
+    def __init__(self, values: Iterable[Money] = ()):
+        self.cents = array("q", (value.cents for value in values))
+
+    def __len__(self) -> int:
+        return len(self.cents)
+
+    def __getitem__(self, index: int) -> Money:
+        return Money(self.cents[index])
+
+    def __iter__(self) -> Iterator[Money]:
+        return map(Money, self.cents)
+
+    def append(self, value: Money) -> None:
+        self.cents.append(value.cents)
+
+    def insert(self, index: int, value: Money) -> None:
+        self.cents.insert(index, value.cents)
+
+    def pop(self, index: int = -1) -> Money:
+        return Money(self.cents.pop(index))
+
+    def total(self, start: int = 0, stop: int = None) -> Money:
+        return Money(sum(self.cents[start:stop]))
@@ -2,6 +2,8 @@
 from abc import ABC, abstractmethod
 from typing import Dict, List
 
+from domain.services.metrics_service import instrumented
+
 
 class Notification(ABC):
     @abstractmethod
@@ -40,6 +42,7 @@ class NotificationService:
                 n for n in self._subscribers[account_id] if n != notification
             ]
 
+    @instrumented("notification_dispatch", outcome=lambda _: "sent")
     def notify(self, account_id: str, message: str) -> None:
         if account_id in self._subscribers:
             for notification in self._subscribers[account_id]:
@@ -1,8 +1,11 @@
-from typing import List
+from typing import List, Optional
 import logging
 from domain.models.account import Account, AccountType, CheckingAccount, SavingsAccount
+from domain.models.journal import JournalEntry
+from domain.models.money import Money
 from domain.models.notifications import NotificationService
 from domain.models.transaction import Transaction, TransactionType
+from domain.services.posting_engine import PostingEngine
 
 
 class AccountService:
@@ -35,8 +38,9 @@ class TransactionService:
 
 # Transfer-specific domain service
 class TransferService:
-    def __init__(self, notification_service: NotificationService):
+    def __init__(self, notification_service: NotificationService, posting_engine: Optional[PostingEngine] = None):
         self._notification_service = notification_service
+        self._posting_engine = posting_engine or PostingEngine()
         self._logger = logging.getLogger('banking.transfer')
 
     def transfer(
@@ -56,28 +60,12 @@ class TransferService:
         )
 
         try:
-            # Withdraw from source
-            source_account.withdraw(amount)
-            
-            # Deposit to destination
-            destination_account.deposit(amount)
-
-            # Create transfer transactions
-            source_tx = Transaction(
-                transaction_type=TransactionType.TRANSFER,
-                amount=amount,
-                account_id=source_account.account_id,
-                related_account_id=destination_account.account_id
-            )
-            destination_tx = Transaction(
-                transaction_type=TransactionType.TRANSFER,
-                amount=amount,
-                account_id=destination_account.account_id,
-                related_account_id=source_account.account_id
-            )
-            
-            source_account._transactions.append(source_tx)
-            destination_account._transactions.append(destination_tx)
+            # Withdrawal and deposit post together as one balanced entry
+            entry = JournalEntry.transfer(source_account.account_id, destination_account.account_id, Money.of(amount))
+            self._posting_engine.post(entry, accounts={
+                source_account.account_id: source_account,
+                destination_account.account_id: destination_account,
+            })
 
             # Notify both accounts
             self._notification_service.notify(
@@ -1,18 +1,19 @@
 import csv
+import io
 from dataclasses import dataclass
-from decimal import Decimal
-from typing import List
-from datetime import date, datetime, timedelta
+from typing import List, TextIO
+from datetime import date, datetime, time, timedelta
 
 from domain.models.account import Account
+from domain.models.money import Money, ZERO
 from domain.models.transaction import TransactionType
 
 @dataclass
 class StatementLineItem:
     date: datetime
     description: str
-    amount: Decimal
-    balance: Decimal
+    amount: Money
+    balance: Money
 
 @dataclass
 class MonthlyStatement:
@@ -20,9 +21,9 @@ class MonthlyStatement:
     account_type: str
     start_date: date
     end_date: date
-    opening_balance: Decimal
-    closing_balance: Decimal
-    interest_earned: Decimal
+    opening_balance: Money
+    closing_balance: Money
+    interest_earned: Money
     transactions: List[StatementLineItem]
 
 class StatementGenerator:
@@ -33,52 +34,31 @@ class StatementGenerator:
         else:
             end_date = date(year, month + 1, 1) - timedelta(days=1)
 
-        # Calculate interest up to statement date
-        account.calculate_interest(end_date)
+        # Locate the period in the time-ordered history; earlier months are never touched
+        history = account.transaction_history
+        lo, hi = history.bounds(datetime.combine(start_date, time.min), datetime.combine(end_date, time.max))
+        opening_balance = history.balance_before(lo)
 
-        # Filter transactions for the statement period
-        statement_transactions = [
-            tx for tx in account.get_transaction_history()
-            if start_date <= tx.timestamp.date() <= end_date
-        ]
-
-        # Sort transactions by date
-        statement_transactions.sort(key=lambda tx: tx.timestamp)
-
-        # Calculate opening balance (balance before first transaction of the month)
-        opening_balance = Decimal(str(account.balance))
-        for tx in reversed(statement_transactions):
-            if tx.transaction_type == TransactionType.DEPOSIT:
-                opening_balance -= Decimal(str(tx.amount))
-            elif tx.transaction_type == TransactionType.WITHDRAW:
-                opening_balance += Decimal(str(tx.amount))
-            elif tx.transaction_type == TransactionType.TRANSFER:
-                if tx.account_id == account.account_id:
-                    opening_balance += Decimal(str(tx.amount))
-
-        # Generate line items
+        # Amounts and running balances are already Money and signed for this account
         line_items = []
-        running_balance = opening_balance
-        for tx in statement_transactions:
+        interest_earned = ZERO
+        for tx, amount, balance in history.entries(lo, hi):
             if tx.transaction_type == TransactionType.DEPOSIT:
-                running_balance += Decimal(str(tx.amount))
-                desc = "Deposit"
+                desc = "Interest" if tx.is_interest else "Deposit"
             elif tx.transaction_type == TransactionType.WITHDRAW:
-                running_balance -= Decimal(str(tx.amount))
                 desc = "Withdrawal"
-            elif tx.transaction_type == TransactionType.TRANSFER:
-                if tx.account_id == account.account_id:
-                    running_balance -= Decimal(str(tx.amount))
-                    desc = f"Transfer to {tx.related_account_id}"
-                else:
-                    running_balance += Decimal(str(tx.amount))
-                    desc = f"Transfer from {tx.related_account_id}"
+            elif amount.cents < 0:
+                desc = f"Transfer to {tx.related_account}"
+            else:
+                desc = f"Transfer from {tx.account_id}"
+            if tx.is_interest:
+                interest_earned += amount
 
             line_items.append(StatementLineItem(
                 date=tx.timestamp,
                 description=desc,
-                amount=Decimal(str(tx.amount)),
-                balance=running_balance
+                amount=abs(amount),
+                balance=balance
             ))
 
         return MonthlyStatement(
@@ -87,50 +67,59 @@ class StatementGenerator:
             start_date=start_date,
             end_date=end_date,
             opening_balance=opening_balance,
-            closing_balance=Decimal(str(account.balance)),
-            interest_earned=account.get_interest_earned(),
+            closing_balance=history.balance_before(hi),
+            interest_earned=interest_earned,
             transactions=line_items
         )
 
 
 class CSVStatementExporter:
-       def export(self, statement: MonthlyStatement, filename: str) -> None:
+    def export(self, statement: MonthlyStatement, filename: str) -> None:
         """Generate a detailed CSV statement"""
         with open(filename, mode='w', newline='') as csvfile:
-            writer = csv.writer(csvfile)
-            
-            # Write header
-            writer.writerow([
-                "Account ID", "Account Type", 
-                "Statement Start Date", "Statement End Date",
-                "Opening Balance", "Closing Balance",
-                "Interest Earned"
-            ])
-            
-            # Write account summary
+            self.write(statement, csvfile)
+
+    def write(self, statement: MonthlyStatement, csvfile: TextIO) -> None:
+        """Write the statement to an open text stream"""
+        writer = csv.writer(csvfile)
+
+        # Write header
+        writer.writerow([
+            "Account ID", "Account Type",
+            "Statement Start Date", "Statement End Date",
+            "Opening Balance", "Closing Balance",
+            "Interest Earned"
+        ])
+
+        # Write account summary
+        writer.writerow([
+            statement.account_id,
+            statement.account_type,
+            statement.start_date,
+            statement.end_date,
+            f"{statement.opening_balance:.2f}",
+            f"{statement.closing_balance:.2f}",
+            f"{statement.interest_earned:.2f}"
+        ])
+
+        # Write transactions header
+        writer.writerow([])
+        writer.writerow(["Date", "Description", "Amount", "Balance"])
+
+        # Write transactions
+        for tx in statement.transactions:
             writer.writerow([
-                statement.account_id,
-                statement.account_type,
-                statement.start_date,
-                statement.end_date,
-                f"{statement.opening_balance:.2f}",
-                f"{statement.closing_balance:.2f}",
-                f"{statement.interest_earned:.2f}"
+                tx.date.strftime("%Y-%m-%d"),
+                tx.description,
+                f"{tx.amount:.2f}",
+                f"{tx.balance:.2f}"
             ])
-            
-            # Write transactions header
-            writer.writerow([])
-            writer.writerow(["Date", "Description", "Amount", "Balance"])
-            
-            # Write transactions
-            for tx in statement.transactions:
-                writer.writerow([
-                    tx.date.strftime("%Y-%m-%d"),
-                    tx.description,
-                    f"{tx.amount:.2f}",
-                    f"{tx.balance:.2f}"
-                ])
-                
-            # Add summary footer
-            writer.writerow([])
-            writer.writerow(["End of Statement"])
\ No newline at end of file
+
+        # Add summary footer
+        writer.writerow([])
+        writer.writerow(["End of Statement"])
+
+    def render(self, statement: MonthlyStatement) -> str:
+        buffer = io.StringIO(newline='')
+        self.write(statement, buffer)
+        return buffer.getvalue()
@@ -0,0 +1,236 @@
+"""
+Multi-statement container writers.
+
+A writer streams any number of statements into one file as a flat table,
+one row per statement line (statements with no activity get a single row
+with empty line columns), and flushes it in batches of `batch_rows`:
+
+    with open_statement_writer("statements_202504.parquet") as writer:
+        for statement in statements:
+            writer.write(statement)
+
+Formats are picked from the file extension: .csv.gz, .csv.zst, .parquet
+and .arrow (Arrow IPC file). zstd needs the optional `zstandard` package
+and the columnar formats need `pyarrow`.
+"""
+import csv
+import gzip
+import io
+from abc import ABC, abstractmethod
+from datetime import date
+from typing import Dict, List, Optional, Type
+
+from domain.models.statement import MonthlyStatement
+
+try:
+    import zstandard
+except ImportError:  # only needed for .csv.zst
+    zstandard = None
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:  # only needed for .parquet and .arrow
+    pyarrow = None
+
+DEFAULT_BATCH_ROWS = 65536
+
+COLUMNS = [
+    "account_id", "account_type", "start_date", "end_date",
+    "opening_balance", "closing_balance", "interest_earned",
+    "date", "description", "amount", "balance",
+]
+
+
+class StatementWriter(ABC):
+    """Streams statements into one container file."""
+    extension: str = ""
+
+    def __init__(self, path: str, batch_rows: int = DEFAULT_BATCH_ROWS):
+        self.path = path
+        self.batch_rows = batch_rows
+        self.statements = 0
+
+    @abstractmethod
+    def write(self, statement: MonthlyStatement) -> None:
+        pass
+
+    @abstractmethod
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> "StatementWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+class CompressedCSVStatementWriter(StatementWriter):
+    """CSV rows through a gzip or zstd stream.
+
+    Per-statement columns are formatted once per statement and dates once
+    per calendar day; amounts are Money, which formats from its integer
+    cents without going through Decimal.
+    """
+    extension = ".csv.gz"
+
+    def __init__(self, path: str, batch_rows: int = DEFAULT_BATCH_ROWS, level: Optional[int] = None):
+        super().__init__(path, batch_rows)
+        self._stream = self._open(path, level)
+        self._writer = csv.writer(self._stream)
+        self._writer.writerow(COLUMNS)
+        self._rows: List[list] = []
+        self._day_strings: Dict[date, str] = {}
+
+    def _open(self, path: str, level: Optional[int]) -> io.TextIOBase:
+        return gzip.open(path, "wt", newline="", compresslevel=6 if level is None else level)
+
+    def _day(self, day: date) -> str:
+        text = self._day_strings.get(day)
+        if text is None:
+            text = self._day_strings[day] = day.isoformat()
+        return text
+
+    def write(self, statement: MonthlyStatement) -> None:
+        summary = [
+            statement.account_id,
+            statement.account_type,
+            self._day(statement.start_date),
+            self._day(statement.end_date),
+            f"{statement.opening_balance:.2f}",
+            f"{statement.closing_balance:.2f}",
+            f"{statement.interest_earned:.2f}",
+        ]
+        if not statement.transactions:
+            self._rows.append(summary + ["", "", "", ""])
+        for tx in statement.transactions:
+            self._rows.append(summary + [
+                self._day(tx.date.date()), tx.description, f"{tx.amount:.2f}", f"{tx.balance:.2f}"
+            ])
+        self.statements += 1
+        if len(self._rows) >= self.batch_rows:
+            self._flush()
+
+    def _flush(self) -> None:
+        self._writer.writerows(self._rows)
+        self._rows.clear()
+
+    def close(self) -> None:
+        if self._stream.closed:
+            return
+        self._flush()
+        self._stream.close()
+
+
+class ZstdCSVStatementWriter(CompressedCSVStatementWriter):
+    extension = ".csv.zst"
+
+    def _open(self, path: str, level: Optional[int]) -> io.TextIOBase:
+        if zstandard is None:
+            raise ImportError("Writing .csv.zst statements requires the 'zstandard' package")
+        compressor = zstandard.ZstdCompressor(level=3 if level is None else level)
+        raw = compressor.stream_writer(open(path, "wb"), closefd=True)
+        return io.TextIOWrapper(raw, encoding="utf-8", newline="")
+
+
+class ArrowStatementWriter(StatementWriter):
+    """Columnar output: statement lines are buffered per column and written as record batches.
+
+    Money columns are decimal128(18, 2), filled from each amount's exact
+    cents with no rounding step.
+    """
+    extension = ".arrow"
+
+    def __init__(self, path: str, batch_rows: int = DEFAULT_BATCH_ROWS):
+        if pyarrow is None:
+            raise ImportError(f"Writing {self.extension} statements requires the 'pyarrow' package")
+        super().__init__(path, batch_rows)
+        money = pyarrow.decimal128(18, 2)
+        self.schema = pyarrow.schema([
+            ("account_id", pyarrow.string()),
+            ("account_type", pyarrow.string()),
+            ("start_date", pyarrow.date32()),
+            ("end_date", pyarrow.date32()),
+            ("opening_balance", money),
+            ("closing_balance", money),
+            ("interest_earned", money),
+            ("date", pyarrow.timestamp("s")),
+            ("description", pyarrow.string()),
+            ("amount", money),
+            ("balance", money),
+        ])
+        self._columns: Dict[str, list] = {name: [] for name in COLUMNS}
+        self._rows = 0
+        self._writer = self._open_writer()
+
+    def _open_writer(self):
+        return pyarrow.ipc.new_file(self.path, self.schema)
+
+    def write(self, statement: MonthlyStatement) -> None:
+        columns = self._columns
+        lines = statement.transactions or [None]
+        count = len(lines)
+        columns["account_id"].extend([statement.account_id] * count)
+        columns["account_type"].extend([statement.account_type] * count)
+        columns["start_date"].extend([statement.start_date] * count)
+        columns["end_date"].extend([statement.end_date] * count)
+        columns["opening_balance"].extend([statement.opening_balance.to_decimal()] * count)
+        columns["closing_balance"].extend([statement.closing_balance.to_decimal()] * count)
+        columns["interest_earned"].extend([statement.interest_earned.to_decimal()] * count)
+        for tx in lines:
+            if tx is None:
+                columns["date"].append(None)
+                columns["description"].append(None)
+                columns["amount"].append(None)
+                columns["balance"].append(None)
+            else:
+                columns["date"].append(tx.date)
+                columns["description"].append(tx.description)
+                columns["amount"].append(tx.amount.to_decimal())
+                columns["balance"].append(tx.balance.to_decimal())
+        self._rows += count
+        self.statements += 1
+        if self._rows >= self.batch_rows:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self._rows:
+            return
+        batch = pyarrow.record_batch(
+            [pyarrow.array(self._columns[field.name], type=field.type) for field in self.schema],
+            schema=self.schema
+        )
+        self._writer.write_batch(batch)
+        for values in self._columns.values():
+            values.clear()
+        self._rows = 0
+
+    def close(self) -> None:
+        if self._writer is None:
+            return
+        self._flush()
+        self._writer.close()
+        self._writer = None
+
+
+class ParquetStatementWriter(ArrowStatementWriter):
+    extension = ".parquet"
+
+    def _open_writer(self):
+        return pyarrow.parquet.ParquetWriter(self.path, self.schema, compression="zstd")
+
+
+STATEMENT_WRITERS: Dict[str, Type[StatementWriter]] = {
+    writer.extension: writer
+    for writer in (CompressedCSVStatementWriter, ZstdCSVStatementWriter, ArrowStatementWriter, ParquetStatementWriter)
+}
+
+
+def open_statement_writer(path: str, batch_rows: int = DEFAULT_BATCH_ROWS) -> StatementWriter:
+    """Pick the writer from the file extension."""
+    for extension, writer in STATEMENT_WRITERS.items():
+        if path.endswith(extension):
+            return writer(path, batch_rows)
+    raise ValueError(f"Unsupported statement format for {path}; expected one of {', '.join(STATEMENT_WRITERS)}")
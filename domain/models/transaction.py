@@ -5,7 +5,6 @@ from typing import Optional
 from dataclasses import dataclass, field
 import uuid
 from threading import Lock
-from domain.services.notification_service import NotificationService
 
 class TransactionType(Enum):
     DEPOSIT = "deposit"
@@ -23,20 +22,20 @@ class Transaction(ABC):
     related_account: Optional[str] = None
     tag: Optional[str] = None
     is_interest: bool = False
-    _lock: Lock = field(default_factory=Lock, init=False, repr=False)
+    _lock: Lock = field(default_factory=Lock, init=False, repr=False, compare=False)
 
     def __post_init__(self):
-        self._amount = self.amount
-        self._transaction_id = self.transaction_id
         self._completed = False
 
-    @property
-    def transaction_id(self) -> str:
-        return self._transaction_id
+    def __getstate__(self) -> dict:
+        # The lock guards this instance only; copies and pickles get their own
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
 
-    @property
-    def amount(self) -> float:
-        return self._amount
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = Lock()
 
     @property
     def is_completed(self) -> bool:
@@ -104,7 +103,7 @@ class DepositTransaction(Transaction):
 
     def execute(self, account_service) -> bool:
         account = account_service.get_account(self.account_id)
-        if account and account.deposit(self.amount):
+        if account and account.deposit(self.amount, self):
             self._completed = True
             return True
         return False
@@ -116,7 +115,7 @@ class WithdrawalTransaction(Transaction):
 
     def execute(self, account_service) -> bool:
         account = account_service.get_account(self.account_id)
-        if account and account.withdraw(self.amount):
+        if account and account.withdraw(self.amount, self):
             self._completed = True
             return True
         return False
@@ -129,16 +128,14 @@ class TransferTransaction(Transaction):
         self.related_account = destination_account_id
 
     def execute(self, account_service) -> bool:
-        source = account_service.get_account(self.account_id)
-        destination = account_service.get_account(self.destination_account_id)
-
-        if not source or not destination:
+        # Both legs post as one balanced journal entry
+        from domain.models.journal import JournalEntry
+        from domain.models.money import Money
+
+        try:
+            entry = JournalEntry.transfer(self.account_id, self.destination_account_id, Money.of(self.amount), self)
+            account_service.posting_engine.post(entry)
+        except ValueError:
             return False
-
-        if source.prepare_for_transfer(self.amount):
-            if destination.complete_transfer(self.amount):
-                self._completed = True
-                return True
-            else:
-                source.complete_transfer(self.amount)
-        return False
\ No newline at end of file
+        self._completed = True
+        return True
\ No newline at end of file
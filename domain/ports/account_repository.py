@@ -1,26 +1,43 @@
-
 from abc import ABC, abstractmethod
 from typing import List, Optional
 from domain.models.account import Account
 
+
+class ConcurrentUpdateError(Exception):
+    """Raised when an account changed in the store between being read and being written back."""
+    def __init__(self, account_id: str, expected_version: int, actual_version: Optional[int]):
+        super().__init__(
+            f"Account {account_id} is at version {actual_version}, expected {expected_version}"
+        )
+        self.account_id = account_id
+        self.expected_version = expected_version
+        self.actual_version = actual_version
+
+
 class AccountRepository(ABC):
     """Interface for account persistence"""
     @abstractmethod
     def create(self, account: Account) -> Account:
         pass
-    
+
     @abstractmethod
     def find_by_id(self, account_id: int) -> Optional[Account]:
         pass
-    
+
     @abstractmethod
     def find_all(self) -> List[Account]:
         pass
-    
+
     @abstractmethod
     def delete(self, account_id: int) -> bool:
         pass
-    
+
     @abstractmethod
-    def update(self, account: Account) -> Account:
-        pass
\ No newline at end of file
+    def update(self, account: Account, expected_version: int) -> Account:
+        """Store `account` only if the stored copy is still at `expected_version` (compare-and-swap).
+
+        On success the stored version moves past `expected_version` and
+        `account.version` is set to it. Raises ConcurrentUpdateError if
+        another writer got there first.
+        """
+        pass
@@ -0,0 +1,43 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional
+from domain.models.account import Account
+from domain.models.money import Money
+from domain.models.transaction import Transaction
+
+
+class AsyncAccountRepository(ABC):
+    """Account persistence for coroutine-based services"""
+    @abstractmethod
+    async def get(self, account_id: str) -> Optional[Account]:
+        pass
+
+    @abstractmethod
+    async def add(self, account: Account) -> None:
+        pass
+
+    @abstractmethod
+    async def save(self, account: Account) -> None:
+        pass
+
+    @abstractmethod
+    async def all(self) -> List[Account]:
+        pass
+
+
+class AsyncNotifier(ABC):
+    @abstractmethod
+    async def notify(self, transaction: Transaction) -> None:
+        pass
+
+
+class AsyncTransactionLog(ABC):
+    """Where completed transactions are persisted; record returns once the write is durable."""
+    @abstractmethod
+    async def record(self, transaction: Transaction) -> None:
+        pass
+
+
+class AsyncLimitChecker(ABC):
+    @abstractmethod
+    async def check_limit(self, account_id: str, amount: Money) -> bool:
+        pass
@@ -1,13 +1,17 @@
 from abc import ABC, abstractmethod
 from datetime import datetime
 from domain.models.account import Account, CheckingAccount, SavingsAccount
+from domain.models.money import Money
 from domain.models.transaction import Transaction, TransferTransaction, WithdrawalTransaction, DepositTransaction
 from domain.services.fund_transfer_service import FundTransferService
 from domain.services.interest_service import InterestService
-from domain.services.limit_enforcement_service import LimitEnforcementService
+from domain.services.limit_enforcement_service import DEFAULT_LIMITS_FILE, LimitEnforcementService
 from domain.services.statement_service import StatementService
-from domain.services.notification_service import NotificationService # type: ignore
-from typing import Dict, Optional
+from domain.services.posting_engine import PostingEngine
+from domain.models.notifications import NotificationService
+from domain.services.metrics_service import instrumented
+from domain.services.tracing import child_span, traced
+from typing import Dict, List, Optional
 import uuid
 
 class AccountService(ABC):
@@ -43,11 +47,13 @@ class AccountService(ABC):
 class BankAccountService(AccountService):
     """Concrete implementation of AccountService"""
     
-    def __init__(self):
+    def __init__(self, limits_file: str = DEFAULT_LIMITS_FILE):
+        """`limits_file` is where the limit service keeps its snapshot; its change log goes next to it."""
         self._accounts: Dict[str, Account] = {}
+        self.posting_engine = PostingEngine(self.get_account)
         self.transfer_service = FundTransferService(self)
         self.interest_service = InterestService(self)
-        self.limit_service = LimitEnforcementService(self)
+        self.limit_service = LimitEnforcementService(self, limits_file=limits_file)
         self.statement_service = StatementService(self)
         self.notification_service = NotificationService()
         
@@ -55,41 +61,55 @@ class BankAccountService(AccountService):
                        owner_id: Optional[str] = None) -> Account:
         account_id = str(uuid.uuid4())
         if account_type.lower() == "checking":
-            account = CheckingAccount(account_id, initial_balance, owner_id)
+            account = CheckingAccount(account_id, initial_balance, owner_id=owner_id)
         else:
-            account = SavingsAccount(account_id, initial_balance, owner_id)
+            account = SavingsAccount(account_id, initial_balance, owner_id=owner_id)
         self._accounts[account_id] = account
         return account
 
     def get_account(self, account_id: str) -> Optional[Account]:
         return self._accounts.get(account_id)
 
+    def get_all_accounts(self) -> List[Account]:
+        return list(self._accounts.values())
+
+    @traced("notification")
+    def _notify(self, transaction: Transaction) -> None:
+        self.notification_service.notify(transaction.account_id, str(transaction))
+
+    @instrumented("deposit")
     def deposit(self, account_id: str, amount: float) -> bool:
         if self.limit_service.check_limit(account_id, amount):
             account = self.get_account(account_id)
             if account:
-                success = account.deposit(amount)
+                transaction = DepositTransaction(amount, account_id)
+                with child_span("execution"):
+                    success = account.deposit(amount, transaction)
                 if success:
-                    self.notification_service.notify(DepositTransaction(amount, account_id))
+                    self._notify(transaction)
                 return success
         return False
 
+    @instrumented("withdraw")
     def withdraw(self, account_id: str, amount: float) -> bool:
         if self.limit_service.check_limit(account_id, amount):
             account = self.get_account(account_id)
             if account:
-                success = account.withdraw(amount)
+                transaction = WithdrawalTransaction(amount, account_id)
+                with child_span("execution"):
+                    success = account.withdraw(amount, transaction)
                 if success:
-                    self.notification_service.notify(WithdrawalTransaction(amount, account_id))
+                    self._notify(transaction)
                 return success
         return False
 
+    @instrumented("transfer")
     def transfer(self, source_account_id: str, target_account_id: str, amount: float) -> bool:
         if self.limit_service.check_limit(source_account_id, amount):
-            success = self.transfer_service.transfer_funds(source_account_id, target_account_id, amount)
+            transaction = TransferTransaction(amount, source_account_id, target_account_id)
+            success = self.transfer_service.transfer_funds(source_account_id, target_account_id, amount, transaction)
             if success:
-                transaction = TransferTransaction(amount, source_account_id, target_account_id)
-                self.notification_service.notify(transaction)
+                self._notify(transaction)
             return success
         return False
 
@@ -97,12 +117,19 @@ class BankAccountService(AccountService):
         account = self.get_account(account_id)
         return account.balance if account else None
 
+    def balance_as_of(self, account_id: str, timestamp: datetime) -> Optional[Money]:
+        """Historical balance for audits, interest recomputation and statements."""
+        account = self.get_account(account_id)
+        return account.balance_as_of(timestamp) if account else None
+
+    @instrumented("execute_transaction")
     def execute_transaction(self, transaction: Transaction) -> bool:
         """Unified transaction execution with limit check"""
         if self.limit_service.check_limit(transaction.account_id, transaction.amount):
-            success = transaction.execute(self)
+            with child_span("execution", transaction_id=transaction.transaction_id):
+                success = transaction.execute(self)
             if success:
-                self.notification_service.notify(transaction)
+                self._notify(transaction)
             return success
         return False
 
@@ -0,0 +1,196 @@
+"""
+Coroutine-native account service for the FastAPI layer.
+
+The synchronous services either block the event loop or cost a threadpool
+hop per request. AsyncBankAccountService runs the same operations as
+coroutines instead: each account has its own asyncio.Lock, so requests for
+different accounts never wait on each other, and repository, persistence
+and notification calls are awaited rather than blocking. A single worker
+can therefore keep thousands of requests in flight.
+
+Adapters at the bottom bridge to the existing synchronous pieces:
+durable transaction logging via GroupCommitWriter, notifications and
+limit checks via a worker thread.
+"""
+import asyncio
+import json
+import uuid
+import weakref
+from decimal import Decimal
+from typing import Dict, List, Optional, Union
+
+from domain.models.account import Account, CheckingAccount, SavingsAccount
+from domain.models.money import Money
+from domain.models.transaction import (DepositTransaction, Transaction, TransactionType, TransferTransaction,
+                                       WithdrawalTransaction)
+from domain.ports.async_ports import AsyncAccountRepository, AsyncLimitChecker, AsyncNotifier, AsyncTransactionLog
+from domain.services.group_commit import GroupCommitWriter
+
+MONTHLY_INTEREST_RATE = Decimal("0.02") / 12  # as InterestService: 2% annual, compounded monthly
+
+
+class InMemoryAsyncAccountRepository(AsyncAccountRepository):
+    def __init__(self):
+        self._accounts: Dict[str, Account] = {}
+
+    async def get(self, account_id: str) -> Optional[Account]:
+        return self._accounts.get(account_id)
+
+    async def add(self, account: Account) -> None:
+        self._accounts[account.account_id] = account
+
+    async def save(self, account: Account) -> None:
+        self._accounts[account.account_id] = account
+
+    async def all(self) -> List[Account]:
+        return list(self._accounts.values())
+
+
+class AsyncBankAccountService:
+    """AccountService operations as coroutines, serialized per account rather than globally."""
+    def __init__(self, repository: Optional[AsyncAccountRepository] = None,
+                 notifier: Optional[AsyncNotifier] = None,
+                 transaction_log: Optional[AsyncTransactionLog] = None,
+                 limit_checker: Optional[AsyncLimitChecker] = None):
+        self.repository = repository or InMemoryAsyncAccountRepository()
+        self.notifier = notifier
+        self.transaction_log = transaction_log
+        self.limit_checker = limit_checker
+        # Locks go away with the last coroutine holding a reference to them
+        self._locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+    def _lock(self, account_id: str) -> asyncio.Lock:
+        lock = self._locks.get(account_id)
+        if lock is None:
+            lock = self._locks[account_id] = asyncio.Lock()
+        return lock
+
+    async def create_account(self, account_type: str, initial_balance: float = 0.0,
+                             owner_id: Optional[str] = None) -> Account:
+        account_id = str(uuid.uuid4())
+        if account_type.lower() == "checking":
+            account = CheckingAccount(account_id, initial_balance, owner_id=owner_id)
+        else:
+            account = SavingsAccount(account_id, initial_balance, owner_id=owner_id)
+        await self.repository.add(account)
+        return account
+
+    async def get_account(self, account_id: str) -> Optional[Account]:
+        return await self.repository.get(account_id)
+
+    async def get_account_balance(self, account_id: str) -> Optional[float]:
+        account = await self.repository.get(account_id)
+        return account.balance if account else None
+
+    async def _within_limit(self, account_id: str, amount: Money) -> bool:
+        return self.limit_checker is None or await self.limit_checker.check_limit(account_id, amount)
+
+    async def _completed(self, transaction: Transaction) -> None:
+        if self.transaction_log is not None:
+            await self.transaction_log.record(transaction)
+        if self.notifier is not None:
+            await self.notifier.notify(transaction)
+
+    async def _apply(self, transaction: Transaction) -> bool:
+        """Post a deposit or withdrawal under the account's lock and persist it."""
+        amount = Money.of(transaction.amount)
+        if not await self._within_limit(transaction.account_id, amount):
+            return False
+        async with self._lock(transaction.account_id):
+            account = await self.repository.get(transaction.account_id)
+            if not account:
+                return False
+            if transaction.is_debit():
+                success = account.withdraw(amount, transaction)
+            else:
+                success = account.deposit(amount, transaction)
+            if not success:
+                return False
+            await self.repository.save(account)
+        await self._completed(transaction)
+        return True
+
+    async def deposit(self, account_id: str, amount: Union[Money, float]) -> bool:
+        return await self._apply(DepositTransaction(float(Money.of(amount)), account_id))
+
+    async def withdraw(self, account_id: str, amount: Union[Money, float]) -> bool:
+        return await self._apply(WithdrawalTransaction(float(Money.of(amount)), account_id))
+
+    async def transfer(self, source_account_id: str, target_account_id: str, amount: Union[Money, float]) -> bool:
+        money = Money.of(amount)
+        transaction = TransferTransaction(float(money), source_account_id, target_account_id)
+        return await self._transfer(transaction, money)
+
+    async def _transfer(self, transaction: TransferTransaction, money: Money) -> bool:
+        source_id, target_id = transaction.account_id, transaction.destination_account_id
+        if source_id == target_id or not await self._within_limit(source_id, money):
+            return False
+        # Both locks, always in id order, so opposite transfers cannot deadlock
+        first, second = sorted((source_id, target_id))
+        async with self._lock(first), self._lock(second):
+            source = await self.repository.get(source_id)
+            target = await self.repository.get(target_id)
+            if not source or not target or not source.can_withdraw(money):
+                return False
+            source.withdraw(money, transaction)
+            target.deposit(money, transaction)
+            await asyncio.gather(self.repository.save(source), self.repository.save(target))
+        await self._completed(transaction)
+        return True
+
+    async def execute_transaction(self, transaction: Transaction) -> bool:
+        if transaction.transaction_type == TransactionType.TRANSFER:
+            return await self._transfer(transaction, Money.of(transaction.amount))
+        return await self._apply(transaction)
+
+    async def apply_interest_to_account(self, account_id: str, monthly_rate: Decimal = MONTHLY_INTEREST_RATE) -> bool:
+        async with self._lock(account_id):
+            account = await self.repository.get(account_id)
+            if not account:
+                return False
+            interest = account.money_balance.multiply(monthly_rate)
+            if interest.cents <= 0:
+                return False
+            transaction = DepositTransaction(float(interest), account_id)
+            transaction.is_interest = True
+            account.deposit(interest, transaction)
+            account.record_interest(interest)
+            await self.repository.save(account)
+        await self._completed(transaction)
+        return True
+
+
+class GroupCommitTransactionLog(AsyncTransactionLog):
+    """Appends transactions as JSON lines; concurrent requests share fsyncs and none blocks the loop."""
+    def __init__(self, path: str):
+        self._writer = GroupCommitWriter(path)
+
+    async def record(self, transaction: Transaction) -> None:
+        data = json.dumps(transaction.to_dict()).encode() + b"\n"
+        await asyncio.wrap_future(self._writer.submit(data))
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+class ThreadedNotifier(AsyncNotifier):
+    """Runs a synchronous notification service in a worker thread."""
+    def __init__(self, notification_service):
+        self.notification_service = notification_service
+
+    async def notify(self, transaction: Transaction) -> None:
+        # Same recipient and message as BankAccountService._notify
+        await asyncio.to_thread(self.notification_service.notify, transaction.account_id, str(transaction))
+
+
+class ThreadedLimitChecker(AsyncLimitChecker):
+    """Adapts LimitEnforcementService, whose check waits on a durable file write.
+
+    The limit service looks accounts up through its own account service,
+    so that must see the same accounts as the async repository.
+    """
+    def __init__(self, limit_service):
+        self.limit_service = limit_service
+
+    async def check_limit(self, account_id: str, amount: Money) -> bool:
+        return await asyncio.to_thread(self.limit_service.check_limit, account_id, amount)
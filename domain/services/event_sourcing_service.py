@@ -0,0 +1,129 @@
+from datetime import datetime
+from typing import Optional
+import uuid
+from domain.services.account_service import AccountService
+from domain.services.event_store import EventSourcedLedger
+from domain.services.interest_service import InterestService
+from domain.services.limit_enforcement_service import DEFAULT_LIMITS_FILE, LimitEnforcementService
+from domain.services.statement_service import StatementService
+from domain.services.metrics_service import instrumented
+from domain.services.tracing import child_span, traced
+from domain.models.events import AccountState
+from domain.models.notifications import NotificationService
+from domain.models.transaction import (DepositTransaction, Transaction, TransactionType, TransferTransaction,
+                                       WithdrawalTransaction)
+from domain.models.account import Account, CheckingAccount, SavingsAccount
+from domain.models.money import Money
+
+class EventSourcingService(AccountService):
+    """An AccountService whose accounts exist only as events in an EventSourcedLedger.
+
+    Opening an account records its type and owner in the OPENED event, and
+    every balance change is validated and appended by the ledger under its
+    lock, so the funds check and the append are one step. Nothing else holds
+    balances: get_account returns a fresh Account built from the folded
+    state, and changing that object changes nothing. Restarting on the same
+    log and snapshot gives back the same accounts.
+    """
+    def __init__(self, ledger: EventSourcedLedger, limits_file: str = DEFAULT_LIMITS_FILE):
+        """`limits_file` is where the limit service keeps its snapshot; its change log goes next to it."""
+        self.ledger = ledger
+        self.interest_service = InterestService(self)
+        self.limit_service = LimitEnforcementService(self, limits_file=limits_file)
+        self.statement_service = StatementService(self)
+        self.notification_service = NotificationService()
+
+    @staticmethod
+    def _view(state: AccountState) -> Account:
+        account_class = SavingsAccount if state.account_type == "savings" else CheckingAccount
+        return account_class(state.account_id, state.balance, owner_id=state.owner_id,
+                             interest_accrued=float(state.interest_accrued), version=state.event_count)
+
+    def create_account(self, account_type: str, initial_balance: float = 0.0,
+                       owner_id: Optional[str] = None) -> Account:
+        account_type = "checking" if account_type.lower() == "checking" else "savings"
+        account_id = str(uuid.uuid4())
+        self.ledger.open_account(account_id, Money.of(initial_balance), account_type=account_type,
+                                 owner_id=owner_id)
+        return self.get_account(account_id)
+
+    def get_account(self, account_id: str) -> Optional[Account]:
+        state = self.ledger.state(account_id)
+        return self._view(state) if state is not None and state.opened else None
+
+    def _minimum_balance(self, account_id: str) -> Money:
+        return Money.of(self.get_account(account_id).minimum_balance)
+
+    @traced("notification")
+    def _notify(self, transaction: Transaction) -> None:
+        self.notification_service.notify(transaction.account_id, str(transaction))
+
+    def _execute(self, transaction: Transaction) -> bool:
+        """Check limits, then append the events for `transaction`; False if either refuses it.
+
+        check_limit also refuses unknown accounts.
+        """
+        if not self.limit_service.check_limit(transaction.account_id, transaction.amount):
+            return False
+        money = Money.of(transaction.amount)
+        account_id, transaction_id = transaction.account_id, transaction.transaction_id
+        timestamp = transaction.timestamp
+        try:
+            with child_span("execution", transaction_id=transaction_id):
+                if transaction.transaction_type == TransactionType.TRANSFER:
+                    if self.get_account(transaction.related_account) is None:
+                        return False
+                    self.ledger.transfer(account_id, transaction.related_account, money,
+                                         self._minimum_balance(account_id), transaction_id, timestamp)
+                elif transaction.transaction_type == TransactionType.WITHDRAW:
+                    self.ledger.withdraw(account_id, money, self._minimum_balance(account_id),
+                                         transaction_id, timestamp)
+                elif transaction.is_interest:
+                    self.ledger.post_interest(account_id, money, transaction_id, timestamp)
+                else:
+                    self.ledger.deposit(account_id, money, transaction_id, timestamp)
+        except ValueError:
+            return False
+        self._notify(transaction)
+        return True
+
+    @instrumented("deposit")
+    def deposit(self, account_id: str, amount: float) -> bool:
+        return self._execute(DepositTransaction(amount, account_id))
+
+    @instrumented("withdraw")
+    def withdraw(self, account_id: str, amount: float) -> bool:
+        return self._execute(WithdrawalTransaction(amount, account_id))
+
+    @instrumented("transfer")
+    def transfer(self, source_account_id: str, target_account_id: str, amount: float) -> bool:
+        return self._execute(TransferTransaction(amount, source_account_id, target_account_id))
+
+    def get_account_balance(self, account_id: str) -> Optional[float]:
+        account = self.get_account(account_id)
+        return account.balance if account else None
+
+    @instrumented("execute_transaction")
+    def execute_transaction(self, transaction: Transaction) -> bool:
+        """Unified transaction execution with limit check"""
+        return self._execute(transaction)
+
+    def apply_interest_to_account(self, account_id: str) -> bool:
+        """Apply interest to a single account."""
+        return self.interest_service.apply_interest_to_account(account_id)
+
+    def apply_interest_batch(self, account_ids: list[str]) -> int:
+        """Apply interest to multiple accounts."""
+        return self.interest_service.apply_interest_batch(account_ids)
+
+    def generate_statement(self, account_id: str, start_date: datetime, end_date: datetime) -> str:
+        """Generate CSV statement for an account."""
+        return self.statement_service.generate_statement(account_id, start_date, end_date)
+
+    def reset_daily_limits(self):
+        """Reset daily limits for all accounts."""
+        self.limit_service.reset_limits_daily()
+
+    def reset_monthly_limits(self):
+        """Reset monthly limits for all accounts."""
+        self.limit_service.reset_monthly_limits()
@@ -0,0 +1,391 @@
+"""
+Event-sourced account balances.
+
+Every balance change is an AccountEvent appended to a JSON-lines log, and
+balances are folded from the log rather than stored. A snapshot records the
+folded states with the log offset they cover, so loading replays only the
+events written since; rebuild_states does the same fold across processes,
+each taking the accounts in its hash partition.
+"""
+import csv
+import json
+import logging
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from domain.models.events import AccountEvent, AccountEventType, AccountState
+from domain.models.money import Money, ZERO
+from domain.services.group_commit import GroupCommitWriter, write_atomically
+from domain.services.statement_run import partition_of
+
+DEFAULT_SNAPSHOT_INTERVAL = 10000
+
+logger = logging.getLogger("banking.event_store")
+
+
+def _done(error: Optional[BaseException] = None) -> Future:
+    future: Future = Future()
+    if error is None:
+        future.set_result(None)
+    else:
+        future.set_exception(error)
+    return future
+
+
+class EventLog:
+    """Append-only JSON-lines file of AccountEvents, one per line.
+
+    With `durable` set, appends go through a GroupCommitWriter and are
+    fsynced in batches; otherwise they are only flushed to the OS.
+    """
+    def __init__(self, path: str, durable: bool = False):
+        self.path = path
+        self.durable = durable
+        self._lock = threading.Lock()
+        self._truncate_torn_tail()
+        self.size = os.path.getsize(path) if os.path.exists(path) else 0
+        if durable:
+            self._file = None
+            self._writer = GroupCommitWriter(path)
+        else:
+            self._file = open(path, "ab")
+            self._writer = None
+        self._last_write = _done()
+        self.last_sequence = self._read_last_sequence()
+
+    def _truncate_torn_tail(self) -> None:
+        """Drop a partial last line left by a crash mid-append."""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r+b") as f:
+            end = f.seek(0, os.SEEK_END)
+            position = end
+            while position > 0:
+                step = min(4096, position)
+                f.seek(position - step)
+                chunk = f.read(step)
+                newline = chunk.rfind(b"\n")
+                if newline != -1:
+                    position = position - step + newline + 1
+                    break
+                position -= step
+            if position != end:
+                f.truncate(position)
+
+    def _read_last_sequence(self) -> int:
+        if self.size == 0:
+            return 0
+        with open(self.path, "rb") as f:
+            f.seek(max(0, self.size - 65536))
+            last_line = f.read().rstrip(b"\n").rsplit(b"\n", 1)[-1]
+        return json.loads(last_line)["seq"]
+
+    def append(self, events: List[Tuple[str, AccountEventType, Money, Optional[str], Optional[str]]],
+               timestamp: Optional[datetime] = None) -> List[AccountEvent]:
+        """Append (account_id, type, amount, transaction_id, related_account) tuples in one write.
+
+        An OPENED tuple may add the account type and owner. Events written
+        together (both legs of a transfer) get consecutive sequence numbers
+        and land in the file as a unit.
+        """
+        written, durable = self.submit(events, timestamp)
+        durable.result()
+        return written
+
+    def submit(self, events: List[Tuple[str, AccountEventType, Money, Optional[str], Optional[str]]],
+               timestamp: Optional[datetime] = None) -> Tuple[List[AccountEvent], Future]:
+        """Like append, but returns without waiting for the fsync, with a future that completes once it is done.
+
+        Sequence numbers and file order are fixed on return, so a caller can
+        submit under its own lock and wait for durability outside it.
+        """
+        timestamp = timestamp or datetime.now()
+        with self._lock:
+            written = []
+            for account_id, event_type, amount, transaction_id, related_account, *opening in events:
+                self.last_sequence += 1
+                written.append(AccountEvent(self.last_sequence, account_id, event_type, amount, timestamp,
+                                            transaction_id, related_account, *opening))
+            data = b"".join(json.dumps(event.to_record()).encode() + b"\n" for event in written)
+            if self._writer is not None:
+                self._last_write = self._writer.submit(data)
+            else:
+                # A failed write is reported through the future, as a failed fsync is in durable mode
+                try:
+                    self._file.write(data)
+                    self._file.flush()
+                    self._last_write = _done()
+                except OSError as e:
+                    self._last_write = _done(e)
+                    return written, self._last_write
+            self.size += len(data)
+            return written, self._last_write
+
+    def sync(self) -> None:
+        """Wait until everything submitted so far is durable."""
+        self._last_write.result()
+
+    def read(self, offset: int = 0) -> Iterator[Tuple[AccountEvent, int]]:
+        """Events from byte `offset` on, each with the offset just past it."""
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                offset += len(line)
+                if line.endswith(b"\n"):
+                    yield AccountEvent.from_record(json.loads(line)), offset
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        else:
+            self._file.close()
+
+
+class SnapshotStore:
+    """Folded account states plus the log sequence and byte offset they cover.
+
+    A snapshot is only a shortcut: one that is missing, unreadable or corrupt
+    loads as empty, so the whole log is replayed instead.
+    """
+    def __init__(self, path: str):
+        self.path = path
+
+    def load(self) -> Tuple[int, int, Dict[str, AccountState]]:
+        try:
+            with open(self.path) as f:
+                snapshot = json.load(f)
+            states = {
+                account_id: AccountState.from_record(account_id, record)
+                for account_id, record in snapshot["states"].items()
+            }
+            return snapshot["sequence"], snapshot["offset"], states
+        except FileNotFoundError:
+            return 0, 0, {}
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            logger.warning("Ignoring unreadable snapshot %s, replaying the whole log: %s", self.path, e)
+            return 0, 0, {}
+
+    def save(self, sequence: int, offset: int, states: Dict[str, AccountState]) -> None:
+        """Replace the snapshot atomically; it is on disk, under its final name, when this returns."""
+        write_atomically(self.path, json.dumps({
+            "sequence": sequence,
+            "offset": offset,
+            "states": {account_id: state.to_record() for account_id, state in states.items()},
+        }).encode("utf-8"))
+
+
+class EventSourcedLedger:
+    """Account balances derived from an event log, kept current in memory.
+
+    Commands validate against the folded state, append their events and then
+    apply them. A snapshot is written every `snapshot_interval` events, so a
+    restart replays at most that many.
+
+    With `durable` set, commands return only once their events are fsynced.
+    Concurrent commands validate and apply under the ledger lock but wait
+    for the disk outside it, so their events share fsyncs. If a write or
+    fsync fails the command raises OSError after applying its events in
+    memory, so memory is ahead of the log; call load() to fold the log
+    again.
+    """
+    def __init__(self, log_path: str, snapshot_path: Optional[str] = None,
+                 snapshot_interval: int = DEFAULT_SNAPSHOT_INTERVAL, durable: bool = False):
+        self.log = EventLog(log_path, durable)
+        self.snapshots = SnapshotStore(snapshot_path or log_path + ".snapshot")
+        self.snapshot_interval = snapshot_interval
+        self.states: Dict[str, AccountState] = {}
+        self._offset = 0
+        self._since_snapshot = 0
+        self._lock = threading.RLock()
+        self.load()
+
+    def load(self) -> int:
+        """Fold the snapshot and the events after it. Returns how many events were replayed."""
+        with self._lock:
+            _, self._offset, self.states = self.snapshots.load()
+            replayed = 0
+            for event, offset in self.log.read(self._offset):
+                self._state(event.account_id).apply(event)
+                self._offset = offset
+                replayed += 1
+            self._since_snapshot = replayed
+            return replayed
+
+    def _state(self, account_id: str) -> AccountState:
+        state = self.states.get(account_id)
+        if state is None:
+            state = self.states[account_id] = AccountState(account_id)
+        return state
+
+    def state(self, account_id: str) -> Optional[AccountState]:
+        return self.states.get(account_id)
+
+    def balance(self, account_id: str) -> Money:
+        state = self.states.get(account_id)
+        return state.balance if state else ZERO
+
+    def _record(self, events: list, timestamp: Optional[datetime] = None) -> Tuple[List[AccountEvent], Future]:
+        """Submit and apply events; the caller waits on the returned future after releasing the lock."""
+        written, durable = self.log.submit(events, timestamp)
+        for event in written:
+            self._state(event.account_id).apply(event)
+        self._offset = self.log.size
+        self._since_snapshot += len(written)
+        if self._since_snapshot >= self.snapshot_interval:
+            self.snapshot()
+        return written, durable
+
+    def _check_funds(self, account_id: str, amount: Money, minimum_balance: Money) -> None:
+        if self.balance(account_id) - amount < minimum_balance:
+            raise ValueError(f"Insufficient funds in account {account_id}")
+
+    @staticmethod
+    def _check_amount(amount: Money) -> None:
+        if amount.cents <= 0:
+            raise ValueError("Amount must be positive")
+
+    def open_account(self, account_id: str, initial_balance: Money = ZERO,
+                     timestamp: Optional[datetime] = None, account_type: Optional[str] = None,
+                     owner_id: Optional[str] = None) -> AccountEvent:
+        with self._lock:
+            state = self.states.get(account_id)
+            if state is not None and state.opened:
+                raise ValueError(f"Account {account_id} already exists")
+            written, durable = self._record([(account_id, AccountEventType.OPENED, initial_balance, None, None,
+                                              account_type, owner_id)], timestamp)
+        durable.result()
+        return written[0]
+
+    def deposit(self, account_id: str, amount: Money, transaction_id: Optional[str] = None,
+                timestamp: Optional[datetime] = None) -> AccountEvent:
+        self._check_amount(amount)
+        with self._lock:
+            written, durable = self._record([(account_id, AccountEventType.DEPOSITED, amount, transaction_id, None)],
+                                            timestamp)
+        durable.result()
+        return written[0]
+
+    def withdraw(self, account_id: str, amount: Money, minimum_balance: Money = ZERO,
+                 transaction_id: Optional[str] = None, timestamp: Optional[datetime] = None) -> AccountEvent:
+        self._check_amount(amount)
+        with self._lock:
+            self._check_funds(account_id, amount, minimum_balance)
+            written, durable = self._record([(account_id, AccountEventType.WITHDRAWN, amount, transaction_id, None)],
+                                            timestamp)
+        durable.result()
+        return written[0]
+
+    def transfer(self, source_account_id: str, target_account_id: str, amount: Money,
+                 minimum_balance: Money = ZERO, transaction_id: Optional[str] = None,
+                 timestamp: Optional[datetime] = None) -> List[AccountEvent]:
+        self._check_amount(amount)
+        with self._lock:
+            self._check_funds(source_account_id, amount, minimum_balance)
+            written, durable = self._record([
+                (source_account_id, AccountEventType.TRANSFERRED_OUT, amount, transaction_id, target_account_id),
+                (target_account_id, AccountEventType.TRANSFERRED_IN, amount, transaction_id, source_account_id),
+            ], timestamp)
+        durable.result()
+        return written
+
+    def post_interest(self, account_id: str, amount: Money, transaction_id: Optional[str] = None,
+                      timestamp: Optional[datetime] = None) -> AccountEvent:
+        self._check_amount(amount)
+        with self._lock:
+            written, durable = self._record(
+                [(account_id, AccountEventType.INTEREST_POSTED, amount, transaction_id, None)], timestamp
+            )
+        durable.result()
+        return written[0]
+
+    def snapshot(self) -> None:
+        with self._lock:
+            # A snapshot must not cover events that could still be lost
+            self.log.sync()
+            self.snapshots.save(self.log.last_sequence, self._offset, self.states)
+            self._since_snapshot = 0
+
+    def import_csv(self, csv_path: str) -> int:
+        """Append events for a transactions.csv written by the GUI. Returns the number of rows imported.
+
+        An account's first row also opens it, with the balance it had before
+        that row. Transfers are posted to both accounts; the file only has rows
+        for the sending side, so transfers an account received before its first
+        row are taken out of its opening balance rather than counted twice.
+        """
+        imported = 0
+        with open(csv_path, newline='') as f:
+            for row in csv.DictReader(f):
+                account_id = row["Account ID"]
+                kind = row["Type"].lower()
+                amount = Money.of(row["Amount"])
+                timestamp = datetime.strptime(row["Date"], "%Y-%m-%d %H:%M:%S")
+                debit = kind in ("withdraw", "withdrawal", "transfer")
+                with self._lock:
+                    state = self.states.get(account_id)
+                    if state is None or not state.opened:
+                        balance_after = Money.of(row["Balance After"])
+                        balance_before = balance_after + amount if debit else balance_after - amount
+                        received = state.balance if state is not None else ZERO
+                        self.open_account(account_id, balance_before - received, timestamp)
+                    if kind == "transfer" and row["Related Account"]:
+                        self._record([
+                            (account_id, AccountEventType.TRANSFERRED_OUT, amount, row["Transaction ID"],
+                             row["Related Account"]),
+                            (row["Related Account"], AccountEventType.TRANSFERRED_IN, amount, row["Transaction ID"],
+                             account_id),
+                        ], timestamp)
+                    else:
+                        event_type = AccountEventType.WITHDRAWN if debit else AccountEventType.DEPOSITED
+                        self._record([(account_id, event_type, amount, row["Transaction ID"], None)], timestamp)
+                imported += 1
+        self.log.sync()
+        return imported
+
+    def close(self) -> None:
+        self.log.close()
+
+
+def _replay_partition(log_path: str, offset: int, partition: int, partitions: int,
+                      base: Dict[str, dict]) -> Dict[str, dict]:
+    """Worker entry point: fold the events of one hash partition on top of its snapshot states."""
+    states = {account_id: AccountState.from_record(account_id, record) for account_id, record in base.items()}
+    with open(log_path, "rb") as f:
+        f.seek(offset)
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            # Only this partition's lines become AccountEvents
+            record = json.loads(line)
+            account_id = record["account"]
+            if partition_of(account_id, partitions) != partition:
+                continue
+            state = states.get(account_id)
+            if state is None:
+                state = states[account_id] = AccountState(account_id)
+            state.apply(AccountEvent.from_record(record))
+    return {account_id: state.to_record() for account_id, state in states.items()}
+
+
+def rebuild_states(log_path: str, snapshot_path: Optional[str] = None,
+                   workers: Optional[int] = None) -> Dict[str, AccountState]:
+    """Rebuild every account's state from the latest snapshot and the log, split by account hash across processes."""
+    _, offset, base = SnapshotStore(snapshot_path or log_path + ".snapshot").load()
+    partitions = workers or os.cpu_count() or 1
+    slices: List[Dict[str, dict]] = [{} for _ in range(partitions)]
+    for account_id, state in base.items():
+        slices[partition_of(account_id, partitions)][account_id] = state.to_record()
+
+    states: Dict[str, AccountState] = {}
+    with ProcessPoolExecutor(max_workers=partitions) as pool:
+        futures = [
+            pool.submit(_replay_partition, log_path, offset, partition, partitions, slices[partition])
+            for partition in range(partitions)
+        ]
+        for future in futures:
+            for account_id, record in future.result().items():
+                states[account_id] = AccountState.from_record(account_id, record)
+    return states
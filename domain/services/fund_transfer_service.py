@@ -1,11 +1,15 @@
 from domain.models.transaction import TransferTransaction
-from domain.services.account_service import BankAccountService
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from domain.services.account_service import BankAccountService
 
 class FundTransferService:
-    def __init__(self, account_service: BankAccountService):
+    def __init__(self, account_service: "BankAccountService"):
         self.account_service = account_service
 
-    def transfer_funds(self, source_account_id: str, destination_account_id: str, amount: float) -> bool:
+    def transfer_funds(self, source_account_id: str, destination_account_id: str, amount: float,
+                       transaction: Optional[TransferTransaction] = None) -> bool:
         # Validate accounts exist
         source = self.account_service.get_account(source_account_id)
         destination = self.account_service.get_account(destination_account_id)
@@ -16,13 +20,12 @@ class FundTransferService:
         if not source.can_withdraw(amount):
             return False
         
-        # Create transfer transaction (domain model)
-        transaction = TransferTransaction(
+        # Create transfer transaction (domain model), unless the caller brought its own
+        transaction = transaction or TransferTransaction(
             amount=amount,
             source_account_id=source_account_id,
             destination_account_id=destination_account_id
         )
         
-        # Delegate execution to domain service to handle atomic withdraw + deposit
-        success = self.account_service.execute_transaction(transaction)
-        return success
+        # Both legs post as one journal entry; limits and notification are handled by the caller
+        return transaction.execute(self.account_service)
@@ -0,0 +1,199 @@
+"""
+Group commit for durable file writes.
+
+Writers hand their record to a coordinator and block until it is on disk.
+A single flusher thread takes whatever has queued up, writes it with one
+write() and one fsync(), then releases every caller in the batch. A lone
+record is flushed at once; only when other writers are already queued
+does the flusher linger, for at most `max_delay` seconds or `max_batch`
+records, to let the batch fill. Under load the cost of an fsync is shared
+by the whole batch, and an idle writer pays for nothing but its own fsync.
+
+GroupCommitWriter appends records to a file; write_atomically replaces a
+whole file.
+"""
+import os
+import queue
+import stat
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, InvalidStateError
+from typing import List, Optional, Tuple
+
+DEFAULT_MAX_BATCH = 512
+DEFAULT_MAX_DELAY = 0.002  # seconds
+
+_STOP = object()
+
+# Read once at import: os.umask can only be read by setting it, which is not thread-safe later on
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def _fsync_directory(path: str) -> None:
+    """Make a rename or file creation in the directory durable."""
+    try:
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    except OSError:  # not supported on this platform
+        return
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def write_atomically(path: str, data: bytes) -> None:
+    """Durably replace `path` with `data`; readers and crashes see the old or the new file, never a mix.
+
+    The temporary file is unique, so writers of the same path never share it.
+    The file keeps its permissions, or gets the usual ones for a new file.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    try:
+        mode = stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        mode = 0o666 & ~_UMASK
+    fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, mode)  # mkstemp creates it 0600
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    _fsync_directory(path)
+
+
+def _settle(future: Future, error: Optional[BaseException] = None) -> None:
+    """Complete a future unless its caller has already cancelled it."""
+    try:
+        if error is None:
+            future.set_result(None)
+        else:
+            future.set_exception(error)
+    except InvalidStateError:
+        pass
+
+
+class GroupCommitWriter:
+    """Appends byte records to a file, fsyncing them in batches."""
+    def __init__(self, path: str, max_batch: int = DEFAULT_MAX_BATCH, max_delay: float = DEFAULT_MAX_DELAY):
+        self.path = path
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.batches = 0
+        self.records = 0
+        created = not os.path.exists(path)
+        self._file = open(path, "ab")
+        if created:
+            _fsync_directory(path)
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._closed = False
+        self._failure: Optional[BaseException] = None  # set if the flusher thread died
+        self._submit_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name=f"group-commit:{os.path.basename(path)}",
+                                        daemon=True)
+        self._thread.start()
+
+    def submit(self, data: bytes) -> Future:
+        """Queue a record; the future completes once it has been fsynced."""
+        future: Future = Future()
+        with self._submit_lock:
+            if self._failure is not None:
+                raise RuntimeError(f"Group commit writer for {self.path} has stopped") from self._failure
+            if self._closed:
+                raise ValueError("Writer is closed")
+            self._queue.put((data, future))
+        return future
+
+    def append(self, data: bytes, timeout: Optional[float] = None) -> None:
+        """Write a record and return once it is durable. Raises the write's error if it failed."""
+        self.submit(data).result(timeout)
+
+    def _collect(self) -> Tuple[List[Tuple[bytes, Future]], bool]:
+        first = self._queue.get()
+        if first is _STOP:
+            return [], True
+        batch = [first]
+        while len(batch) < self.max_batch:  # take whatever is queued already
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        if len(batch) == 1:
+            return batch, False  # nobody else is writing: don't make a lone writer wait
+        # Other writers are active, so more are likely on their way; let the batch fill
+        deadline = time.monotonic() + self.max_delay
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self) -> None:
+        try:
+            self._serve()
+        except BaseException as e:
+            # Nothing will drain the queue any more: fail what is in it and refuse new records
+            with self._submit_lock:
+                self._failure = e
+            error = RuntimeError(f"Group commit writer for {self.path} has stopped")
+            error.__cause__ = e
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not _STOP:
+                    _settle(item[1], error)
+
+    def _serve(self) -> None:
+        stopping = False
+        while not stopping:
+            batch, stopping = self._collect()
+            if not batch:
+                continue
+            try:
+                self._file.write(b"".join(data for data, _ in batch))
+                self._file.flush()
+                os.fsync(self._file.fileno())
+            except Exception as e:
+                # This batch failed; the writer carries on with the next one
+                for _, future in batch:
+                    _settle(future, e)
+                continue
+            except BaseException as e:
+                for _, future in batch:
+                    _settle(future, e)
+                raise
+            self.batches += 1
+            self.records += len(batch)
+            for _, future in batch:
+                _settle(future)
+
+    def close(self) -> None:
+        """Flush everything queued so far and stop the flusher thread."""
+        with self._submit_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        self._thread.join()
+        self._file.close()
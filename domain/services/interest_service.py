@@ -1,11 +1,16 @@
+from decimal import Decimal
 from domain.models.account import AccountType
 from domain.models.transaction import DepositTransaction
-from domain.services.account_service import BankAccountService
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from domain.services.account_service import BankAccountService
 
 class InterestService:
-    def __init__(self, account_service: BankAccountService):
+    def __init__(self, account_service: "BankAccountService"):
         self.account_service = account_service
-        self.interest_rate = 0.02  # 2% annual interest, compounded monthly
+        self.interest_rate = Decimal("0.02")  # 2% annual interest, compounded monthly
+        self._monthly_rate = self.interest_rate / 12
 
     def apply_interest_to_account(self, account_id: str) -> bool:
         """Apply monthly interest to a single account."""
@@ -13,14 +18,15 @@ class InterestService:
         if not account or account._account_type != AccountType.SAVINGS:  # Apply only to savings
             return False
 
-        interest_amount = account.balance * (self.interest_rate / 12)  # Monthly interest
-        if interest_amount > 0:
+        interest_amount = account.money_balance.multiply(self._monthly_rate)  # Monthly interest, to the cent
+        if interest_amount.cents > 0:
             transaction = DepositTransaction(
-                amount=interest_amount,
+                amount=float(interest_amount),
                 account_id=account_id
             )
+            transaction.is_interest = True
             if self.account_service.execute_transaction(transaction):
-                account.add_interest(interest_amount)
+                account.record_interest(interest_amount)
                 return True
         return False
 
@@ -1,88 +1,223 @@
 from domain.models.account import Account
-from domain.services.account_service import BankAccountService
-from datetime import datetime
+from domain.models.money import Money
+from domain.services.group_commit import GroupCommitWriter, write_atomically
+from domain.services.metrics_service import instrumented
+from domain.services.rolling_limits import RollingLimitEngine
+from domain.services.tracing import traced
+from concurrent.futures import Future
+from datetime import date, datetime
 import json
 import os
+import threading
+from typing import Optional, TYPE_CHECKING, Union
+
+if TYPE_CHECKING:
+    from domain.services.account_service import BankAccountService
+
+_USED_KEYS = ("daily_limit_used", "monthly_limit_used")
+_WINDOWS_KEY = "windows"
+DEFAULT_SNAPSHOT_INTERVAL = 10000  # changes appended to the log between snapshots
+DEFAULT_LIMITS_FILE = "transaction_limits.json"
+
+
+def _epochs(today: date) -> tuple:
+    """Integer day and month numbers; a period has ended when its stored number is behind these."""
+    return today.toordinal(), today.year * 12 + today.month - 1
+
 
 class LimitEnforcementService:
-    def __init__(self, account_service: BankAccountService):
+    """Daily and monthly limits per account, persisted as a snapshot plus a log of changes.
+
+    Each successful check appends the account's new usage (or, with a
+    limit engine, its window buckets) to `limits_file`.log through a group-commit writer, so concurrent checks
+    share fsyncs and none rewrites the whole file. Every
+    `snapshot_interval` changes the full state is written to `limits_file`
+    and the log starts over; loading replays the log over the snapshot.
+    """
+    def __init__(self, account_service: "BankAccountService", limit_engine: Optional[RollingLimitEngine] = None,
+                 snapshot_interval: int = DEFAULT_SNAPSHOT_INTERVAL, limits_file: str = DEFAULT_LIMITS_FILE):
+        """With `limit_engine`, limits are rolling windows instead of the calendar day and month."""
         self.account_service = account_service
-        self.limits_file = "transaction_limits.json"
-        self.daily_limit = 10000.0  # $10,000 daily limit per account
-        self.monthly_limit = 30000.0  # $30,000 monthly limit per account
+        self.limit_engine = limit_engine
+        self.limits_file = limits_file
+        self.log_file = self.limits_file + ".log"
+        self.snapshot_interval = snapshot_interval
+        self.daily_limit = Money.of(10000)  # $10,000 daily limit per account
+        self.monthly_limit = Money.of(30000)  # $30,000 monthly limit per account
+        self._lock = threading.RLock()
+        self._log: Optional[GroupCommitWriter] = None  # opened by the first change
+        self._logged = 0  # changes appended since the last snapshot
         self._initialize_limits()
 
     def _initialize_limits(self):
-        """Initialize or load transaction limits from file."""
+        """Load the snapshot and replay the change log over it, or create an empty snapshot."""
         if os.path.exists(self.limits_file):
             with open(self.limits_file, 'r') as f:
-                self.limits = json.load(f)
+                saved = json.load(f)
+            windows = {account_id: limits.pop(_WINDOWS_KEY) for account_id, limits in saved.items()
+                       if _WINDOWS_KEY in limits}
+            if self.limit_engine is not None:
+                self.limit_engine.load_records(windows)
+            # In memory usage is integer cents and periods are epoch numbers; the file keeps dollars and dates
+            self.limits = {}
+            for account_id, limits in saved.items():
+                if not limits:
+                    continue
+                monthly_reset = date.fromisoformat(limits["monthly_reset"][:10])
+                self.limits[account_id] = {
+                    "daily_limit_used": Money.of(limits["daily_limit_used"]).cents,
+                    "daily_epoch": date.fromisoformat(limits["daily_reset"][:10]).toordinal(),
+                    "monthly_limit_used": Money.of(limits["monthly_limit_used"]).cents,
+                    "monthly_epoch": _epochs(monthly_reset)[1],
+                }
         else:
             self.limits = {}
-            self._save_limits()
+            write_atomically(self.limits_file, self._render_limits())
+        self._replay_log()
+
+    def _replay_log(self) -> None:
+        if not os.path.exists(self.log_file):
+            return
+        with open(self.log_file, "rb") as f:
+            for line in f:
+                try:
+                    change = json.loads(line)
+                except ValueError:
+                    continue  # a record cut short by a crash; it was never acknowledged
+                # Each change is the account's whole state, so replaying it twice is harmless
+                account_id = change["account_id"]
+                if "limits" in change:
+                    self.limits[account_id] = change["limits"]
+                if _WINDOWS_KEY in change and self.limit_engine is not None:
+                    self.limit_engine.load_records({account_id: change[_WINDOWS_KEY]})
+
+    def _record_change(self, account_id: str) -> Future:
+        """Queue the account's new usage for the log. Called with the lock held, so log order is change order."""
+        if self._log is None:
+            self._log = GroupCommitWriter(self.log_file)
+        record = {"account_id": account_id}
+        if self.limit_engine is not None:
+            record[_WINDOWS_KEY] = self.limit_engine.account_record(account_id)
+        else:
+            record["limits"] = self.limits[account_id]
+        self._logged += 1
+        return self._log.submit(json.dumps(record).encode("utf-8") + b"\n")
+
+    @instrumented("limit_save", outcome=lambda _: "saved")
+    @traced("persistence")
+    def _save_limits(self, change: Future) -> None:
+        """Return once `change` is durable, taking a snapshot when the log has grown long enough."""
+        change.result()
+        if self._logged >= self.snapshot_interval:
+            with self._lock:
+                if self._logged >= self.snapshot_interval:
+                    self.snapshot()
+
+    def snapshot(self) -> None:
+        """Write every account's limits to limits_file and start an empty change log."""
+        with self._lock:
+            data = self._render_limits()
+            if self._log is not None:
+                self._log.close()  # the snapshot covers everything logged so far
+                self._log = None
+            write_atomically(self.limits_file, data)
+            # Only now that the snapshot is durable can the changes it covers be dropped
+            if os.path.exists(self.log_file):
+                open(self.log_file, "wb").close()
+            self._logged = 0
 
-    def _save_limits(self):
-        """Save transaction limits to file."""
-        with open(self.limits_file, 'w') as f:
-            json.dump(self.limits, f, indent=4)
+    def close(self) -> None:
+        """Snapshot the current limits and stop the log writer."""
+        self.snapshot()
 
-    def check_limit(self, account_id: str, transaction_amount: float) -> bool:
+    def _render_limits(self) -> bytes:
+        today = datetime.now().date()
+        day, month = _epochs(today)
+        first_of_month = today.replace(day=1)
+        with self._lock:
+            # Periods that ended since an account was last touched are written out as reset
+            serialized = {}
+            for account_id, limits in self.limits.items():
+                daily_current = limits["daily_epoch"] >= day
+                monthly_current = limits["monthly_epoch"] >= month
+                serialized[account_id] = {
+                    "daily_limit_used": limits["daily_limit_used"] / 100 if daily_current else 0.0,
+                    "daily_reset": date.fromordinal(limits["daily_epoch"]).isoformat() if daily_current
+                    else today.isoformat(),
+                    "monthly_limit_used": limits["monthly_limit_used"] / 100 if monthly_current else 0.0,
+                    "monthly_reset": date(limits["monthly_epoch"] // 12, limits["monthly_epoch"] % 12 + 1,
+                                          1).isoformat() if monthly_current else first_of_month.isoformat(),
+                }
+        if self.limit_engine is not None:
+            for account_id, windows in self.limit_engine.to_records().items():
+                serialized.setdefault(account_id, {})[_WINDOWS_KEY] = windows
+        return json.dumps(serialized, indent=4).encode("utf-8")
+
+    @instrumented("limit_check")
+    @traced("limit_check")
+    def check_limit(self, account_id: str, transaction_amount: Union[Money, float]) -> bool:
         """Check if the transaction is within daily and monthly limits."""
+        amount = Money.of(transaction_amount).cents
         account = self.account_service.get_account(account_id)
         if not account:
             return False
 
-        today = datetime.now().date()
-        first_of_month = today.replace(day=1)
+        if self.limit_engine is not None:
+            with self._lock:
+                if not self.limit_engine.check_and_record(account_id, Money(amount)):
+                    return False
+                change = self._record_change(account_id)
+            self._save_limits(change)
+            return True
 
-        # Initialize limits for new accounts
-        if account_id not in self.limits:
-            self.limits[account_id] = {
-                "daily_limit_used": 0.0,
-                "daily_reset": today.isoformat(),
-                "monthly_limit_used": 0.0,
-                "monthly_reset": first_of_month.isoformat()
-            }
-
-        limits = self.limits[account_id]
-        daily_reset = datetime.fromisoformat(limits["daily_reset"]).date()
-        monthly_reset = datetime.fromisoformat(limits["monthly_reset"]).date()
-
-        # Reset daily limit if a new day
-        if daily_reset < today:
-            limits["daily_limit_used"] = 0.0
-            limits["daily_reset"] = today.isoformat()
-
-        # Reset monthly limit if a new month
-        if monthly_reset < first_of_month:
-            limits["monthly_limit_used"] = 0.0
-            limits["monthly_reset"] = first_of_month.isoformat()
-
-        daily_remaining = self.daily_limit - limits["daily_limit_used"]
-        monthly_remaining = self.monthly_limit - limits["monthly_limit_used"]
-
-        if transaction_amount <= 0 or transaction_amount > daily_remaining or transaction_amount > monthly_remaining:
-            return False
+        day, month = _epochs(datetime.now().date())
+        with self._lock:
+            limits = self.limits.get(account_id)
+            if limits is None:
+                limits = self.limits[account_id] = {
+                    "daily_limit_used": 0,
+                    "daily_epoch": day,
+                    "monthly_limit_used": 0,
+                    "monthly_epoch": month
+                }
 
-        limits["daily_limit_used"] += transaction_amount
-        limits["monthly_limit_used"] += transaction_amount
-        self._save_limits()
+            # A new day or month starts from zero; there is no sweep over all accounts
+            if limits["daily_epoch"] < day:
+                limits["daily_limit_used"] = 0
+                limits["daily_epoch"] = day
+            if limits["monthly_epoch"] < month:
+                limits["monthly_limit_used"] = 0
+                limits["monthly_epoch"] = month
+
+            daily_remaining = self.daily_limit.cents - limits["daily_limit_used"]
+            monthly_remaining = self.monthly_limit.cents - limits["monthly_limit_used"]
+
+            if amount <= 0 or amount > daily_remaining or amount > monthly_remaining:
+                return False
+
+            limits["daily_limit_used"] += amount
+            limits["monthly_limit_used"] += amount
+            change = self._record_change(account_id)
+        self._save_limits(change)
         return True
 
+    def _advance(self, used_key: str, epoch_key: str, current: int) -> None:
+        """Zero `used_key` and move `epoch_key` up to `current` wherever that period has ended, then snapshot."""
+        with self._lock:
+            for limits in self.limits.values():
+                if limits[epoch_key] < current:
+                    limits[used_key] = 0
+                    limits[epoch_key] = current
+            self.snapshot()
+
     def reset_limits_daily(self):
-        """Reset daily limits for all accounts."""
-        today = datetime.now().date()
-        for account_id in self.limits:
-            if datetime.fromisoformat(self.limits[account_id]["daily_reset"]).date() < today:
-                self.limits[account_id]["daily_limit_used"] = 0.0
-                self.limits[account_id]["daily_reset"] = today.isoformat()
-        self._save_limits()
+        """Advance every account whose day has ended to today, with nothing used, and write the limits file.
+
+        check_limit already does this lazily for the account it checks; this
+        is for the GUI and scheduled callers that want the file brought up to date.
+        """
+        self._advance("daily_limit_used", "daily_epoch", _epochs(datetime.now().date())[0])
 
     def reset_monthly_limits(self):
-        """Reset monthly limits for all accounts."""
-        first_of_month = datetime.now().date().replace(day=1)
-        for account_id in self.limits:
-            if datetime.fromisoformat(self.limits[account_id]["monthly_reset"]).date() < first_of_month:
-                self.limits[account_id]["monthly_limit_used"] = 0.0
-                self.limits[account_id]["monthly_reset"] = first_of_month.isoformat()
-        self._save_limits()
\ No newline at end of file
+        """Like reset_limits_daily, for accounts whose month has ended."""
+        self._advance("monthly_limit_used", "monthly_epoch", _epochs(datetime.now().date())[1])
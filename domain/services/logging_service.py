@@ -1,65 +1,142 @@
 from datetime import datetime
+import atexit
+import json
 import logging
+import queue
+import random
+import threading
+from logging.handlers import QueueHandler, QueueListener
 from domain.services.account_service import BankAccountService, AccountService
 from domain.models.transaction import Transaction
 from domain.models.account import Account
 from typing import Dict, Optional
 
-logging.basicConfig(
-    filename='bank_operations.log',
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[QueueHandler] = None
+_listener_lock = threading.Lock()
+
+
+class JSONLineFormatter(logging.Formatter):
+    """One JSON object per line: timestamp, level, event name and the record's fields."""
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "timestamp": datetime.fromtimestamp(record.created).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "event": record.getMessage(),
+        }
+        payload.update(getattr(record, "fields", {}))
+        if record.exc_text:
+            payload["exception"] = record.exc_text
+        return json.dumps(payload, default=str)
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """Enqueues records unformatted so JSON encoding runs on the listener thread."""
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.exc_info:
+            # Traceback objects should not cross threads; render them here
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def configure_logging(filename: str = 'bank_operations.log', level: int = logging.INFO) -> QueueListener:
+    """Route the LoggingService logger through a queue to a file writer thread.
+
+    Safe to call more than once; only the first call installs the handlers.
+    """
+    global _listener, _queue_handler
+    with _listener_lock:
+        if _listener is None:
+            log_queue: queue.SimpleQueue = queue.SimpleQueue()
+            file_handler = logging.FileHandler(filename)
+            file_handler.setFormatter(JSONLineFormatter())
+
+            logger = logging.getLogger("LoggingService")
+            logger.setLevel(level)
+            _queue_handler = _DeferredQueueHandler(log_queue)
+            logger.addHandler(_queue_handler)
+            logger.propagate = False
+
+            _listener = QueueListener(log_queue, file_handler)
+            _listener.start()
+            atexit.register(shutdown_logging)
+        return _listener
+
+
+def shutdown_logging() -> None:
+    """Flush queued records to the file and stop the writer thread."""
+    global _listener, _queue_handler
+    with _listener_lock:
+        if _listener is not None:
+            logging.getLogger("LoggingService").removeHandler(_queue_handler)
+            _listener.stop()
+            _listener = None
+            _queue_handler = None
+
 
 class LoggingService(AccountService):
-    def __init__(self, account_service: BankAccountService):
+    def __init__(self, account_service: BankAccountService, read_sample_rate: float = 0.1):
+        """read_sample_rate is the fraction of get_account/get_account_balance calls that are logged."""
+        configure_logging()
         self.account_service = account_service
         self.logger = logging.getLogger("LoggingService")
+        self.read_sample_rate = read_sample_rate
+
+    def _log(self, event: str, **fields) -> None:
+        # Fields stay a dict until the listener thread formats the record
+        self.logger.info(event, extra={"fields": fields})
+
+    def _log_read(self, event: str, **fields) -> None:
+        if self.read_sample_rate >= 1.0 or random.random() < self.read_sample_rate:
+            self._log(event, sample_rate=self.read_sample_rate, **fields)
 
     def create_account(self, account_type: str, initial_balance: float = 0.0, owner_id: Optional[str] = None) -> Account:
-        self.logger.info(f"Creating {account_type} account with initial balance ${initial_balance} for owner {owner_id}")
+        self._log("create_account", account_type=account_type, initial_balance=initial_balance, owner_id=owner_id)
         return self.account_service.create_account(account_type, initial_balance, owner_id)
 
     def get_account(self, account_id: str) -> Optional[Account]:
-        self.logger.info(f"Retrieving account {account_id}")
+        self._log_read("get_account", account_id=account_id)
         return self.account_service.get_account(account_id)
 
     def deposit(self, account_id: str, amount: float) -> bool:
-        self.logger.info(f"Depositing ${amount} to account {account_id}")
+        self._log("deposit", account_id=account_id, amount=amount)
         return self.account_service.deposit(account_id, amount)
 
     def withdraw(self, account_id: str, amount: float) -> bool:
-        self.logger.info(f"Withdrawing ${amount} from account {account_id}")
+        self._log("withdraw", account_id=account_id, amount=amount)
         return self.account_service.withdraw(account_id, amount)
 
     def transfer(self, source_account_id: str, target_account_id: str, amount: float) -> bool:
-        self.logger.info(f"Transferring ${amount} from {source_account_id} to {target_account_id}")
+        self._log("transfer", source_account_id=source_account_id, target_account_id=target_account_id, amount=amount)
         return self.account_service.transfer(source_account_id, target_account_id, amount)
 
     def get_account_balance(self, account_id: str) -> Optional[float]:
-        self.logger.info(f"Checking balance for account {account_id}")
+        self._log_read("get_account_balance", account_id=account_id)
         return self.account_service.get_account_balance(account_id)
 
     def execute_transaction(self, transaction: Transaction) -> bool:
-        self.logger.info(f"Executing transaction {transaction.transaction_id} of type {transaction.transaction_type.value}")
+        self._log("execute_transaction", transaction_id=transaction.transaction_id,
+                  transaction_type=transaction.transaction_type.value)
         return self.account_service.execute_transaction(transaction)
 
     def apply_interest_to_account(self, account_id: str) -> bool:
-        self.logger.info(f"Applying interest to account {account_id}")
+        self._log("apply_interest_to_account", account_id=account_id)
         return self.account_service.apply_interest_to_account(account_id)
 
     def apply_interest_batch(self, account_ids: list[str]) -> int:
-        self.logger.info(f"Applying interest batch to accounts {account_ids}")
+        self._log("apply_interest_batch", account_count=len(account_ids))
         return self.account_service.apply_interest_batch(account_ids)
 
     def generate_statement(self, account_id: str, start_date: datetime, end_date: datetime) -> str:
-        self.logger.info(f"Generating statement for account {account_id} from {start_date} to {end_date}")
+        self._log("generate_statement", account_id=account_id, start_date=start_date, end_date=end_date)
         return self.account_service.generate_statement(account_id, start_date, end_date)
 
     def reset_daily_limits(self):
-        self.logger.info("Resetting daily limits for all accounts")
+        self._log("reset_daily_limits")
         self.account_service.reset_daily_limits()
 
     def reset_monthly_limits(self):
-        self.logger.info("Resetting monthly limits for all accounts")
-        self.account_service.reset_monthly_limits()
\ No newline at end of file
+        self._log("reset_monthly_limits")
+        self.account_service.reset_monthly_limits()
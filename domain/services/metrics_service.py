@@ -0,0 +1,194 @@
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import wraps
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+OPERATION_LATENCY = "bank_operation_duration_seconds"
+OPERATIONS_TOTAL = "bank_operations_total"
+
+DEFAULT_LATENCY_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5
+)
+
+
+class _PerThreadShards:
+    """Fixed-width numeric slots with one private copy per thread.
+
+    Writers only ever touch their own thread's list, so the hot path takes no
+    lock; the lock is held once per thread to register its shard and briefly
+    while a scrape snapshots the shard list.
+    """
+    def __init__(self, width: int):
+        self._width = width
+        self._local = threading.local()
+        self._shards: List[list] = []
+        self._lock = threading.Lock()
+
+    def local(self) -> list:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = [0] * self._width
+            with self._lock:
+                self._shards.append(shard)
+            self._local.shard = shard
+        return shard
+
+    def merged(self) -> list:
+        with self._lock:
+            shards = list(self._shards)
+        totals = [0] * self._width
+        for shard in shards:
+            for i, value in enumerate(shard):
+                totals[i] += value
+        return totals
+
+
+class Counter:
+    def __init__(self):
+        self._shards = _PerThreadShards(1)
+
+    def inc(self, amount: float = 1) -> None:
+        self._shards.local()[0] += amount
+
+    @property
+    def value(self) -> float:
+        return self._shards.merged()[0]
+
+
+class Histogram:
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_LATENCY_BUCKETS):
+        self._bounds = tuple(sorted(buckets))
+        # One count per bound, one for +Inf, then the running sum
+        self._shards = _PerThreadShards(len(self._bounds) + 2)
+
+    @property
+    def bounds(self) -> Tuple[float, ...]:
+        return self._bounds
+
+    def observe(self, value: float) -> None:
+        shard = self._shards.local()
+        shard[bisect_left(self._bounds, value)] += 1
+        shard[-1] += value
+
+    def snapshot(self) -> Tuple[List[int], int, float]:
+        """Cumulative bucket counts, total count and sum."""
+        merged = self._shards.merged()
+        cumulative, running = [], 0
+        for count in merged[:-1]:
+            running += count
+            cumulative.append(running)
+        return cumulative[:-1], running, merged[-1]
+
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._meta: Dict[str, Tuple[str, str]] = {}
+        self._metrics: Dict[str, Dict[LabelKey, Any]] = {}
+
+    def _get(self, kind: str, name: str, help_text: str, labels: Dict[str, str], factory: Callable[[], Any]):
+        key = tuple(sorted(labels.items()))
+        children = self._metrics.get(name)
+        if children is not None and key in children:
+            return children[key]
+        with self._lock:
+            self._meta.setdefault(name, (kind, help_text))
+            children = self._metrics.setdefault(name, {})
+            if key not in children:
+                children[key] = factory()
+            return children[key]
+
+    def counter(self, name: str, help_text: str = "", **labels: str) -> Counter:
+        return self._get("counter", name, help_text, labels, Counter)
+
+    def histogram(self, name: str, help_text: str = "",
+                  buckets: Tuple[float, ...] = DEFAULT_LATENCY_BUCKETS, **labels: str) -> Histogram:
+        return self._get("histogram", name, help_text, labels, lambda: Histogram(buckets))
+
+    def render_prometheus(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        with self._lock:
+            metrics = [(name, self._meta[name], list(children.items()))
+                       for name, children in self._metrics.items()]
+
+        lines = []
+        for name, (kind, help_text), children in metrics:
+            if help_text:
+                lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for key, metric in children:
+                if kind == "counter":
+                    lines.append(f"{name}{_format_labels(key)} {_format_value(metric.value)}")
+                    continue
+                cumulative, count, total = metric.snapshot()
+                for bound, bucket_count in zip(metric.bounds, cumulative):
+                    lines.append(f"{name}_bucket{_format_labels(key, le=_format_value(bound))} {bucket_count}")
+                lines.append(f"{name}_bucket{_format_labels(key, le='+Inf')} {count}")
+                lines.append(f"{name}_sum{_format_labels(key)} {_format_value(total)}")
+                lines.append(f"{name}_count{_format_labels(key)} {count}")
+        return "\n".join(lines) + "\n"
+
+
+def _format_labels(key: LabelKey, le: Optional[str] = None) -> str:
+    pairs = list(key) + ([("le", le)] if le is not None else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+registry = MetricsRegistry()
+
+
+def _bool_outcome(result: Any) -> str:
+    return "success" if result else "rejected"
+
+
+def instrumented(operation: str, outcome: Callable[[Any], str] = _bool_outcome):
+    """Record latency and an outcome count for every call of the wrapped function."""
+    latency = registry.histogram(OPERATION_LATENCY, "Latency of banking operations", operation=operation)
+    outcomes: Dict[str, Counter] = {}
+
+    def count(name: str) -> None:
+        counter = outcomes.get(name)
+        if counter is None:
+            counter = outcomes[name] = registry.counter(
+                OPERATIONS_TOTAL, "Banking operations by outcome", operation=operation, outcome=name
+            )
+        counter.inc()
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            start = perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            except Exception:
+                count("error")
+                raise
+            finally:
+                latency.observe(perf_counter() - start)
+            count(outcome(result))
+            return result
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def measure(operation: str):
+    """Time a block under `operation` without an outcome counter."""
+    latency = registry.histogram(OPERATION_LATENCY, "Latency of banking operations", operation=operation)
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        latency.observe(perf_counter() - start)
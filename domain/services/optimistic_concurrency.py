@@ -0,0 +1,59 @@
+"""
+Read-modify-write with optimistic concurrency.
+
+Writers don't lock an account while they work on it. They read it, note
+its version, apply their change and write it back conditional on the
+version being unchanged. If someone else wrote in between, the whole
+read-modify-write is retried on a fresh copy. When contention is low
+almost every attempt succeeds first time, so throughput scales with the
+number of workers instead of queueing on a lock.
+"""
+import random
+import time
+from typing import Callable, TypeVar
+
+from domain.models.account import Account
+from domain.ports.account_repository import AccountRepository, ConcurrentUpdateError
+
+T = TypeVar("T")
+
+DEFAULT_MAX_ATTEMPTS = 10
+DEFAULT_BACKOFF = 0.001  # seconds, doubled per attempt and jittered
+
+
+def retry_on_conflict(load: Callable[[], Account], operation: Callable[[Account], T],
+                      store: Callable[[Account, int], object],
+                      max_attempts: int = DEFAULT_MAX_ATTEMPTS, backoff: float = DEFAULT_BACKOFF) -> T:
+    """Run load -> operation -> store(account, version read), retrying on ConcurrentUpdateError.
+
+    `operation` may run more than once, so it must only change the account
+    it is given; side effects belong after this returns. Exceptions raised
+    by `operation` (insufficient funds, say) are not retried. After
+    `max_attempts` conflicts the last ConcurrentUpdateError is raised.
+    """
+    for attempt in range(max_attempts):
+        account = load()
+        if account is None:
+            raise ValueError("Account not found")
+        expected_version = account.version
+        result = operation(account)
+        try:
+            store(account, expected_version)
+            return result
+        except ConcurrentUpdateError:
+            if attempt == max_attempts - 1:
+                raise
+            # Jitter keeps colliding writers from retrying in lockstep
+            time.sleep(random.uniform(0, backoff * (2 ** attempt)))
+    raise AssertionError("unreachable")
+
+
+def update_account(repository: AccountRepository, account_id: str, operation: Callable[[Account], T],
+                   max_attempts: int = DEFAULT_MAX_ATTEMPTS) -> T:
+    """retry_on_conflict against an AccountRepository port."""
+    return retry_on_conflict(
+        lambda: repository.find_by_id(account_id),
+        operation,
+        repository.update,
+        max_attempts,
+    )
@@ -0,0 +1,118 @@
+import threading
+from collections import deque
+from typing import Callable, Deque, Dict, Iterable, List, Mapping, Optional
+
+from domain.models.account import Account
+from domain.models.journal import JournalEntry, TrialBalance
+from domain.models.money import Money
+from domain.models.transaction import DepositTransaction, Transaction, WithdrawalTransaction
+
+DEFAULT_JOURNAL_SIZE = 10000
+
+
+class PostingEngine:
+    """Applies balanced journal entries to accounts as single units.
+
+    A batch is checked as a whole before anything moves: each account's
+    lowest running position across the batch must be covered by its
+    balance. Legs are then applied once per account per entry, and if one
+    still fails (a concurrent withdrawal got there first) the legs already
+    applied are taken back out of their accounts, balances and histories
+    both, so a failed batch leaves no trace.
+
+    Debit and credit totals are kept as running integers twice over: as
+    the journal posted them and as the account balances actually moved, so
+    the trial balance reconciles the two without a ledger scan. Only the
+    most recent `journal_size` entries are kept in `journal`.
+    """
+    def __init__(self, get_account: Optional[Callable[[str], Optional[Account]]] = None,
+                 journal_size: int = DEFAULT_JOURNAL_SIZE):
+        self._get_account = get_account
+        self._lock = threading.RLock()
+        self.journal: Deque[JournalEntry] = deque(maxlen=journal_size)
+        self._entries = 0
+        # Net cents per account per entry, as posted and as the balances moved
+        self._total_debits = 0
+        self._total_credits = 0
+        self._account_debits = 0
+        self._account_credits = 0
+
+    def _resolve(self, account_ids: Iterable[str], accounts: Optional[Mapping[str, Account]]) -> Dict[str, Account]:
+        lookup = accounts.get if accounts is not None else self._get_account
+        resolved = {}
+        for account_id in account_ids:
+            account = lookup(account_id) if lookup else None
+            if account is None:
+                raise ValueError(f"Account {account_id} not found")
+            resolved[account_id] = account
+        return resolved
+
+    def post(self, entry: JournalEntry, accounts: Optional[Mapping[str, Account]] = None) -> JournalEntry:
+        return self.post_many([entry], accounts)[0]
+
+    def post_many(self, entries: List[JournalEntry],
+                  accounts: Optional[Mapping[str, Account]] = None) -> List[JournalEntry]:
+        """Post every entry or none. Raises ValueError if an account is missing or short of funds."""
+        with self._lock:
+            nets = [entry.net_by_account() for entry in entries]
+            running: Dict[str, int] = {}
+            lowest: Dict[str, int] = {}
+            for net in nets:
+                for account_id, cents in net.items():
+                    running[account_id] = running.get(account_id, 0) + cents
+                    lowest[account_id] = min(lowest.get(account_id, 0), running[account_id])
+
+            resolved = self._resolve(running, accounts)
+            for account_id, cents in lowest.items():
+                if cents < 0 and not resolved[account_id].can_withdraw(Money(-cents)):
+                    raise ValueError(f"Insufficient funds in account {account_id}")
+
+            applied = []
+            try:
+                for entry, net in zip(entries, nets):
+                    for account_id, cents in net.items():
+                        if cents == 0:
+                            continue
+                        account = resolved[account_id]
+                        transaction = self._leg_transaction(entry, account_id, cents)
+                        before = account.money_balance.cents
+                        if cents > 0:
+                            ok = account.deposit(Money(cents), transaction)
+                        else:
+                            ok = account.withdraw(Money(-cents), transaction)
+                        if not ok:
+                            raise ValueError(f"Could not apply entry {entry.entry_id} to account {account_id}")
+                        applied.append((account, transaction, cents, account.money_balance.cents - before))
+            except ValueError:
+                for account, transaction, _, _ in reversed(applied):
+                    account.revert(transaction)
+                raise
+
+            for _, _, cents, moved in applied:
+                if cents > 0:
+                    self._total_credits += cents
+                else:
+                    self._total_debits -= cents
+                if moved > 0:
+                    self._account_credits += moved
+                else:
+                    self._account_debits -= moved
+            self._entries += len(entries)
+            self.journal.extend(entries)
+            return entries
+
+    @staticmethod
+    def _leg_transaction(entry: JournalEntry, account_id: str, cents: int) -> Transaction:
+        """The transaction an account records for its leg; entries without one get a leg tagged with the entry id."""
+        if entry.transaction is not None:
+            return entry.transaction
+        leg = (DepositTransaction if cents > 0 else WithdrawalTransaction)(float(Money(abs(cents))), account_id)
+        leg.transaction_id = entry.entry_id
+        leg.timestamp = entry.timestamp
+        leg.description = entry.description
+        return leg
+
+    def trial_balance(self) -> TrialBalance:
+        with self._lock:
+            return TrialBalance(Money(self._total_debits), Money(self._total_credits), self._entries,
+                                Money(self._account_debits), Money(self._account_credits))
@@ -0,0 +1,150 @@
+"""
+Rolling-window transaction limits.
+
+Each account keeps one ring of integer buckets per window: for example 24
+hourly buckets for a rolling 24 hours and 30 daily buckets for a rolling
+30 days. Time is handled as integer epoch seconds, and a bucket is
+`now // bucket_seconds`, so nothing is parsed. Buckets that have fallen
+out of the window are zeroed lazily, the next time the account is
+touched; a running total per window makes every check O(1) amortized.
+Because expiry is per bucket, a window covers the last `buckets` buckets
+including the current, partly elapsed one.
+"""
+import threading
+import time
+from array import array
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Union
+
+from domain.models.money import Money
+
+
+@dataclass(frozen=True)
+class WindowLimit:
+    name: str
+    buckets: int
+    bucket_seconds: int
+    limit: Money
+
+    @property
+    def span_seconds(self) -> int:
+        return self.buckets * self.bucket_seconds
+
+
+ROLLING_24H = WindowLimit("rolling_24h", 24, 3600, Money.of(10000))
+ROLLING_30D = WindowLimit("rolling_30d", 30, 86400, Money.of(30000))
+
+
+class RollingWindow:
+    """Integer cents per bucket over the last `buckets` buckets, plus their total."""
+    __slots__ = ("buckets", "bucket_seconds", "sums", "total", "head")
+
+    def __init__(self, buckets: int, bucket_seconds: int):
+        self.buckets = buckets
+        self.bucket_seconds = bucket_seconds
+        self.sums = array("q", bytes(8 * buckets))
+        self.total = 0
+        self.head: Optional[int] = None  # absolute number of the newest bucket
+
+    def _rotate(self, now: int) -> None:
+        bucket = now // self.bucket_seconds
+        if self.head is None:
+            self.head = bucket
+            return
+        gap = bucket - self.head
+        if gap <= 0:  # same bucket, or the clock stepped back: keep counting into the newest
+            return
+        if gap >= self.buckets:
+            self.sums = array("q", bytes(8 * self.buckets))
+            self.total = 0
+        else:
+            for expired in range(self.head + 1, bucket + 1):
+                slot = expired % self.buckets
+                self.total -= self.sums[slot]
+                self.sums[slot] = 0
+        self.head = bucket
+
+    def used(self, now: int) -> int:
+        self._rotate(now)
+        return self.total
+
+    def add(self, now: int, cents: int) -> None:
+        self._rotate(now)
+        self.sums[self.head % self.buckets] += cents
+        self.total += cents
+
+    def to_record(self) -> list:
+        return [self.head, list(self.sums)]
+
+    @classmethod
+    def from_record(cls, buckets: int, bucket_seconds: int, record: list) -> "RollingWindow":
+        window = cls(buckets, bucket_seconds)
+        head, sums = record
+        # A record saved under a different bucket layout is dropped and the window starts empty
+        if len(sums) == buckets:
+            window.head = head
+            window.sums = array("q", sums)
+            window.total = sum(sums)
+        return window
+
+
+class RollingLimitEngine:
+    """Check-and-record against every configured window, per account."""
+    def __init__(self, limits: Sequence[WindowLimit] = (ROLLING_24H, ROLLING_30D),
+                 clock: Callable[[], float] = time.time):
+        self.limits = tuple(limits)
+        self._clock = clock
+        self._windows: Dict[str, List[RollingWindow]] = {}
+        self._lock = threading.Lock()
+
+    def _account_windows(self, account_id: str) -> List[RollingWindow]:
+        windows = self._windows.get(account_id)
+        if windows is None:
+            windows = self._windows[account_id] = [
+                RollingWindow(limit.buckets, limit.bucket_seconds) for limit in self.limits
+            ]
+        return windows
+
+    def check_and_record(self, account_id: str, amount: Union[Money, float]) -> bool:
+        """Record `amount` if it fits in every window; otherwise record nothing and return False."""
+        cents = Money.of(amount).cents
+        if cents <= 0:
+            return False
+        now = int(self._clock())
+        with self._lock:
+            windows = self._account_windows(account_id)
+            for window, limit in zip(windows, self.limits):
+                if window.used(now) + cents > limit.limit.cents:
+                    return False
+            for window in windows:
+                window.add(now, cents)
+        return True
+
+    def remaining(self, account_id: str) -> Dict[str, Money]:
+        now = int(self._clock())
+        with self._lock:
+            windows = self._account_windows(account_id)
+            return {limit.name: Money(limit.limit.cents - window.used(now))
+                    for window, limit in zip(windows, self.limits)}
+
+    def account_record(self, account_id: str) -> dict:
+        """One account's windows, in the format of a to_records() entry."""
+        with self._lock:
+            windows = self._account_windows(account_id)
+            return {limit.name: window.to_record() for window, limit in zip(windows, self.limits)}
+
+    def to_records(self) -> Dict[str, dict]:
+        with self._lock:
+            return {
+                account_id: {limit.name: window.to_record() for window, limit in zip(windows, self.limits)}
+                for account_id, windows in self._windows.items()
+            }
+
+    def load_records(self, records: Dict[str, dict]) -> None:
+        with self._lock:
+            for account_id, record in records.items():
+                self._windows[account_id] = [
+                    RollingWindow.from_record(limit.buckets, limit.bucket_seconds, record[limit.name])
+                    if limit.name in record else RollingWindow(limit.buckets, limit.bucket_seconds)
+                    for limit in self.limits
+                ]
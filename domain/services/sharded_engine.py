@@ -0,0 +1,386 @@
+"""
+Accounts sharded across worker processes.
+
+Each shard is a process that owns the accounts whose id hashes to it
+(partition_of, as in the statement run), so single-account operations on
+different shards run on different cores with no shared state. The parent
+is only a router: it sends each request down the owning shard's pipe and
+matches replies to futures by request id, so many requests can be in
+flight per shard at once.
+
+A transfer within one shard is a single local operation. A transfer
+across shards is a two-phase commit driven by the router: both shards
+first prepare (the source places a hold on the funds, the destination
+checks the account can take them), then both commit or both abort. A
+hold counts against the balance for every other withdrawal on that
+shard, so a prepared transfer can always commit.
+
+Only plain values cross process boundaries: amounts as integer cents,
+transfers as (transaction id, source, destination), and reads as
+AccountSnapshot. Accounts and transactions hold locks and never leave
+their shard.
+
+As in BankAccountService, every debit and credit is checked against the
+account's daily and monthly limits, and each one that succeeds is
+notified. Limits are enforced by the shard that owns the account, each
+shard keeping its own limits file; notifications are sent by the router,
+where subscribers live.
+"""
+import itertools
+import logging
+import multiprocessing
+import os
+import threading
+import uuid
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from domain.models.account import Account, AccountStatus, CheckingAccount, SavingsAccount
+from domain.models.money import Money
+from domain.models.notifications import NotificationService
+from domain.models.transaction import DepositTransaction, Transaction, TransferTransaction, WithdrawalTransaction
+from domain.services.limit_enforcement_service import DEFAULT_LIMITS_FILE, LimitEnforcementService
+from domain.services.statement_run import partition_of
+from domain.services.tracing import traced
+
+logger = logging.getLogger("banking.sharded_engine")
+
+
+@dataclass(frozen=True)
+class AccountSnapshot:
+    """An account as its shard held it when read."""
+    account_id: str
+    account_type: str
+    cents: int
+    status: str
+
+    @property
+    def balance(self) -> float:
+        return self.cents / 100
+
+
+def _transfer_transaction(transaction_id: str, source_id: str, destination_id: str, cents: int) -> TransferTransaction:
+    transaction = TransferTransaction(cents / 100, source_id, destination_id)
+    transaction.transaction_id = transaction_id
+    return transaction
+
+
+def _single_transaction(op: str, transaction_id: str, account_id: str, cents: int) -> Transaction:
+    transaction_class = DepositTransaction if op == "deposit" else WithdrawalTransaction
+    transaction = transaction_class(cents / 100, account_id)
+    transaction.transaction_id = transaction_id
+    return transaction
+
+
+def shard_limits_file(limits_file: str, index: int) -> str:
+    """The limits file of shard `index`: `limits_file` with the shard number before the extension."""
+    root, ext = os.path.splitext(limits_file)
+    return f"{root}.shard{index}{ext}"
+
+
+class _Shard:
+    """Account state inside one shard process."""
+    def __init__(self, limits_file: str = DEFAULT_LIMITS_FILE):
+        self.accounts: Dict[str, Account] = {}
+        self.held: Dict[str, int] = {}  # cents reserved by prepared outgoing transfers
+        self.prepared: Dict[str, Tuple[str, int, bool, TransferTransaction]] = {}
+        self.limit_service = LimitEnforcementService(self, limits_file=limits_file)
+
+    def get_account(self, account_id: str) -> Optional[Account]:
+        return self.accounts.get(account_id)
+
+    def _within_limits(self, account_id: str, cents: int) -> bool:
+        return self.limit_service.check_limit(account_id, Money(cents))
+
+    def _available(self, account: Account, cents: int) -> bool:
+        return account.can_withdraw(Money(cents + self.held.get(account.account_id, 0)))
+
+    def create(self, account_id: str, account_type: str, initial_cents: int, owner_id: Optional[str]) -> bool:
+        if account_id in self.accounts:
+            return False
+        cls = CheckingAccount if account_type.lower() == "checking" else SavingsAccount
+        self.accounts[account_id] = cls(account_id, Money(initial_cents), owner_id=owner_id)
+        return True
+
+    def get(self, account_id: str) -> Optional[AccountSnapshot]:
+        account = self.accounts.get(account_id)
+        if account is None:
+            return None
+        return AccountSnapshot(account.account_id, account.account_type.value, account.money_balance.cents,
+                               account.status.value)
+
+    def balance(self, account_id: str) -> Optional[int]:
+        account = self.accounts.get(account_id)
+        return account.money_balance.cents if account else None
+
+    def deposit(self, transaction_id: str, account_id: str, cents: int) -> bool:
+        account = self.accounts.get(account_id)
+        return (bool(account) and self._within_limits(account_id, cents)
+                and account.deposit(Money(cents), _single_transaction("deposit", transaction_id, account_id, cents)))
+
+    def withdraw(self, transaction_id: str, account_id: str, cents: int) -> bool:
+        account = self.accounts.get(account_id)
+        return (bool(account) and self._within_limits(account_id, cents) and self._available(account, cents)
+                and account.withdraw(Money(cents), _single_transaction("withdraw", transaction_id, account_id, cents)))
+
+    def transfer(self, transaction_id: str, source_id: str, destination_id: str, cents: int) -> bool:
+        source = self.accounts.get(source_id)
+        target = self.accounts.get(destination_id)
+        if not source or not target or not self._within_limits(source_id, cents) or not self._available(source, cents):
+            return False
+        transaction = _transfer_transaction(transaction_id, source_id, destination_id, cents)
+        source.withdraw(Money(cents), transaction)
+        target.deposit(Money(cents), transaction)
+        return True
+
+    def prepare(self, transaction_id: str, source_id: str, destination_id: str, cents: int, debit: bool) -> bool:
+        """Phase one: vote on the source (debit) or destination leg and, for the debit leg, hold the funds."""
+        account_id = source_id if debit else destination_id
+        account = self.accounts.get(account_id)
+        if not account or account.status != AccountStatus.ACTIVE:
+            return False
+        if debit:
+            if not self._within_limits(account_id, cents) or not self._available(account, cents):
+                return False
+            self.held[account_id] = self.held.get(account_id, 0) + cents
+        transaction = _transfer_transaction(transaction_id, source_id, destination_id, cents)
+        self.prepared[transaction_id] = (account_id, cents, debit, transaction)
+        return True
+
+    def _release(self, account_id: str, cents: int) -> None:
+        remaining = self.held[account_id] - cents
+        if remaining:
+            self.held[account_id] = remaining
+        else:
+            del self.held[account_id]
+
+    def commit(self, transaction_id: str) -> bool:
+        leg = self.prepared.pop(transaction_id, None)
+        if leg is None:
+            return False
+        account_id, cents, debit, transaction = leg
+        account = self.accounts[account_id]
+        if debit:
+            self._release(account_id, cents)
+            return account.withdraw(Money(cents), transaction)
+        return account.deposit(Money(cents), transaction)
+
+    def abort(self, transaction_id: str) -> bool:
+        leg = self.prepared.pop(transaction_id, None)
+        if leg is not None and leg[2]:
+            self._release(leg[0], leg[1])
+        return leg is not None
+
+    def batch(self, operations: Sequence[Tuple[str, tuple]]) -> List[Any]:
+        return [getattr(self, op)(*args) for op, args in operations]
+
+    def close(self) -> None:
+        self.limit_service.close()
+
+
+_SHARD_OPERATIONS = frozenset(("create", "get", "balance", "deposit", "withdraw", "transfer",
+                               "prepare", "commit", "abort", "batch"))
+
+
+def _shard_main(conn, limits_file: str) -> None:
+    """Worker entry point: serve requests from the router until it sends None."""
+    shard = _Shard(limits_file)
+    while True:
+        message = conn.recv()
+        if message is None:
+            break
+        request_id, op, args = message
+        try:
+            if op not in _SHARD_OPERATIONS:
+                raise ValueError(f"Unknown shard operation {op!r}")
+            conn.send((request_id, True, getattr(shard, op)(*args)))
+        except Exception as e:
+            conn.send((request_id, False, e))
+    shard.close()
+    conn.close()
+
+
+class _ShardClient:
+    """Router side of one shard: a pipe, the shard process and the requests awaiting replies."""
+    def __init__(self, index: int, context, limits_file: str):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_shard_main, args=(child_conn, limits_file),
+                                       name=f"account-shard-{index}", daemon=True)
+        self.process.start()
+        child_conn.close()
+        self._send_lock = threading.Lock()
+        self._pending: Dict[int, Future] = {}
+        self._ids = itertools.count()
+        self._reader = threading.Thread(target=self._read_replies, name=f"account-shard-{index}-replies",
+                                        daemon=True)
+        self._reader.start()
+
+    def call(self, op: str, *args) -> Future:
+        future: Future = Future()
+        with self._send_lock:
+            request_id = next(self._ids)
+            self._pending[request_id] = future
+            try:
+                self.conn.send((request_id, op, args))
+            except BaseException:
+                self._pending.pop(request_id, None)
+                raise
+        return future
+
+    def _read_replies(self) -> None:
+        try:
+            while True:
+                request_id, ok, result = self.conn.recv()
+                future = self._pending.pop(request_id)
+                if ok:
+                    future.set_result(result)
+                else:
+                    future.set_exception(result)
+        except (EOFError, OSError):
+            error = RuntimeError("Account shard stopped")
+            for future in list(self._pending.values()):
+                future.set_exception(error)
+            self._pending.clear()
+
+    def close(self) -> None:
+        with self._send_lock:
+            self.conn.send(None)
+        self.process.join()
+        self._reader.join()
+        self.conn.close()
+
+
+class ShardedAccountEngine:
+    """Routes account operations to shard processes by account id.
+
+    Each call blocks for its own reply, but calls from different threads
+    are pipelined, and execute_batch sends one message per shard for a
+    whole list of single-account operations.
+    """
+    def __init__(self, shards: Optional[int] = None, mp_context=None, limits_file: str = DEFAULT_LIMITS_FILE):
+        """Shard i keeps its limits in shard_limits_file(`limits_file`, i)."""
+        self.shards = shards or os.cpu_count() or 1
+        context = mp_context or multiprocessing.get_context()
+        self.notification_service = NotificationService()
+        self._clients = [_ShardClient(index, context, shard_limits_file(limits_file, index))
+                         for index in range(self.shards)]
+
+    def shard_of(self, account_id: str) -> int:
+        return partition_of(account_id, self.shards)
+
+    def _call(self, account_id: str, op: str, *args) -> Future:
+        return self._clients[self.shard_of(account_id)].call(op, *args)
+
+    def create_account(self, account_type: str, initial_balance: float = 0.0,
+                       owner_id: Optional[str] = None) -> str:
+        """Open an account on its shard and return its id."""
+        account_id = str(uuid.uuid4())
+        self._call(account_id, "create", account_id, account_type, Money.of(initial_balance).cents,
+                   owner_id).result()
+        return account_id
+
+    def get_account(self, account_id: str) -> Optional[AccountSnapshot]:
+        """The account's id, type, balance and status as its shard holds them now."""
+        return self._call(account_id, "get", account_id).result()
+
+    def get_account_balance(self, account_id: str) -> Optional[float]:
+        cents = self._call(account_id, "balance", account_id).result()
+        return cents / 100 if cents is not None else None
+
+    @traced("notification")
+    def _notify(self, transaction: Transaction) -> None:
+        self.notification_service.notify(transaction.account_id, str(transaction))
+
+    def _single(self, op: str, account_id: str, amount: Union[Money, float]) -> bool:
+        transaction_id, cents = str(uuid.uuid4()), Money.of(amount).cents
+        success = self._call(account_id, op, transaction_id, account_id, cents).result()
+        if success:
+            self._notify(_single_transaction(op, transaction_id, account_id, cents))
+        return success
+
+    def deposit(self, account_id: str, amount: Union[Money, float]) -> bool:
+        return self._single("deposit", account_id, amount)
+
+    def withdraw(self, account_id: str, amount: Union[Money, float]) -> bool:
+        return self._single("withdraw", account_id, amount)
+
+    @staticmethod
+    def _voted_yes(vote: Future, transaction_id: str) -> bool:
+        """A vote that failed (a shard error, or a stopped shard) counts as no."""
+        try:
+            return bool(vote.result())
+        except Exception:
+            logger.exception("Prepare failed for transfer %s; aborting it", transaction_id)
+            return False
+
+    def transfer(self, source_account_id: str, target_account_id: str, amount: Union[Money, float]) -> bool:
+        if source_account_id == target_account_id:
+            return False
+        money = Money.of(amount)
+        if money.cents <= 0:
+            return False
+        transaction_id = str(uuid.uuid4())
+        leg = (transaction_id, source_account_id, target_account_id, money.cents)
+        source_shard = self.shard_of(source_account_id)
+        target_shard = self.shard_of(target_account_id)
+        if source_shard == target_shard:
+            success = self._clients[source_shard].call("transfer", *leg).result()
+        else:
+            success = self._two_phase_transfer(source_shard, target_shard, leg)
+        if success:
+            self._notify(_transfer_transaction(*leg))
+        return success
+
+    def _two_phase_transfer(self, source_shard: int, target_shard: int, leg: tuple) -> bool:
+        """Both legs must vote yes before either moves money; otherwise both are aborted."""
+        transaction_id = leg[0]
+        source, target = self._clients[source_shard], self._clients[target_shard]
+        votes = [
+            source.call("prepare", *leg, True),
+            target.call("prepare", *leg, False),
+        ]
+        # Every vote is collected, so a failed one cannot skip the abort of a leg that holds funds
+        decision = "commit" if all([self._voted_yes(vote, transaction_id) for vote in votes]) else "abort"
+        outcomes = [source.call(decision, transaction_id), target.call(decision, transaction_id)]
+        for outcome in outcomes:
+            outcome.result()
+        return decision == "commit"
+
+    def execute_batch(self, operations: Sequence[Tuple[str, str, Union[Money, float]]]) -> List[bool]:
+        """Run ("deposit" | "withdraw", account_id, amount) operations, one round trip per shard.
+
+        Operations on the same account apply in list order. Returns each
+        operation's result in list order.
+        """
+        by_shard: Dict[int, List[int]] = {}
+        requests: Dict[int, List[Tuple[str, tuple]]] = {}
+        sent: List[tuple] = []
+        for index, (op, account_id, amount) in enumerate(operations):
+            if op not in ("deposit", "withdraw"):
+                raise ValueError(f"Unsupported batch operation {op!r}")
+            shard = self.shard_of(account_id)
+            args = (str(uuid.uuid4()), account_id, Money.of(amount).cents)
+            sent.append((op, *args))
+            by_shard.setdefault(shard, []).append(index)
+            requests.setdefault(shard, []).append((op, args))
+
+        replies = {shard: self._clients[shard].call("batch", ops) for shard, ops in requests.items()}
+        results: List[bool] = [False] * len(operations)
+        for shard, reply in replies.items():
+            for index, result in zip(by_shard[shard], reply.result()):
+                results[index] = result
+        for success, operation in zip(results, sent):
+            if success:
+                self._notify(_single_transaction(*operation))
+        return results
+
+    def close(self) -> None:
+        for client in self._clients:
+            client.close()
+
+    def __enter__(self) -> "ShardedAccountEngine":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
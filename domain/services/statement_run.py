@@ -0,0 +1,286 @@
+"""
+Month-end statement run for every account in the transaction ledger.
+
+Accounts are hash-partitioned into more slices than there are workers. Each
+worker process reads the ledger once, keeps only its slice's rows, and
+renders those accounts' statements. Output is CSVStatementExporter's format
+as files in the output directory or as entries in one combined zip archive,
+or one container file per slice in any of the statement_export formats.
+Completed slices are recorded in a checkpoint file, so an interrupted run
+picks up where it stopped.
+
+    python -m domain.services.statement_run transactions.csv statements/ --month 4 --year 2025
+    python -m domain.services.statement_run transactions.csv statements/ --month 4 --year 2025 --archive
+    python -m domain.services.statement_run transactions.csv statements/ --month 4 --year 2025 --format .parquet
+"""
+import argparse
+import csv
+import json
+import os
+import time as clock
+import zipfile
+import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from domain.models.money import Money, ZERO
+from domain.models.statement import CSVStatementExporter, MonthlyStatement, StatementLineItem
+from domain.models.statement_export import STATEMENT_WRITERS
+
+LEDGER_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+_DEBIT_TYPES = {"withdraw", "withdrawal", "transfer"}
+
+
+@dataclass
+class StatementRunReport:
+    statements: int
+    partitions: int
+    skipped_partitions: int
+    elapsed_seconds: float
+
+    @property
+    def statements_per_second(self) -> float:
+        return self.statements / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+
+def partition_of(account_id: str, partitions: int) -> int:
+    """Stable across processes and runs, unlike hash() on str."""
+    return zlib.crc32(account_id.encode()) % partitions
+
+
+def statement_period(month: int, year: int) -> Tuple[date, date]:
+    start_date = date(year, month, 1)
+    if month == 12:
+        end_date = date(year + 1, 1, 1) - timedelta(days=1)
+    else:
+        end_date = date(year, month + 1, 1) - timedelta(days=1)
+    return start_date, end_date
+
+
+def statement_filename(account_id: str, month: int, year: int) -> str:
+    return f"statement_{account_id}_{year:04d}{month:02d}.csv"
+
+
+def _describe(kind: str, related_account: str) -> str:
+    if kind == "deposit":
+        return "Deposit"
+    if kind == "transfer":
+        return f"Transfer to {related_account}"
+    return "Withdrawal"
+
+
+def _read_slice(ledger_path: str, partition: int, partitions: int, period_start: str,
+                period_end: str) -> Dict[str, Tuple[Optional[Money], List[List[str]]]]:
+    """One pass over the ledger: each account's balance before the period and its in-period rows.
+
+    Ledger timestamps are fixed-width, so they are compared as strings; only
+    rows inside the period are parsed further.
+    """
+    before: Dict[str, Tuple[str, str]] = {}
+    in_period: Dict[str, List[List[str]]] = {}
+    with open(ledger_path, newline='') as file:
+        reader = csv.reader(file)
+        next(reader, None)
+        for row in reader:
+            if len(row) < 7:
+                continue
+            account_id = row[1]
+            if partition_of(account_id, partitions) != partition:
+                continue
+            stamp = row[4]
+            if stamp > period_end:
+                continue
+            if stamp >= period_start:
+                in_period.setdefault(account_id, []).append(row)
+            elif account_id not in before or stamp >= before[account_id][0]:
+                before[account_id] = (stamp, row[6])
+
+    accounts: Dict[str, Tuple[Optional[Money], List[List[str]]]] = {
+        account_id: (Money.of(balance), []) for account_id, (_, balance) in before.items()
+    }
+    for account_id, rows in in_period.items():
+        accounts[account_id] = (accounts.get(account_id, (None,))[0], rows)
+    return accounts
+
+
+def build_statement(account_id: str, account_type: str, start_date: date, end_date: date,
+                    balance_before: Optional[Money], rows: List[List[str]]) -> MonthlyStatement:
+    rows.sort(key=lambda row: row[4])
+    line_items = []
+    opening_balance = balance_before
+    for _, _, kind, amount, stamp, related_account, balance_after in rows:
+        kind = kind.lower()
+        amount = Money.of(amount)
+        balance = Money.of(balance_after)
+        if opening_balance is None:
+            opening_balance = balance + amount if kind in _DEBIT_TYPES else balance - amount
+        line_items.append(StatementLineItem(
+            date=datetime.strptime(stamp, LEDGER_TIMESTAMP_FORMAT),
+            description=_describe(kind, related_account),
+            amount=amount,
+            balance=balance
+        ))
+    opening_balance = opening_balance if opening_balance is not None else ZERO
+
+    return MonthlyStatement(
+        account_id=account_id,
+        account_type=account_type,
+        start_date=start_date,
+        end_date=end_date,
+        opening_balance=opening_balance,
+        closing_balance=line_items[-1].balance if line_items else opening_balance,
+        interest_earned=ZERO,
+        transactions=line_items
+    )
+
+
+def container_filename(partition: int, month: int, year: int, extension: str) -> str:
+    return f"statements_{year:04d}{month:02d}.part-{partition:04d}{extension}"
+
+
+def _run_partition(ledger_path: str, partition: int, partitions: int, month: int, year: int,
+                   output_dir: Optional[str], account_types: Dict[str, str],
+                   container: Optional[str] = None) -> Tuple[int, int, List[Tuple[str, str]]]:
+    """Worker entry point.
+
+    Writes the slice's files (or its one container file) itself, or, when
+    output_dir is None, returns (name, csv) pairs for the parent's archive.
+    """
+    start_date, end_date = statement_period(month, year)
+    period_start = datetime.combine(start_date, time.min).strftime(LEDGER_TIMESTAMP_FORMAT)
+    period_end = datetime.combine(end_date, time.max).strftime(LEDGER_TIMESTAMP_FORMAT)
+    statements = (
+        build_statement(account_id, account_types.get(account_id, ""), start_date, end_date, balance_before, rows)
+        for account_id, (balance_before, rows) in _read_slice(ledger_path, partition, partitions,
+                                                              period_start, period_end).items()
+    )
+
+    count = 0
+    entries: List[Tuple[str, str]] = []
+    if container is not None:
+        path = os.path.join(output_dir, container_filename(partition, month, year, container))
+        with STATEMENT_WRITERS[container](path + ".tmp") as writer:
+            for statement in statements:
+                writer.write(statement)
+        os.replace(path + ".tmp", path)
+        return partition, writer.statements, entries
+
+    exporter = CSVStatementExporter()
+    for statement in statements:
+        name = statement_filename(statement.account_id, month, year)
+        if output_dir is None:
+            entries.append((name, exporter.render(statement)))
+        else:
+            path = os.path.join(output_dir, name)
+            with open(path + ".tmp", mode='w', newline='') as file:
+                exporter.write(statement, file)
+            os.replace(path + ".tmp", path)
+        count += 1
+    return partition, count, entries
+
+
+class MonthEndStatementRun:
+    def __init__(self, ledger_path: str, output_dir: str, month: int, year: int,
+                 workers: Optional[int] = None, partitions: Optional[int] = None, archive: bool = False,
+                 account_types: Optional[Dict[str, str]] = None, container: Optional[str] = None):
+        """container is a statement_export extension (e.g. ".parquet"); when set, each slice
+        is written as one file in that format and `archive` is ignored."""
+        if container is not None and container not in STATEMENT_WRITERS:
+            raise ValueError(f"Unsupported statement format {container}; expected one of {', '.join(STATEMENT_WRITERS)}")
+        self.ledger_path = ledger_path
+        self.output_dir = output_dir
+        self.month = month
+        self.year = year
+        self.workers = workers or os.cpu_count() or 1
+        # Several slices per worker keeps the pool busy and the checkpoint fine-grained
+        self.partitions = partitions or self.workers * 4
+        self.archive = archive and container is None
+        self.container = container
+        self.account_types = account_types or {}
+        self.checkpoint_path = os.path.join(output_dir, f".statement_run_{year:04d}{month:02d}.json")
+        self.archive_path = os.path.join(output_dir, f"statements_{year:04d}{month:02d}.zip")
+
+    def _load_checkpoint(self) -> set:
+        try:
+            with open(self.checkpoint_path) as f:
+                checkpoint = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return set()
+        if (checkpoint.get("partitions"), checkpoint.get("archive"), checkpoint.get("container")) != \
+                (self.partitions, self.archive, self.container):
+            raise ValueError(
+                "Checkpoint was written with a different partition count or output mode; "
+                "rerun with the same settings or delete it to start over"
+            )
+        return set(checkpoint["done"])
+
+    def _save_checkpoint(self, done: set) -> None:
+        tmp_path = self.checkpoint_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"partitions": self.partitions, "archive": self.archive, "container": self.container,
+                       "done": sorted(done)}, f)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def _append_to_archive(self, entries: List[Tuple[str, str]]) -> None:
+        # Reopened per slice so the central directory is on disk before the checkpoint moves on
+        with zipfile.ZipFile(self.archive_path, "a", compression=zipfile.ZIP_DEFLATED) as archive:
+            existing = set(archive.namelist())
+            for name, content in entries:
+                if name not in existing:
+                    archive.writestr(name, content)
+
+    def run(self) -> StatementRunReport:
+        os.makedirs(self.output_dir, exist_ok=True)
+        done = self._load_checkpoint()
+        pending = [p for p in range(self.partitions) if p not in done]
+        file_dir = None if self.archive else self.output_dir
+
+        started = clock.perf_counter()
+        statements = 0
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            futures = [
+                pool.submit(_run_partition, self.ledger_path, partition, self.partitions,
+                            self.month, self.year, file_dir, self.account_types, self.container)
+                for partition in pending
+            ]
+            for future in as_completed(futures):
+                partition, count, entries = future.result()
+                if self.archive:
+                    self._append_to_archive(entries)
+                statements += count
+                done.add(partition)
+                self._save_checkpoint(done)
+
+        return StatementRunReport(
+            statements=statements,
+            partitions=self.partitions,
+            skipped_partitions=self.partitions - len(pending),
+            elapsed_seconds=clock.perf_counter() - started
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> StatementRunReport:
+    parser = argparse.ArgumentParser(description="Generate month-end statements for every account in the ledger")
+    parser.add_argument("ledger", help="Transaction ledger CSV (the GUI's transactions.csv format)")
+    parser.add_argument("output_dir", help="Directory for statements, the archive and the checkpoint")
+    parser.add_argument("--month", type=int, required=True)
+    parser.add_argument("--year", type=int, required=True)
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--partitions", type=int, help="Account slices (default: 4 per worker)")
+    parser.add_argument("--archive", action="store_true", help="Write one zip archive instead of separate files")
+    parser.add_argument("--format", choices=sorted(STATEMENT_WRITERS),
+                        help="Write one container file per slice in this format instead of per-statement CSVs")
+    args = parser.parse_args(argv)
+
+    report = MonthEndStatementRun(args.ledger, args.output_dir, args.month, args.year,
+                                  args.workers, args.partitions, args.archive, container=args.format).run()
+    print(f"{report.statements} statements in {report.elapsed_seconds:.2f}s "
+          f"({report.statements_per_second:.1f}/s), "
+          f"{report.skipped_partitions}/{report.partitions} slices resumed from checkpoint")
+    return report
+
+
+if __name__ == "__main__":
+    main()
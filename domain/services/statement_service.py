@@ -1,16 +1,24 @@
 # application/statement_service.py
+from dataclasses import dataclass
 from datetime import datetime
 import csv
 from typing import List
-from domain.models import  Transaction
-from domain.account_service import AccountService # type: ignore
+
+@dataclass
+class StatementLine:
+    """One row of the transaction log, as shown on a statement"""
+    date: datetime
+    type: str
+    amount: float
+    related_account: str
+    balance_after: float
 
 class StatementService:
-    def __init__(self, account_service: AccountService, transaction_source: str):
+    def __init__(self, account_service, transaction_source: str = "transactions.csv"):
         self.account_service = account_service
         self.transaction_source = transaction_source  # filepath or datasource
 
-    def _load_transactions(self, account_id: str, start_date: datetime, end_date: datetime) -> List[Transaction]:
+    def _load_transactions(self, account_id: str, start_date: datetime, end_date: datetime) -> List[StatementLine]:
         transactions = []
         try:
             with open(self.transaction_source, mode='r') as file:
@@ -19,7 +27,7 @@ class StatementService:
                     if row['Account ID'] == account_id:
                         trans_date = datetime.strptime(row['Date'], "%Y-%m-%d %H:%M:%S")
                         if start_date <= trans_date <= end_date:
-                            transactions.append(Transaction(
+                            transactions.append(StatementLine(
                                 date=trans_date,
                                 type=row['Type'],
                                 amount=float(row['Amount']),
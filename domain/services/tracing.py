@@ -0,0 +1,275 @@
+import json
+import queue
+import random
+import threading
+import time
+import urllib.request
+from abc import ABC, abstractmethod
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from functools import wraps
+from typing import Any, Dict, List, Optional
+
+
+@dataclass
+class Span:
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    name: str
+    start_time_ns: int
+    end_time_ns: int = 0
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    status: str = "ok"
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_time_ns - self.start_time_ns) / 1e6
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+
+class _NoopSpan:
+    """Stands in for a span when the trace was not sampled."""
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class _Trace:
+    def __init__(self, trace_id: str):
+        self.trace_id = trace_id
+        self.spans: List[Span] = []
+
+
+# (trace, current span) for the operation running in this thread/task; None outside a sampled trace
+_active: ContextVar[Optional[tuple]] = ContextVar("active_span", default=None)
+
+
+def _new_id(bits: int) -> str:
+    return f"{random.getrandbits(bits):0{bits // 4}x}"
+
+
+class SpanExporter(ABC):
+    @abstractmethod
+    def export(self, spans: List[Span]) -> None:
+        """Receive every span of one finished trace, root span last."""
+        pass
+
+
+class InMemorySpanExporter(SpanExporter):
+    """Keeps the most recent spans in a fixed-size ring buffer."""
+    def __init__(self, capacity: int = 10000):
+        self._spans: deque = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+
+    def export(self, spans: List[Span]) -> None:
+        with self._lock:
+            self._spans.extend(spans)
+
+    def get_spans(self) -> List[Span]:
+        with self._lock:
+            return list(self._spans)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._spans.clear()
+
+
+class JSONFileSpanExporter(SpanExporter):
+    """Appends one JSON line per span."""
+    def __init__(self, filename: str = "bank_traces.jsonl"):
+        self.filename = filename
+        self._lock = threading.Lock()
+
+    def export(self, spans: List[Span]) -> None:
+        lines = "".join(json.dumps(asdict(span), default=str) + "\n" for span in spans)
+        with self._lock, open(self.filename, "a") as f:
+            f.write(lines)
+
+
+_STOP = object()
+
+
+class OTLPHttpSpanExporter(SpanExporter):
+    """Posts traces as OTLP/JSON to a local collector (e.g. an OpenTelemetry Collector on :4318).
+
+    export() only queues the spans; a background thread posts them in
+    batches of up to `max_batch` spans, at most every `flush_interval`
+    seconds, so a slow or missing collector never holds up a request.
+    Spans arriving while `max_queue` are already waiting are dropped.
+    """
+    def __init__(self, endpoint: str = "http://localhost:4318/v1/traces",
+                 service_name: str = "banking-app", timeout: float = 2.0,
+                 max_batch: int = 512, flush_interval: float = 1.0, max_queue: int = 10000):
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self.timeout = timeout
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._thread_lock = threading.Lock()
+
+    @staticmethod
+    def _attribute(key: str, value: Any) -> dict:
+        if isinstance(value, bool):
+            return {"key": key, "value": {"boolValue": value}}
+        if isinstance(value, int):
+            return {"key": key, "value": {"intValue": str(value)}}
+        if isinstance(value, float):
+            return {"key": key, "value": {"doubleValue": value}}
+        return {"key": key, "value": {"stringValue": str(value)}}
+
+    def _payload(self, spans: List[Span]) -> dict:
+        return {"resourceSpans": [{
+            "resource": {"attributes": [self._attribute("service.name", self.service_name)]},
+            "scopeSpans": [{
+                "scope": {"name": "domain.services.tracing"},
+                "spans": [{
+                    "traceId": span.trace_id,
+                    "spanId": span.span_id,
+                    "parentSpanId": span.parent_id or "",
+                    "name": span.name,
+                    "kind": 1,
+                    "startTimeUnixNano": str(span.start_time_ns),
+                    "endTimeUnixNano": str(span.end_time_ns),
+                    "attributes": [self._attribute(k, v) for k, v in span.attributes.items()],
+                    "status": {"code": 2 if span.status == "error" else 1},
+                } for span in spans]
+            }]
+        }]}
+
+    def export(self, spans: List[Span]) -> None:
+        if self._thread is None:
+            self._start()
+        for span in spans:
+            try:
+                self._queue.put_nowait(span)
+            except queue.Full:
+                self.dropped += 1
+
+    def _start(self) -> None:
+        with self._thread_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="otlp-span-exporter", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            batch: List[Span] = []
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.max_batch:
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            if batch:
+                self._post(batch)
+
+    def _post(self, spans: List[Span]) -> None:
+        request = urllib.request.Request(
+            self.endpoint,
+            data=json.dumps(self._payload(spans)).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            method="POST"
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout):
+                pass
+        except OSError:
+            # A missing collector must never fail a banking operation
+            pass
+
+    def shutdown(self) -> None:
+        """Post whatever is still queued and stop the background thread."""
+        with self._thread_lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(_STOP)
+            thread.join()
+
+
+class Tracer:
+    def __init__(self, exporter: SpanExporter, sample_rate: float = 1.0):
+        self.exporter = exporter
+        self.sample_rate = sample_rate
+
+    @contextmanager
+    def trace(self, name: str, **attributes):
+        """Open a root span, or a child span if a trace is already active."""
+        if _active.get() is not None:
+            with child_span(name, **attributes) as span:
+                yield span
+            return
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            yield _NOOP_SPAN
+            return
+
+        trace = _Trace(_new_id(128))
+        try:
+            with _open_span(trace, None, name, attributes) as span:
+                yield span
+        finally:
+            # Failed operations are exported too, with the root span marked as an error
+            self.exporter.export(trace.spans)
+
+
+@contextmanager
+def _open_span(trace: _Trace, parent: Optional[Span], name: str, attributes: Dict[str, Any]):
+    span = Span(
+        trace_id=trace.trace_id,
+        span_id=_new_id(64),
+        parent_id=parent.span_id if parent else None,
+        name=name,
+        start_time_ns=time.time_ns(),
+        attributes=attributes
+    )
+    started = time.perf_counter_ns()
+    token = _active.set((trace, span))
+    try:
+        yield span
+    except Exception as e:
+        span.status = "error"
+        span.set_attribute("error", repr(e))
+        raise
+    finally:
+        _active.reset(token)
+        span.end_time_ns = span.start_time_ns + (time.perf_counter_ns() - started)
+        trace.spans.append(span)
+
+
+@contextmanager
+def child_span(name: str, **attributes):
+    """Time a stage inside the active trace; a no-op when nothing is being traced."""
+    active = _active.get()
+    if active is None:
+        yield _NOOP_SPAN
+        return
+    trace, parent = active
+    with _open_span(trace, parent, name, attributes) as span:
+        yield span
+
+
+def traced(name: str):
+    """Record the wrapped call as a child span of whatever trace is active."""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if _active.get() is None:
+                return func(*args, **kwargs)
+            with child_span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,69 @@
+from datetime import datetime
+from typing import Optional
+from domain.services.account_service import BankAccountService, AccountService
+from domain.services.tracing import InMemorySpanExporter, Tracer
+from domain.models.transaction import Transaction
+from domain.models.account import Account
+
+class TracingService(AccountService):
+    def __init__(self, account_service: BankAccountService, tracer: Optional[Tracer] = None):
+        self.account_service = account_service
+        self.tracer = tracer or Tracer(InMemorySpanExporter())
+
+    def create_account(self, account_type: str, initial_balance: float = 0.0, owner_id: Optional[str] = None) -> Account:
+        with self.tracer.trace("create_account", account_type=account_type):
+            return self.account_service.create_account(account_type, initial_balance, owner_id)
+
+    def get_account(self, account_id: str) -> Optional[Account]:
+        with self.tracer.trace("get_account", account_id=account_id):
+            return self.account_service.get_account(account_id)
+
+    def deposit(self, account_id: str, amount: float) -> bool:
+        with self.tracer.trace("deposit", account_id=account_id, amount=amount) as span:
+            result = self.account_service.deposit(account_id, amount)
+            span.set_attribute("success", result)
+            return result
+
+    def withdraw(self, account_id: str, amount: float) -> bool:
+        with self.tracer.trace("withdraw", account_id=account_id, amount=amount) as span:
+            result = self.account_service.withdraw(account_id, amount)
+            span.set_attribute("success", result)
+            return result
+
+    def transfer(self, source_account_id: str, target_account_id: str, amount: float) -> bool:
+        with self.tracer.trace("transfer", source_account_id=source_account_id,
+                               target_account_id=target_account_id, amount=amount) as span:
+            result = self.account_service.transfer(source_account_id, target_account_id, amount)
+            span.set_attribute("success", result)
+            return result
+
+    def get_account_balance(self, account_id: str) -> Optional[float]:
+        with self.tracer.trace("get_account_balance", account_id=account_id):
+            return self.account_service.get_account_balance(account_id)
+
+    def execute_transaction(self, transaction: Transaction) -> bool:
+        with self.tracer.trace("execute_transaction", transaction_id=transaction.transaction_id,
+                               transaction_type=transaction.transaction_type.value) as span:
+            result = self.account_service.execute_transaction(transaction)
+            span.set_attribute("success", result)
+            return result
+
+    def apply_interest_to_account(self, account_id: str) -> bool:
+        with self.tracer.trace("apply_interest_to_account", account_id=account_id):
+            return self.account_service.apply_interest_to_account(account_id)
+
+    def apply_interest_batch(self, account_ids: list[str]) -> int:
+        with self.tracer.trace("apply_interest_batch", account_count=len(account_ids)):
+            return self.account_service.apply_interest_batch(account_ids)
+
+    def generate_statement(self, account_id: str, start_date: datetime, end_date: datetime) -> str:
+        with self.tracer.trace("generate_statement", account_id=account_id):
+            return self.account_service.generate_statement(account_id, start_date, end_date)
+
+    def reset_daily_limits(self):
+        with self.tracer.trace("reset_daily_limits"):
+            self.account_service.reset_daily_limits()
+
+    def reset_monthly_limits(self):
+        with self.tracer.trace("reset_monthly_limits"):
+            self.account_service.reset_monthly_limits()
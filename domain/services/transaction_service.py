@@ -1,8 +1,16 @@
+import copy
+import threading
+
+from domain.models.transaction import TransactionType
+from domain.ports.account_repository import ConcurrentUpdateError
+from domain.services.optimistic_concurrency import update_account
+
 
 class Account:
     def __init__(self, account_id: int, balance: float):
         self.id = account_id
         self.balance = balance
+        self.version = 0
 
     def deposit(self, amount: float):
         self.balance += amount
@@ -19,10 +27,6 @@ class Transaction:
         self.amount = amount
         self.type = type
 
-
-
-from domain.models.transaction import Transaction, TransactionType
-
 class TransactionUseCase:
     def __init__(self, account_repo, transaction_repo):
         self.account_repo = account_repo
@@ -33,16 +37,18 @@ class TransactionUseCase:
         if not account:
             raise ValueError("Account not found")
 
+        if transaction_type not in (TransactionType.DEPOSIT, TransactionType.WITHDRAW):
+            raise ValueError("Invalid transaction type")
         transaction = Transaction(account_id, amount, transaction_type)
 
-        if transaction_type == TransactionType.DEPOSIT:
-            account.deposit(amount)
-        elif transaction_type == TransactionType.WITHDRAWAL:
-            account.withdraw(amount)
-        else:
-            raise ValueError("Invalid transaction type")
+        def apply(account):
+            if transaction_type == TransactionType.DEPOSIT:
+                account.deposit(amount)
+            else:
+                account.withdraw(amount)
+            return transaction
 
-        self.account_repo.update(account)
+        update_account(self.account_repo, account_id, apply)
         self.transaction_repo.create(transaction)
         return transaction
 
@@ -56,12 +62,21 @@ class TransactionUseCase:
 class InMemoryAccountRepository:
     def __init__(self):
         self.accounts = {}
+        self._lock = threading.Lock()
 
     def find_by_id(self, account_id: int):
-        return self.accounts.get(account_id)
-
-    def update(self, account):
-        self.accounts[account.id] = account
+        # Accounts here hold only scalars, so a shallow copy is a full snapshot
+        account = self.accounts.get(account_id)
+        return copy.copy(account) if account is not None else None
+
+    def update(self, account, expected_version: int):
+        with self._lock:
+            current = self.accounts.get(account.id)
+            if current is None or current.version != expected_version:
+                raise ConcurrentUpdateError(account.id, expected_version, current.version if current else None)
+            account.version = expected_version + 1
+            self.accounts[account.id] = copy.copy(account)
+        return account
 
 
 # interface_adapters/repositories/transaction_repository.py
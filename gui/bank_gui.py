@@ -8,7 +8,9 @@ from domain.entities.account import Account, AccountType, AccountStatus
 from domain.entities.transaction import Transaction, TransactionType, DepositTransaction, WithdrawalTransaction, TransferTransaction
 from domain.services.account_service import BankAccountService
 from domain.services.logging_service import LoggingService
+from domain.services.group_commit import GroupCommitWriter
 import csv
+import io
 import os
 
 class BankApp:
@@ -22,6 +24,8 @@ class BankApp:
         # Store accounts and transactions
         self.accounts = []  # List of Account objects
         self.current_account = None  # Currently selected Account
+        self.transaction_log = None  # Opened on the first saved transaction
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
         
         # Window dimensions
         self.window_width = 600
@@ -463,33 +467,44 @@ class BankApp:
             width=20
         ).pack(pady=5)
     
+    def close(self):
+        """Close the transaction log, then the window"""
+        if self.transaction_log is not None:
+            self.transaction_log.close()
+            self.transaction_log = None
+        self.root.destroy()
+    
     def save_transaction_to_csv(self, transaction):
-        """Save transaction details to a CSV file"""
+        """Save transaction details to a CSV file; returns once the row is on disk"""
         csv_file = "transactions.csv"
-        file_exists = os.path.isfile(csv_file)
-        
-        with open(csv_file, mode='a', newline='') as file:
-            writer = csv.writer(file)
-            
+        if self.transaction_log is None:
+            file_exists = os.path.isfile(csv_file) and os.path.getsize(csv_file) > 0
+            self.transaction_log = GroupCommitWriter(csv_file)
             if not file_exists:
-                writer.writerow([
+                self.transaction_log.append(self._csv_row([
                     "Transaction ID", "Account ID", "Type", 
                     "Amount", "Date", "Related Account", "Balance After"
-                ])
-            
-            related_account = ""
-            if isinstance(transaction, TransferTransaction):
-                related_account = transaction.destination_account_id
-            
-            writer.writerow([
-                transaction.transaction_id,
-                transaction.account_id,
-                transaction.transaction_type.value,
-                transaction.amount,
-                transaction.timestamp.strftime("%Y-%m-%d %H:%M:%S"),
-                related_account,
-                self.current_account.balance
-            ])
+                ]))
+        
+        related_account = ""
+        if isinstance(transaction, TransferTransaction):
+            related_account = transaction.destination_account_id
+        
+        self.transaction_log.append(self._csv_row([
+            transaction.transaction_id,
+            transaction.account_id,
+            transaction.transaction_type.value,
+            transaction.amount,
+            transaction.timestamp.strftime("%Y-%m-%d %H:%M:%S"),
+            related_account,
+            self.current_account.balance
+        ]))
+    
+    @staticmethod
+    def _csv_row(values):
+        buffer = io.StringIO()
+        csv.writer(buffer).writerow(values)
+        return buffer.getvalue().encode("utf-8")
     
     def process_transfer(self):
         """Process a transfer between accounts"""
@@ -1,9 +1,25 @@
 # infrastructure/config.py
 from dataclasses import dataclass
+from typing import Optional
 
 @dataclass
 class Settings:
     use_memory_repositories: bool = True
+    # Run response_model validation on hot read endpoints (list/get); off by default
+    validate_read_responses: bool = False
+    # Serve hot reads from the materialized read model (api/read_model.py) instead of the controllers
+    use_read_model: bool = True
+    # How long a write waits for the read model to show it (read-your-writes)
+    read_model_wait_seconds: float = 1.0
+    # Idempotency-Key response cache; set idempotency_store_path to persist it in SQLite
+    idempotency_max_entries: int = 10000
+    idempotency_ttl_seconds: float = 24 * 3600
+    idempotency_store_path: Optional[str] = None
+    # Token-bucket rate limits: sustained requests/second and burst size
+    rate_limit_user_rate: float = 50.0
+    rate_limit_user_burst: float = 100.0
+    rate_limit_account_rate: float = 10.0
+    rate_limit_account_burst: float = 20.0
     # Add other configuration parameters here
 
 settings = Settings()
\ No newline at end of file
@@ -1,22 +1,52 @@
-
-
+import copy
+import dataclasses
+import threading
 from typing import Dict, List
-from domain.entities import Account, Transaction # type: ignore
-from application.services import AccountRepository, TransactionRepository
+from domain.models import Account, Transaction
+from domain.models.history import TransactionHistory
+from domain.ports.account_repository import ConcurrentUpdateError
+from application.account_repository import AccountRepository
+from application.transaction_repository import TransactionRepository
 
 class InMemoryAccountRepository(AccountRepository):
+    """Hands out copies, so each reader works on its own snapshot like it would against a database.
+
+    Copies carry only the account's versioned state (balance, version,
+    status and the other fields); each starts with an empty history, so a
+    read costs the same however long the account's history is. Histories
+    are kept here instead: update_account appends what was recorded on the
+    copy, and get_transaction_history reads them back.
+    """
     def __init__(self):
         self.accounts: Dict[str, Account] = {}
+        self.histories: Dict[str, TransactionHistory] = {}
+        self._lock = threading.Lock()  # held only for the compare-and-swap itself
 
     def create_account(self, account: Account) -> None:
-        self.accounts[account.account_id] = account
+        with self._lock:
+            self.accounts[account.account_id] = dataclasses.replace(account)
+            self.histories[account.account_id] = copy.deepcopy(account.transaction_history)
 
     def get_account_by_id(self, account_id: str) -> Account | None:
-        return self.accounts.get(account_id)
-
-    def update_account(self, account: Account) -> None:
-        if account.account_id in self.accounts:
-            self.accounts[account.account_id] = account
+        account = self.accounts.get(account_id)
+        return dataclasses.replace(account) if account is not None else None
+
+    def get_transaction_history(self, account_id: str) -> List[Transaction]:
+        history = self.histories.get(account_id)
+        return list(history) if history is not None else []
+
+    def update_account(self, account: Account, expected_version: int) -> None:
+        with self._lock:
+            current = self.accounts.get(account.account_id)
+            if current is None or current.version != expected_version:
+                raise ConcurrentUpdateError(account.account_id, expected_version,
+                                            current.version if current else None)
+            version = max(account.version, expected_version + 1)
+            self.accounts[account.account_id] = dataclasses.replace(account, version=version)
+            history = self.histories[account.account_id]
+            for txn, amount, _ in account.transaction_history.entries():
+                history.append(txn, amount)
+        account.version = version
 
 class InMemoryTransactionRepository(TransactionRepository):
     def __init__(self):
@@ -28,6 +58,5 @@ class InMemoryTransactionRepository(TransactionRepository):
     def get_transactions_for_account(self, account_id: str) -> List[Transaction]:
         return [txn for txn in self.transactions if (
             txn.account_id == account_id or
-            txn.source_account_id == account_id or
-            txn.destination_account_id == account_id
+            getattr(txn, "destination_account_id", None) == account_id
         )]
@@ -0,0 +1,15 @@
+"""
+The accounts API assembled from its routers: /accounts and /transactions,
+behind the rate limiter.
+
+    uvicorn api.app:app
+"""
+from fastapi import FastAPI
+from api.rate_limit import RateLimitMiddleware
+from api.routers import account_router, transaction_router
+from api.serialization import FastJSONResponse
+
+app = FastAPI(title="Bank API", default_response_class=FastJSONResponse)
+app.add_middleware(RateLimitMiddleware)
+app.include_router(account_router.router, prefix="/accounts", tags=["accounts"])
+app.include_router(transaction_router.router, prefix="/transactions", tags=["transactions"])
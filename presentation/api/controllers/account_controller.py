@@ -2,6 +2,7 @@ from typing import List, Dict
 from datetime import datetime
 from api.models.request_models import AccountCreate
 from api.models.response_models import AccountResponse
+from api.read_model import read_model
 
 # Simple in-memory database
 accounts_db: Dict[int, dict] = {}
@@ -16,11 +17,13 @@ class AccountController:
             "id": account_id_counter,
             "name": account_data.name,
             "balance": account_data.initial_balance,
-            "created_at": datetime.now()
+            "created_at": datetime.now(),
+            "version": 0  # bumped on every balance change; drives the ETag
         }
         
         accounts_db[account_id_counter] = account
         account_id_counter += 1
+        read_model.publish(accounts=[account])
         
         return AccountResponse(**account)
     
@@ -33,6 +36,23 @@ class AccountController:
     @staticmethod
     def get_all_accounts() -> List[AccountResponse]:
         return [AccountResponse(**account) for account in accounts_db.values()]
+
+    @staticmethod
+    def get_account_record(account_id: int) -> dict:
+        """Stored account row, serialized as-is by the hot read endpoints."""
+        if account_id not in accounts_db:
+            raise ValueError("Account not found")
+        return accounts_db[account_id]
+
+    @staticmethod
+    def get_account_version(account_id: int) -> int:
+        if account_id not in accounts_db:
+            raise ValueError("Account not found")
+        return accounts_db[account_id]["version"]
+
+    @staticmethod
+    def get_all_account_records() -> List[dict]:
+        return list(accounts_db.values())
     
     @staticmethod
     def delete_account(account_id: int) -> bool:
@@ -44,5 +64,6 @@ class AccountController:
             raise ValueError("Account balance must be zero before deletion")
     
         del accounts_db[account_id]
+        read_model.publish(deleted=[account_id])
         return True
     
\ No newline at end of file
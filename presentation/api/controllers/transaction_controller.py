@@ -1,46 +1,128 @@
-from typing import List, Dict
+from typing import List, Dict, Iterator, Optional, Tuple
 from datetime import datetime
 from api.models.request_models import TransactionCreate
 from api.models.response_models import TransactionResponse
 from api.controllers.account_controller import accounts_db
+from api.pagination import CursorKey, keyset_page
+from api.read_model import read_model
 
 # Simple in-memory database
 transactions_db: Dict[int, dict] = {}
 transaction_id_counter = 1
+# Transaction ids per account in insertion order, i.e. ordered by (timestamp, id)
+account_transactions_index: Dict[int, List[int]] = {}
 
 class TransactionController:
     @staticmethod
-    def create_transaction(transaction_data: TransactionCreate) -> TransactionResponse:
-        global transaction_id_counter
-        
-        # Verify account exists
-        if transaction_data.account_id not in accounts_db:
-            raise ValueError("Account not found")
-        
-        # Update account balance
-        account = accounts_db[transaction_data.account_id]
+    def _apply_to_balance(transaction_data: TransactionCreate, balance: float) -> float:
+        """Return the balance after the transaction, or raise ValueError if it is not allowed."""
         if transaction_data.transaction_type == "deposit":
-            account["balance"] += transaction_data.amount
+            return balance + transaction_data.amount
         elif transaction_data.transaction_type == "withdrawal":
-            if account["balance"] < transaction_data.amount:
+            if balance < transaction_data.amount:
                 raise ValueError("Insufficient funds")
-            account["balance"] -= transaction_data.amount
+            return balance - transaction_data.amount
         else:
             raise ValueError("Invalid transaction type")
-        
-        # Create transaction record
+
+    @staticmethod
+    def _record_transaction(transaction_data: TransactionCreate, timestamp: datetime) -> dict:
+        global transaction_id_counter
+
         transaction = {
             "id": transaction_id_counter,
             "account_id": transaction_data.account_id,
             "amount": transaction_data.amount,
             "transaction_type": transaction_data.transaction_type,
-            "timestamp": datetime.now()
+            "timestamp": timestamp
         }
-        
+
         transactions_db[transaction_id_counter] = transaction
+        account_transactions_index.setdefault(transaction_data.account_id, []).append(transaction_id_counter)
         transaction_id_counter += 1
+        return transaction
+
+    @staticmethod
+    def create_transaction(transaction_data: TransactionCreate) -> TransactionResponse:
+        # Verify account exists
+        if transaction_data.account_id not in accounts_db:
+            raise ValueError("Account not found")
+        
+        # Update account balance
+        account = accounts_db[transaction_data.account_id]
+        account["balance"] = TransactionController._apply_to_balance(transaction_data, account["balance"])
+        account["version"] += 1
+        
+        # Create transaction record
+        transaction = TransactionController._record_transaction(transaction_data, datetime.now())
+        read_model.publish(accounts=[account], transactions=[transaction])
         
         return TransactionResponse(**transaction)
+
+    @staticmethod
+    def create_transactions_batch(items: List[Optional[TransactionCreate]], atomic: bool = False,
+                                  rejected: Optional[Dict[int, str]] = None) -> dict:
+        """Apply many transactions in one pass and report an outcome per item.
+
+        `rejected` maps positions in `items` that failed request validation to
+        their error; those positions hold None. Every item is first checked
+        against a staged copy of the touched balances, so nothing is written
+        until the batch is known to be acceptable. In atomic mode a single
+        failure rolls back the whole batch; otherwise only the failing items
+        are skipped.
+        """
+        rejected = dict(rejected or {})
+        staged_balances: Dict[int, float] = {}
+        accepted: List[Tuple[int, TransactionCreate]] = []
+
+        for index, transaction_data in enumerate(items):
+            if index in rejected:
+                continue
+            account_id = transaction_data.account_id
+            if account_id not in staged_balances:
+                if account_id not in accounts_db:
+                    rejected[index] = "Account not found"
+                    continue
+                staged_balances[account_id] = accounts_db[account_id]["balance"]
+            try:
+                staged_balances[account_id] = TransactionController._apply_to_balance(
+                    transaction_data, staged_balances[account_id]
+                )
+            except ValueError as e:
+                rejected[index] = str(e)
+                continue
+            accepted.append((index, transaction_data))
+
+        results: List[Optional[dict]] = [None] * len(items)
+        for index, error in rejected.items():
+            results[index] = {"index": index, "status": "rejected", "transaction": None, "error": error}
+
+        if atomic and rejected:
+            for index, _ in accepted:
+                results[index] = {
+                    "index": index,
+                    "status": "rolled_back",
+                    "transaction": None,
+                    "error": "Batch rolled back"
+                }
+            return {"atomic": atomic, "applied": 0, "rejected": len(rejected), "results": results}
+
+        # Commit: one balance write and version bump per changed account, then the records in order
+        changed_accounts = {transaction_data.account_id for _, transaction_data in accepted}
+        for account_id in changed_accounts:
+            accounts_db[account_id]["balance"] = staged_balances[account_id]
+            accounts_db[account_id]["version"] += 1
+        timestamp = datetime.now()
+        recorded = []
+        for index, transaction_data in accepted:
+            transaction = TransactionController._record_transaction(transaction_data, timestamp)
+            recorded.append(transaction)
+            results[index] = {"index": index, "status": "applied", "transaction": transaction, "error": None}
+        if recorded:
+            read_model.publish(accounts=[accounts_db[account_id] for account_id in changed_accounts],
+                               transactions=recorded)
+
+        return {"atomic": atomic, "applied": len(accepted), "rejected": len(rejected), "results": results}
     
     @staticmethod
     def get_account_transactions(account_id: int) -> List[TransactionResponse]:
@@ -51,4 +133,34 @@ class TransactionController:
             TransactionResponse(**tx) 
             for tx in transactions_db.values() 
             if tx["account_id"] == account_id
-        ]
\ No newline at end of file
+        ]
+
+    @staticmethod
+    def get_account_transaction_page(account_id: int, after: Optional[CursorKey],
+                                     limit: int) -> Tuple[List[dict], Optional[str]]:
+        """One keyset page of stored transaction rows and the cursor for the next one."""
+        if account_id not in accounts_db:
+            raise ValueError("Account not found")
+
+        tx_ids = account_transactions_index.get(account_id, [])
+        page, next_cursor = keyset_page(
+            tx_ids,
+            key=lambda tx_id: (transactions_db[tx_id]["timestamp"], tx_id),
+            after=after,
+            limit=limit
+        )
+        return [transactions_db[tx_id] for tx_id in page], next_cursor
+
+    @staticmethod
+    def iter_account_transaction_records(account_id: int) -> Iterator[dict]:
+        """Lazily yield every stored transaction row for streaming exports."""
+        if account_id not in accounts_db:
+            raise ValueError("Account not found")
+
+        tx_ids = account_transactions_index.get(account_id, [])
+
+        def rows() -> Iterator[dict]:
+            # Bound the walk up front so rows appended mid-stream are not picked up
+            for position in range(len(tx_ids)):
+                yield transactions_db[tx_ids[position]]
+        return rows()
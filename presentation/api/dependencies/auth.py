@@ -3,9 +3,12 @@ from fastapi.security import HTTPBasic, HTTPBasicCredentials
 
 security = HTTPBasic()
 
-def get_current_user(credentials: HTTPBasicCredentials = Depends(security)):
+def verify_credentials(username: str, password: str) -> bool:
     # In a real app, you would verify credentials against a database
-    if credentials.username != "admin" or credentials.password != "secret":
+    return username == "admin" and password == "secret"
+
+def get_current_user(credentials: HTTPBasicCredentials = Depends(security)):
+    if not verify_credentials(credentials.username, credentials.password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect credentials",
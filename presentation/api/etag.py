@@ -0,0 +1,65 @@
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional, Tuple
+
+from fastapi import Response
+
+from api.serialization import dumps
+
+
+def make_etag(resource: str, version: int) -> str:
+    """Strong ETag for one version of a resource."""
+    return f'"{resource}-v{version}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match uses weak comparison, so a W/ prefix on the client tag is ignored."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag})
+
+
+class VersionedBodyCache:
+    """LRU of serialized response bodies, each valid for exactly one resource version.
+
+    `render` returns the content and any extra headers (such as the next-page
+    cursor); it only runs when the cached body belongs to an older version.
+    """
+    def __init__(self, max_entries: int = 10000):
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[int, bytes, dict]]" = OrderedDict()
+
+    def get_or_render(self, key: Hashable, version: int,
+                      render: Callable[[], Tuple[object, dict]]) -> Tuple[bytes, dict]:
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == version:
+            self._entries.move_to_end(key)
+            return entry[1], entry[2]
+
+        content, headers = render()
+        body = dumps(content)
+        self._entries[key] = (version, body, headers)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+        return body, headers
+
+
+body_cache = VersionedBodyCache()
+
+
+def cached_json(key: Hashable, version: int, etag: str,
+                render: Callable[[], Tuple[object, dict]]) -> Response:
+    body, headers = body_cache.get_or_render(key, version, render)
+    return Response(content=body, media_type="application/json", headers={"ETag": etag, **headers})
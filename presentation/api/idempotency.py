@@ -0,0 +1,223 @@
+import asyncio
+import hashlib
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import AsyncIterator, Awaitable, Callable, Dict, Optional, Tuple
+
+from fastapi import HTTPException, Request, Response
+from fastapi.exception_handlers import http_exception_handler
+
+from infrastructure.api.config import settings
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+
+@dataclass
+class StoredResponse:
+    fingerprint: str
+    status_code: int
+    body: bytes
+    media_type: Optional[str]
+
+    def to_response(self, replayed: bool) -> Response:
+        headers = {REPLAYED_HEADER: "true"} if replayed else None
+        return Response(content=self.body, status_code=self.status_code,
+                        media_type=self.media_type, headers=headers)
+
+
+class _FingerprintedRequest(Request):
+    """The request as the handler sees it: the body comes through the fingerprint, chunk by chunk."""
+    def __init__(self, request: Request, chunks: AsyncIterator[bytes]):
+        super().__init__(request.scope, request.receive)
+        self._chunks = chunks
+
+    def stream(self) -> AsyncIterator[bytes]:
+        return self._chunks
+
+
+class RequestFingerprint:
+    """SHA-256 of a request's method, path, query and body, hashed as the body streams past.
+
+    The handler reads `request`, so a streamed body is hashed without being
+    held in memory; hexdigest() reads whatever the handler left unread.
+    """
+    def __init__(self, request: Request):
+        self._digest = hashlib.sha256(
+            request.method.encode() + b" " + request.url.path.encode() + b"?" + request.url.query.encode() + b"\n"
+        )
+        self._chunks = self._hashed(request)
+        self.request: Request = _FingerprintedRequest(request, self._chunks)
+
+    async def _hashed(self, request: Request) -> AsyncIterator[bytes]:
+        async for chunk in request.stream():
+            self._digest.update(chunk)
+            yield chunk
+
+    async def hexdigest(self) -> str:
+        async for _ in self._chunks:
+            pass
+        return self._digest.hexdigest()
+
+
+class IdempotencyStore(ABC):
+    """Persistent tier behind the in-memory cache, shared across restarts."""
+    @abstractmethod
+    def get(self, key: str) -> Optional[StoredResponse]:
+        pass
+
+    @abstractmethod
+    def put(self, key: str, stored: StoredResponse, expires_at: float) -> None:
+        pass
+
+
+class SQLiteIdempotencyStore(IdempotencyStore):
+    """One connection shared by the to_thread workers, used by one of them at a time."""
+    def __init__(self, path: str):
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS idempotency_keys ("
+            "key TEXT PRIMARY KEY, fingerprint TEXT, status_code INTEGER, "
+            "body BLOB, media_type TEXT, expires_at REAL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[StoredResponse]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT fingerprint, status_code, body, media_type FROM idempotency_keys "
+                "WHERE key = ? AND expires_at > ?",
+                (key, time.time())
+            ).fetchone()
+        return StoredResponse(*row) if row else None
+
+    def put(self, key: str, stored: StoredResponse, expires_at: float) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO idempotency_keys VALUES (?, ?, ?, ?, ?, ?)",
+                (key, stored.fingerprint, stored.status_code, stored.body, stored.media_type, expires_at)
+            )
+            self._conn.execute("DELETE FROM idempotency_keys WHERE expires_at <= ?", (time.time(),))
+            self._conn.commit()
+
+
+class IdempotencyCache:
+    """Bounded, TTL-evicting response cache keyed by Idempotency-Key.
+
+    Entries all share one TTL, so insertion order is also expiry order and
+    eviction only ever pops from the front of the OrderedDict. A request that
+    arrives while the first one with the same key is still running awaits
+    that request's result instead of executing again.
+
+    What is cached is the final status: a response, or a 4xx HTTPException
+    rendered as FastAPI would. 5xx errors and other exceptions are not
+    cached, so a retry runs again.
+    """
+    def __init__(self, max_entries: int = 10000, ttl_seconds: float = 24 * 3600,
+                 store: Optional[IdempotencyStore] = None):
+        self._max_entries = max_entries
+        self._ttl = ttl_seconds
+        self._store = store
+        self._entries: "OrderedDict[str, Tuple[float, StoredResponse]]" = OrderedDict()
+        self._in_flight: Dict[str, asyncio.Future] = {}
+
+    def _evict(self, now: float) -> None:
+        while self._entries:
+            key, (expires_at, _) = next(iter(self._entries.items()))
+            if expires_at > now and len(self._entries) <= self._max_entries:
+                break
+            self._entries.popitem(last=False)
+
+    def _remember(self, key: str, stored: StoredResponse, now: float) -> None:
+        # Re-insert at the back so the front stays the next entry to expire
+        self._entries.pop(key, None)
+        self._entries[key] = (now + self._ttl, stored)
+        self._evict(now)
+
+    async def _lookup(self, key: str, now: float) -> Optional[StoredResponse]:
+        entry = self._entries.get(key)
+        if entry and entry[0] > now:
+            return entry[1]
+        if self._store is not None:
+            stored = await asyncio.to_thread(self._store.get, key)
+            if stored is not None:
+                self._remember(key, stored, now)
+            return stored
+        return None
+
+    async def run(self, key: str, fingerprint: RequestFingerprint,
+                  handler: Callable[[Request], Awaitable[Response]]) -> Response:
+        """Run `handler` on `fingerprint.request` once per key; retries get the stored response."""
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            stored = await asyncio.shield(in_flight)
+            return self._replay(stored, await fingerprint.hexdigest())
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            now = time.monotonic()
+            stored = await self._lookup(key, now)
+            if stored is not None:
+                future.set_result(stored)
+                return self._replay(stored, await fingerprint.hexdigest())
+
+            try:
+                response = await handler(fingerprint.request)
+            except HTTPException as e:
+                if e.status_code >= 500:
+                    raise
+                response = await http_exception_handler(fingerprint.request, e)
+            stored = StoredResponse(await fingerprint.hexdigest(), response.status_code, response.body,
+                                    response.media_type)
+            self._remember(key, stored, now)
+            if self._store is not None:
+                await asyncio.to_thread(self._store.put, key, stored, time.time() + self._ttl)
+            future.set_result(stored)
+            return response
+        except BaseException as e:
+            # Waiters see the same failure; nothing is cached, so a later retry runs again
+            if not future.done():
+                if isinstance(e, asyncio.CancelledError):
+                    future.cancel()
+                else:
+                    future.set_exception(e)
+                    future.exception()  # mark retrieved when nobody is waiting
+            raise
+        finally:
+            del self._in_flight[key]
+
+    @staticmethod
+    def _replay(stored: StoredResponse, fingerprint: str) -> Response:
+        if stored.fingerprint != fingerprint:
+            raise HTTPException(status_code=422, detail="Idempotency-Key was reused with a different request")
+        return stored.to_response(replayed=True)
+
+
+def _build_cache() -> IdempotencyCache:
+    store = SQLiteIdempotencyStore(settings.idempotency_store_path) if settings.idempotency_store_path else None
+    return IdempotencyCache(
+        max_entries=settings.idempotency_max_entries,
+        ttl_seconds=settings.idempotency_ttl_seconds,
+        store=store
+    )
+
+
+idempotency_cache = _build_cache()
+
+
+async def idempotent(request: Request, idempotency_key: Optional[str], scope: str,
+                     handler: Callable[[Request], Awaitable[Response]]) -> Response:
+    """Run handler once per (scope, Idempotency-Key); retries get the stored response.
+
+    The handler is passed the request to read the body from, so a streamed
+    body is fingerprinted as it is consumed rather than read up front.
+    """
+    if not idempotency_key:
+        return await handler(request)
+    return await idempotency_cache.run(f"{scope}:{idempotency_key}", RequestFingerprint(request), handler)
@@ -1,11 +1,21 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Header, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse
 from pydantic import BaseModel
-from typing import List
-from models.service import AccountService
-from models.transaction import TransactionType
+from typing import Iterator, List, Optional
+from domain.models.transaction import DepositTransaction, Transaction, WithdrawalTransaction
+from domain.services.account_service import BankAccountService
+from api.etag import cached_json, etag_matches, make_etag, not_modified
+from api.idempotency import idempotent
+from api.rate_limit import RateLimitMiddleware
+from api.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, decode_cursor, keyset_page, page_headers
+from api.serialization import FastJSONResponse, NDJSONResponse, wants_ndjson
+from domain.services.metrics_service import registry
+from infrastructure.api.config import settings
 
-app = FastAPI(title="Bank API")
-service = AccountService()
+app = FastAPI(title="Bank API", default_response_class=FastJSONResponse)
+app.add_middleware(RateLimitMiddleware)
+service = BankAccountService()
 
 # Request Models
 class AccountCreateRequest(BaseModel):
@@ -27,49 +37,118 @@ class TransactionResponse(BaseModel):
     type: str
     timestamp: str
 
+def _account_payload(acc) -> dict:
+    return {
+        "id": acc.account_id,
+        "account_type": acc.account_type.value,
+        "balance": acc.balance,
+        "status": acc.status.value
+    }
+
+def _transaction_payload(tx) -> dict:
+    return {
+        "amount": tx.amount,
+        "type": tx.transaction_type.value,
+        "timestamp": tx.timestamp.isoformat()
+    }
+
+def _perform_transaction(account_id: str, amount: float, kind: str) -> Transaction:
+    if service.get_account(account_id) is None:
+        raise ValueError("Account not found")
+    kind = kind.lower()
+    if kind == "deposit":
+        tx = DepositTransaction(amount, account_id)
+    elif kind in ("withdraw", "withdrawal"):
+        tx = WithdrawalTransaction(amount, account_id)
+    else:
+        raise ValueError(f"Unsupported transaction type: {kind}")
+    if not service.execute_transaction(tx):
+        raise ValueError("Transaction declined")
+    return tx
+
+# Handlers that call the service are plain `def`, so FastAPI runs them in its
+# threadpool: the service takes locks and waits on fsyncs, which must not
+# stall the event loop.
+
 @app.get("/")
-def home():
+async def home():
     return {"message": "FastAPI Bank Service Running 🚀"}
 
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    return PlainTextResponse(registry.render_prometheus(), media_type="text/plain; version=0.0.4")
+
 @app.post("/accounts", response_model=AccountResponse)
 def create_account(data: AccountCreateRequest):
     account = service.create_account(data.account_type)
-    return {
-        "id": account.id,
-        "account_type": account.account_type,
-        "balance": account.balance,
-        "status": account.status
-    }
+    return _account_payload(account)
 
 @app.get("/accounts", response_model=List[AccountResponse])
 def get_all_accounts():
-    return [{
-        "id": acc.id,
-        "account_type": acc.account_type,
-        "balance": acc.balance,
-        "status": acc.status
-    } for acc in service.accounts.values()]
+    payload = [_account_payload(acc) for acc in service.get_all_accounts()]
+    if settings.validate_read_responses:
+        return payload
+    return FastJSONResponse(payload)
 
 @app.post("/accounts/{account_id}/transactions", response_model=TransactionResponse)
-def make_transaction(account_id: str, data: TransactionRequest):
-    try:
-        tx = service.perform_transaction(account_id, data.amount, data.type)
-        return {
-            "amount": tx.amount,
-            "type": tx.transaction_type,
-            "timestamp": tx.timestamp
-        }
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
+async def make_transaction(
+    account_id: str,
+    data: TransactionRequest,
+    request: Request,
+    idempotency_key: Optional[str] = Header(None)
+):
+    # This handler stays async for the idempotency cache; the service call goes to the threadpool
+    async def handler(_: Request) -> Response:
+        try:
+            tx = await run_in_threadpool(_perform_transaction, account_id, data.amount, data.type)
+            return FastJSONResponse(_transaction_payload(tx))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    return await idempotent(request, idempotency_key, "accounts", handler)
+
+def _stream_transactions(transactions) -> Iterator[dict]:
+    # Bound the walk up front so transactions appended mid-stream are not picked up
+    for position in range(len(transactions)):
+        yield _transaction_payload(transactions[position])
 
 @app.get("/accounts/{account_id}/transactions", response_model=List[TransactionResponse])
-def get_transactions(account_id: str):
+def get_transactions(
+    account_id: str,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    accept: Optional[str] = Header(None),
+    if_none_match: Optional[str] = Header(None)
+):
     account = service.get_account(account_id)
     if not account:
         raise HTTPException(status_code=404, detail="Account not found")
-    
-    return [{
-        "amount": tx.amount,
-        "type": tx.transaction_type,
-        "timestamp": tx.timestamp
-    } for tx in account.transactions]
+
+    if wants_ndjson(accept):
+        return NDJSONResponse(_stream_transactions(account.transaction_history))
+
+    try:
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    etag = make_etag(f"account-{account_id}-transactions", account.version)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    def render_page():
+        page, next_cursor = keyset_page(
+            account.transaction_history,
+            key=lambda tx: (tx.timestamp, tx.transaction_id),
+            after=after,
+            limit=limit
+        )
+        return [_transaction_payload(tx) for tx in page], page_headers(next_cursor)
+
+    if settings.validate_read_responses:
+        payload, headers = render_page()
+        response.headers.update(headers)
+        response.headers["ETag"] = etag
+        return payload
+    return cached_json(("transactions", account_id, cursor, limit), account.version, etag, render_page)
@@ -1,3 +1,4 @@
+from typing import List
 from pydantic import BaseModel
 
 class AccountCreate(BaseModel):
@@ -7,4 +8,7 @@ class AccountCreate(BaseModel):
 class TransactionCreate(BaseModel):
     account_id: int
     amount: float
-    transaction_type: str  # "deposit" or "withdrawal"
\ No newline at end of file
+    transaction_type: str  # "deposit" or "withdrawal"
+
+class TransactionBatchCreate(BaseModel):
+    transactions: List[TransactionCreate]
\ No newline at end of file
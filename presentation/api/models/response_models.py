@@ -1,3 +1,4 @@
+from typing import List, Optional
 from pydantic import BaseModel
 from datetime import datetime
 
@@ -6,10 +7,23 @@ class AccountResponse(BaseModel):
     name: str
     balance: float
     created_at: datetime
+    version: int = 0
 
 class TransactionResponse(BaseModel):
     id: int
     account_id: int
     amount: float
     transaction_type: str
-    timestamp: datetime
\ No newline at end of file
+    timestamp: datetime
+
+class TransactionBatchItemResult(BaseModel):
+    index: int
+    status: str  # "applied", "rejected" or "rolled_back"
+    transaction: Optional[TransactionResponse] = None
+    error: Optional[str] = None
+
+class TransactionBatchResponse(BaseModel):
+    atomic: bool
+    applied: int
+    rejected: int
+    results: List[TransactionBatchItemResult]
\ No newline at end of file
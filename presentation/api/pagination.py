@@ -0,0 +1,45 @@
+import base64
+import json
+from bisect import bisect_right
+from datetime import datetime
+from typing import Any, Callable, Optional, Sequence, Tuple
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+CursorKey = Tuple[datetime, Any]
+
+
+def encode_cursor(timestamp: datetime, row_id: Any) -> str:
+    """Opaque keyset cursor for the (timestamp, id) position of a row."""
+    raw = json.dumps([timestamp.isoformat(), row_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> CursorKey:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        timestamp, row_id = json.loads(raw)
+        return datetime.fromisoformat(timestamp), row_id
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def keyset_page(rows: Sequence, key: Callable[[Any], CursorKey], after: Optional[CursorKey],
+                limit: int) -> Tuple[list, Optional[str]]:
+    """Return the rows strictly after `after` and the cursor for the next page.
+
+    `rows` must already be ordered by `key`, which holds for append-only
+    histories, so the start position is found by bisection instead of a scan.
+    """
+    start = bisect_right(rows, after, key=key) if after is not None else 0
+    page = list(rows[start:start + limit])
+    next_cursor = None
+    if page and start + limit < len(rows):
+        next_cursor = encode_cursor(*key(page[-1]))
+    return page, next_cursor
+
+
+def page_headers(next_cursor: Optional[str]) -> dict:
+    return {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else {}
@@ -0,0 +1,282 @@
+import base64
+import json
+import math
+import re
+import time
+from array import array
+from collections import Counter
+from typing import Dict, List, Optional
+
+from api.dependencies.auth import verify_credentials
+from api.serialization import NDJSON_MEDIA_TYPE
+from domain.services.metrics_service import registry
+from infrastructure.api.config import settings
+
+REJECTIONS_TOTAL = "rate_limit_rejections_total"
+
+_ACCOUNT_PATH = re.compile(r"/accounts?/([^/]+)")
+_TRANSACTION_CREATE_PATH = re.compile(r"/transactions/?$")
+_TRANSACTION_BATCH_PATH = re.compile(r"/transactions/batch/?$")
+_MUTATING_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+_MAX_SNIFFED_BODY = 64 * 1024
+_MAX_SNIFFED_BATCH_BODY = 8 * 1024 * 1024
+
+
+class TokenBucketTable:
+    """Token buckets for many keys, stored as two flat float arrays.
+
+    Each key maps to a slot holding (tokens, last_seen). Refill is lazy:
+    tokens are topped up from the elapsed time only when the key is touched.
+    Keys idle long enough to have refilled completely are dropped on a
+    periodic sweep and their slots reused, so they cost nothing to forget.
+    """
+    def __init__(self, rate: float, burst: float, sweep_interval: float = 60.0):
+        self._rate = rate
+        self._burst = burst
+        self._idle_after = burst / rate if rate > 0 else float("inf")
+        self._sweep_interval = sweep_interval
+        self._next_sweep = time.monotonic() + sweep_interval
+        self._slots: Dict[str, int] = {}
+        self._free: List[int] = []
+        self._tokens = array("d")
+        self._last_seen = array("d")
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    @property
+    def burst(self) -> float:
+        return self._burst
+
+    def _slot(self, key: str, now: float) -> int:
+        slot = self._slots.get(key)
+        if slot is None:
+            if self._free:
+                slot = self._free.pop()
+                self._tokens[slot] = self._burst
+                self._last_seen[slot] = now
+            else:
+                slot = len(self._tokens)
+                self._tokens.append(self._burst)
+                self._last_seen.append(now)
+            self._slots[key] = slot
+        return slot
+
+    def try_acquire(self, key: str, now: Optional[float] = None, cost: float = 1.0) -> float:
+        """Take `cost` tokens. Returns 0 on success, else the seconds until they are available.
+
+        A cost above the burst size can never be paid, so it returns infinity
+        and takes nothing.
+        """
+        now = time.monotonic() if now is None else now
+        if now >= self._next_sweep:
+            self._sweep(now)
+
+        if cost > self._burst:
+            return float("inf")
+        slot = self._slot(key, now)
+        tokens = min(self._burst, self._tokens[slot] + (now - self._last_seen[slot]) * self._rate)
+        self._last_seen[slot] = now
+        if tokens >= cost:
+            self._tokens[slot] = tokens - cost
+            return 0.0
+        self._tokens[slot] = tokens
+        return (cost - tokens) / self._rate if self._rate > 0 else float("inf")
+
+    def refund(self, key: str, cost: float = 1.0) -> None:
+        slot = self._slots.get(key)
+        if slot is not None:
+            self._tokens[slot] = min(self._burst, self._tokens[slot] + cost)
+
+    def _sweep(self, now: float) -> None:
+        idle = [key for key, slot in self._slots.items() if now - self._last_seen[slot] >= self._idle_after]
+        for key in idle:
+            self._free.append(self._slots.pop(key))
+        self._next_sweep = now + self._sweep_interval
+
+
+def _json_or_none(data: bytes):
+    try:
+        return json.loads(data)
+    except ValueError:
+        return None
+
+
+def _client_id(scope: dict) -> str:
+    """API user from the Basic auth header if its credentials check out, else the client address.
+
+    An unverified name is never used as the key, so nobody can spend
+    another user's tokens, or dodge the limit by making names up.
+    """
+    for name, value in scope.get("headers", []):
+        if name == b"authorization" and value[:6].lower() == b"basic ":
+            try:
+                username, _, password = base64.b64decode(value[6:]).decode("utf-8").partition(":")
+            except (ValueError, UnicodeDecodeError):
+                break
+            if verify_credentials(username, password):
+                return "user:" + username
+            break
+    client = scope.get("client")
+    return f"ip:{client[0]}" if client else "anonymous"
+
+
+class RateLimitMiddleware:
+    """ASGI middleware applying token-bucket limits per API user and per target account.
+
+    Every request spends a token from the caller's bucket; mutating requests
+    also spend one from the bucket of the account they target, taken from the
+    path or, for POST /transactions, from the JSON body's account_id.
+    POST /transactions/batch is charged per transaction: one user token for
+    each, and one token per transaction from each account's bucket. A batch
+    that costs more than a full bucket is rejected with 413, as is one too
+    large to inspect. Charges are all-or-nothing, so a rejected request
+    spends no tokens.
+    """
+    def __init__(self, app, user_rate: float = None, user_burst: float = None,
+                 account_rate: float = None, account_burst: float = None):
+        self.app = app
+        self.users = TokenBucketTable(
+            user_rate if user_rate is not None else settings.rate_limit_user_rate,
+            user_burst if user_burst is not None else settings.rate_limit_user_burst
+        )
+        self.accounts = TokenBucketTable(
+            account_rate if account_rate is not None else settings.rate_limit_account_rate,
+            account_burst if account_burst is not None else settings.rate_limit_account_burst
+        )
+        self.user_rejections = registry.counter(REJECTIONS_TOTAL, "Requests rejected with 429", scope="user")
+        self.account_rejections = registry.counter(REJECTIONS_TOTAL, "Requests rejected with 429", scope="account")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        user_key = _client_id(scope)
+        retry_after = self.users.try_acquire(user_key)
+        if retry_after:
+            self.user_rejections.inc()
+            await self._reject(send, retry_after)
+            return
+
+        if scope["method"] in _MUTATING_METHODS:
+            if scope["method"] == "POST" and _TRANSACTION_BATCH_PATH.search(scope["path"]):
+                account_ids, receive = await self._batch_accounts(scope, receive)
+                # The first transaction is covered by the token already taken
+                user_cost = len(account_ids) - 1 if account_ids is not None else 0
+                charges = [(self.users, user_key, user_cost)] if user_cost > 0 else []
+            else:
+                account_id, receive = await self._target_account(scope, receive)
+                account_ids = [account_id]
+                charges = []
+            for account_id, count in Counter(a for a in account_ids or () if a is not None).items():
+                charges.append((self.accounts, f"account:{account_id}", count))
+
+            # Costs above a full bucket could never be paid: refuse them rather than discount them
+            detail = None
+            if account_ids is None:
+                detail = "Batch too large to rate-limit"
+            elif len(account_ids) > self.users.burst:
+                detail = f"Batch of {len(account_ids)} transactions exceeds the limit of {self.users.burst:g} per request"
+            elif any(cost > self.accounts.burst for table, _, cost in charges if table is self.accounts):
+                detail = f"Batch exceeds the limit of {self.accounts.burst:g} transactions per account per request"
+            if detail is not None:
+                self.users.refund(user_key)
+                await self._respond(send, 413, detail)
+                return
+
+            taken = []
+            for table, key, cost in charges:
+                retry_after = table.try_acquire(key, cost=cost)
+                if retry_after:
+                    for taken_table, taken_key, taken_cost in taken:
+                        taken_table.refund(taken_key, taken_cost)
+                    self.users.refund(user_key)
+                    (self.user_rejections if table is self.users else self.account_rejections).inc()
+                    await self._reject(send, retry_after)
+                    return
+                taken.append((table, key, cost))
+
+        await self.app(scope, receive, send)
+
+    @staticmethod
+    async def _buffer_body(receive, limit: int):
+        """Read up to `limit` bytes of the body; returns (body, complete, receive that replays it to the app)."""
+        chunks = []
+        size = 0
+        more_body = True
+        while more_body:
+            message = await receive()
+            chunks.append(message.get("body", b""))
+            size += len(chunks[-1])
+            more_body = message.get("more_body", False)
+            if size > limit:
+                break
+        body = b"".join(chunks)
+        replayed = False
+
+        async def replay():
+            nonlocal replayed
+            if not replayed:
+                replayed = True
+                return {"type": "http.request", "body": body, "more_body": more_body}
+            return await receive()
+
+        return body, not more_body, replay
+
+    @classmethod
+    async def _target_account(cls, scope, receive):
+        match = _ACCOUNT_PATH.search(scope["path"])
+        if match:
+            return match.group(1), receive
+        if scope["method"] != "POST" or not _TRANSACTION_CREATE_PATH.search(scope["path"]):
+            return None, receive
+
+        # Buffer the body to read account_id, then replay it to the app
+        body, complete, receive = await cls._buffer_body(receive, _MAX_SNIFFED_BODY)
+        account_id = None
+        if complete:
+            try:
+                account_id = json.loads(body).get("account_id")
+            except (ValueError, AttributeError):
+                pass
+        return account_id, receive
+
+    @classmethod
+    async def _batch_accounts(cls, scope, receive):
+        """The account_id of each transaction in a batch body (None where unreadable).
+
+        Returns None instead of a list when the body is too large to inspect.
+        """
+        body, complete, receive = await cls._buffer_body(receive, _MAX_SNIFFED_BATCH_BODY)
+        if not complete:
+            return None, receive
+        content_type = next((value for name, value in scope.get("headers", []) if name == b"content-type"), b"")
+        if content_type.startswith(NDJSON_MEDIA_TYPE.encode()):
+            # The endpoint applies each valid line on its own, so every line counts
+            items = [_json_or_none(line) for line in body.splitlines() if line.strip()]
+        else:
+            document = _json_or_none(body)
+            items = document.get("transactions") if isinstance(document, dict) else None
+            if not isinstance(items, list):
+                return [], receive  # rejected whole by the endpoint; the request token covers it
+        return [item.get("account_id") if isinstance(item, dict) else None for item in items], receive
+
+    @classmethod
+    async def _reject(cls, send, retry_after: float) -> None:
+        await cls._respond(send, 429, "Rate limit exceeded",
+                           [(b"retry-after", str(max(1, math.ceil(retry_after))).encode())])
+
+    @staticmethod
+    async def _respond(send, status: int, detail: str, headers: Optional[List[tuple]] = None) -> None:
+        body = json.dumps({"detail": detail}, separators=(",", ":")).encode()
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                *(headers or []),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,205 @@
+"""
+Read side of the accounts API, kept apart from the write side (CQRS).
+
+Controllers publish what each write changed: copies of the affected
+account rows, the new transaction rows and deleted account ids. A
+projector thread folds those changes into materialized views:
+- each account's JSON body and version;
+- the JSON body of the full account list, rebuilt at most once per
+  published change rather than once per request;
+- each account's history, as serialized rows ordered by (timestamp, id)
+  for keyset pages.
+
+Read endpoints serve these bytes as they are: no controller, no Pydantic
+models and no serialization on the request path, and no contention with
+the dicts the write side is mutating. Views trail writes by the
+projector's queue, normally well under a millisecond. Write handlers
+await writes_visible() before responding, so a client reads its own
+writes; the wait parks a future, never a thread or the event loop. An
+account the projector has not reached yet is read from the write side
+instead. A view's body and its version are always updated
+together, so ETags stay exact.
+"""
+import asyncio
+import logging
+import queue
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from api.pagination import CursorKey, keyset_page
+from api.serialization import dumps
+from infrastructure.api.config import settings
+
+logger = logging.getLogger("banking.read_model")
+
+
+class _History:
+    __slots__ = ("keys", "rows")
+
+    def __init__(self):
+        self.keys: List[CursorKey] = []
+        self.rows: List[bytes] = []
+
+
+class AccountReadModel:
+    def __init__(self):
+        self._changes: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._published = 0
+        self._applied = 0
+        self._waiters: List[Tuple[int, "asyncio.Future"]] = []
+        self._accounts: Dict[int, Tuple[int, bytes]] = {}
+        self._histories: Dict[int, _History] = {}
+        self._list_body: Optional[bytes] = b"[]"
+        self._thread: Optional[threading.Thread] = None
+        self._thread_lock = threading.Lock()
+
+    # Write side
+
+    def publish(self, accounts: Iterable[dict] = (), transactions: Iterable[dict] = (),
+                deleted: Iterable[int] = ()) -> int:
+        """Queue one write's changes, as row copies, and return its position in the stream."""
+        change = ([dict(row) for row in accounts], [dict(row) for row in transactions], list(deleted))
+        if self._thread is None:
+            self._start()
+        with self._lock:
+            self._published += 1
+            position = self._published
+            # Enqueued under the condition so stream order matches position order
+            self._changes.put(change)
+        return position
+
+    def _start(self) -> None:
+        with self._thread_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._project, name="account-read-model", daemon=True)
+                self._thread.start()
+
+    def _project(self) -> None:
+        while True:
+            changes = [self._changes.get()]
+            while True:  # fold everything already queued before publishing the views
+                try:
+                    changes.append(self._changes.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._apply(changes)
+            except Exception:
+                # Fold again one change at a time, so a bad change loses only itself
+                for change in changes:
+                    try:
+                        self._apply([change])
+                    except Exception:
+                        logger.exception("Read model could not project a change; its views stay as they were")
+            finally:
+                # Counted even when skipped, so no waiter hangs on a lost change
+                with self._lock:
+                    self._applied += len(changes)
+                    ready = [future for position, future in self._waiters if position <= self._applied]
+                    self._waiters = [(position, future) for position, future in self._waiters
+                                     if position > self._applied]
+                for future in ready:
+                    try:
+                        future.get_loop().call_soon_threadsafe(_resolve, future)
+                    except RuntimeError:  # its loop has closed; nobody is waiting any more
+                        pass
+
+    def _apply(self, changes: list) -> None:
+        accounts: Dict[int, Tuple[int, bytes]] = {}
+        deleted = set()
+        appended: Dict[int, List[Tuple[CursorKey, bytes]]] = {}
+        for account_rows, transaction_rows, deleted_ids in changes:
+            for row in account_rows:
+                accounts[row["id"]] = (row["version"], dumps(row))
+                deleted.discard(row["id"])
+            for account_id in deleted_ids:
+                accounts.pop(account_id, None)
+                appended.pop(account_id, None)
+                deleted.add(account_id)
+            for row in transaction_rows:
+                appended.setdefault(row["account_id"], []).append(((row["timestamp"], row["id"]), dumps(row)))
+
+        with self._lock:
+            self._accounts.update(accounts)
+            for account_id in deleted:
+                self._accounts.pop(account_id, None)
+                self._histories.pop(account_id, None)
+            for account_id, rows in appended.items():
+                history = self._histories.get(account_id)
+                if history is None:
+                    history = self._histories[account_id] = _History()
+                for key, body in rows:
+                    history.keys.append(key)
+                    history.rows.append(body)
+            if accounts or deleted:
+                self._list_body = None  # rebuilt by the next list read
+
+    async def visible(self, position: Optional[int] = None, timeout: Optional[float] = None) -> bool:
+        """Await, without blocking the event loop, until the change at `position` is visible.
+
+        By default waits for everything published so far.
+        """
+        with self._lock:
+            if position is None:
+                position = self._published
+            if self._applied >= position:
+                return True
+            future = asyncio.get_running_loop().create_future()
+            self._waiters.append((position, future))
+        try:
+            await asyncio.wait_for(future, timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            if future.cancelled():  # timed out, or the request went away
+                with self._lock:
+                    self._waiters = [waiter for waiter in self._waiters if waiter[1] is not future]
+
+    # Read side
+
+    def account(self, account_id: int) -> Optional[Tuple[int, bytes]]:
+        """(version, JSON body) of one account, or None if there is no such account."""
+        return self._accounts.get(account_id)
+
+    def all_accounts(self) -> bytes:
+        body = self._list_body
+        if body is None:
+            with self._lock:
+                if self._list_body is None:
+                    self._list_body = b"[" + b",".join(body for _, body in self._accounts.values()) + b"]"
+                body = self._list_body
+        return body
+
+    def history_page(self, account_id: int, after: Optional[CursorKey],
+                     limit: int) -> Optional[Tuple[int, bytes, Optional[str]]]:
+        """(account version, JSON array, next cursor) for one keyset page of an account's history.
+
+        None if the account is not in the read model. The version is the one
+        the page was cut at, so it can be used as the page's ETag.
+        """
+        with self._lock:
+            view = self._accounts.get(account_id)
+            if view is None:
+                return None
+            history = self._histories.get(account_id)
+            if history is None:
+                return view[0], b"[]", None
+            keys, rows = history.keys, history.rows
+            positions, next_cursor = keyset_page(range(len(keys)), key=keys.__getitem__, after=after, limit=limit)
+            return view[0], b"[" + b",".join(rows[position] for position in positions) + b"]", next_cursor
+
+
+read_model = AccountReadModel()
+
+
+def _resolve(future: "asyncio.Future") -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+async def writes_visible() -> None:
+    """Wait until this request's writes are visible, when reads are served from the read model."""
+    if settings.use_read_model:
+        await read_model.visible(timeout=settings.read_model_wait_seconds)
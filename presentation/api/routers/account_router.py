@@ -1,37 +1,73 @@
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
 from api.controllers.account_controller import AccountController
 from api.models.request_models import AccountCreate
 from api.models.response_models import AccountResponse
 from api.dependencies.auth import get_current_user
+from api.etag import cached_json, etag_matches, make_etag, not_modified
+from api.read_model import read_model, writes_visible
+from api.serialization import FastJSONResponse
+from infrastructure.api.config import settings
 
-router = APIRouter()
+router = APIRouter(default_response_class=FastJSONResponse)
 
 @router.post("/", response_model=AccountResponse)
-def create_account(account: AccountCreate, username: str = Depends(get_current_user)):
+async def create_account(account: AccountCreate, username: str = Depends(get_current_user)):
     try:
-        return AccountController.create_account(account)
+        created = AccountController.create_account(account)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
+    await writes_visible()
+    return created
 
 @router.get("/{account_id}", response_model=AccountResponse)
-def get_account(account_id: int, username: str = Depends(get_current_user)):
+async def get_account(
+    account_id: int,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    username: str = Depends(get_current_user)
+):
+    view = read_model.account(account_id) if settings.use_read_model and not settings.validate_read_responses else None
+    if view is not None:
+        version, body = view
+        etag = make_etag(f"account-{account_id}", version)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+        return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+    # Not projected yet (or read model off): read from the write side
     try:
-        return AccountController.get_account(account_id)
+        version = AccountController.get_account_version(account_id)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
+    etag = make_etag(f"account-{account_id}", version)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    if settings.validate_read_responses:
+        response.headers["ETag"] = etag
+        return AccountController.get_account(account_id)
+    # Returning a Response directly skips response_model validation
+    return cached_json(("account", account_id), version, etag,
+                       lambda: (AccountController.get_account_record(account_id), {}))
+
 @router.get("/", response_model=list[AccountResponse])
-def get_all_accounts(username: str = Depends(get_current_user)):
-    return AccountController.get_all_accounts()
+async def get_all_accounts(username: str = Depends(get_current_user)):
+    if settings.validate_read_responses:
+        return AccountController.get_all_accounts()
+    if settings.use_read_model:
+        return Response(content=read_model.all_accounts(), media_type="application/json")
+    return FastJSONResponse(AccountController.get_all_account_records())
 
 # Add this endpoint to your router
 @router.delete("/{account_id}")
-def delete_account(
+async def delete_account(
     account_id: int,
     username: str = Depends(get_current_user)
 ):
     try:
         success = AccountController.delete_account(account_id)
-        return {"status": "success", "message": f"Account {account_id} deleted"}
     except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=400, detail=str(e))
+    await writes_visible()
+    return {"status": "success", "message": f"Account {account_id} deleted"}
\ No newline at end of file
@@ -1,21 +1,137 @@
-from fastapi import APIRouter, Depends, HTTPException
+from typing import AsyncIterator, Dict, List, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
+from pydantic import ValidationError
 from api.controllers.transaction_controller import TransactionController
-from api.models.request_models import TransactionCreate
-from api.models.response_models import TransactionResponse
+from api.models.request_models import TransactionBatchCreate, TransactionCreate
+from api.models.response_models import TransactionBatchResponse, TransactionResponse
+from api.controllers.account_controller import AccountController
 from api.dependencies.auth import get_current_user
+from api.etag import cached_json, etag_matches, make_etag, not_modified
+from api.idempotency import idempotent
+from api.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, decode_cursor, page_headers
+from api.read_model import read_model, writes_visible
+from api.serialization import NDJSON_MEDIA_TYPE, FastJSONResponse, NDJSONResponse, wants_ndjson
+from infrastructure.api.config import settings
 
-router = APIRouter()
+router = APIRouter(default_response_class=FastJSONResponse)
+
+MAX_BATCH_SIZE = 10000
 
 @router.post("/", response_model=TransactionResponse)
-def create_transaction(transaction: TransactionCreate, username: str = Depends(get_current_user)):
+async def create_transaction(
+    transaction: TransactionCreate,
+    request: Request,
+    idempotency_key: Optional[str] = Header(None),
+    username: str = Depends(get_current_user)
+):
+    async def handler(_: Request) -> Response:
+        try:
+            created = TransactionController.create_transaction(transaction)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        await writes_visible()
+        return FastJSONResponse(created.model_dump())
+
+    return await idempotent(request, idempotency_key, username, handler)
+
+async def _ndjson_lines(request: Request) -> AsyncIterator[bytes]:
+    buffer = b""
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield line
+    if buffer.strip():
+        yield buffer
+
+@router.post("/batch", response_model=TransactionBatchResponse)
+async def create_transactions_batch(
+    request: Request,
+    atomic: bool = False,
+    idempotency_key: Optional[str] = Header(None),
+    username: str = Depends(get_current_user)
+):
+    """Apply a batch of transactions sent as {"transactions": [...]} or as NDJSON lines.
+
+    With atomic=true the batch is all-or-nothing; otherwise each item
+    succeeds or fails on its own.
+    """
+    return await idempotent(request, idempotency_key, username, lambda request: _apply_batch(request, atomic))
+
+async def _apply_batch(request: Request, atomic: bool) -> Response:
+    items: List[Optional[TransactionCreate]] = []
+    rejected: Dict[int, str] = {}
+
+    if request.headers.get("content-type", "").startswith(NDJSON_MEDIA_TYPE):
+        async for line in _ndjson_lines(request):
+            if len(items) >= MAX_BATCH_SIZE:
+                raise HTTPException(status_code=413, detail=f"Batch exceeds {MAX_BATCH_SIZE} transactions")
+            try:
+                items.append(TransactionCreate.model_validate_json(line))
+            except ValidationError as e:
+                rejected[len(items)] = str(e)
+                items.append(None)
+    else:
+        try:
+            batch = TransactionBatchCreate.model_validate_json(await request.body())
+        except ValidationError as e:
+            raise HTTPException(status_code=422, detail=e.errors())
+        if len(batch.transactions) > MAX_BATCH_SIZE:
+            raise HTTPException(status_code=413, detail=f"Batch exceeds {MAX_BATCH_SIZE} transactions")
+        items = batch.transactions
+
+    result = TransactionController.create_transactions_batch(items, atomic, rejected)
+    await writes_visible()
+    return FastJSONResponse(result)
+
+@router.get("/account/{account_id}", response_model=list[TransactionResponse])
+async def get_account_transactions(
+    account_id: int,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    accept: Optional[str] = Header(None),
+    if_none_match: Optional[str] = Header(None),
+    username: str = Depends(get_current_user)
+):
     try:
-        return TransactionController.create_transaction(transaction)
+        after = decode_cursor(cursor) if cursor else None
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-@router.get("/account/{account_id}", response_model=list[TransactionResponse])
-def get_account_transactions(account_id: int, username: str = Depends(get_current_user)):
+    if settings.use_read_model and not settings.validate_read_responses and not wants_ndjson(accept):
+        view = read_model.account(account_id)
+        if view is not None:
+            etag = make_etag(f"account-{account_id}-transactions", view[0])
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag)
+            page = read_model.history_page(account_id, after, limit)
+            if page is not None:
+                version, body, next_cursor = page
+                headers = {"ETag": make_etag(f"account-{account_id}-transactions", version),
+                           **page_headers(next_cursor)}
+                return Response(content=body, media_type="application/json", headers=headers)
+
     try:
-        return TransactionController.get_account_transactions(account_id)
+        if wants_ndjson(accept):
+            return NDJSONResponse(TransactionController.iter_account_transaction_records(account_id))
+        version = AccountController.get_account_version(account_id)
     except ValueError as e:
-        raise HTTPException(status_code=404, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=404, detail=str(e))
+
+    # History only grows through balance changes, so the account version also versions the history
+    etag = make_etag(f"account-{account_id}-transactions", version)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    def render_page():
+        records, next_cursor = TransactionController.get_account_transaction_page(account_id, after, limit)
+        return records, page_headers(next_cursor)
+
+    if settings.validate_read_responses:
+        records, headers = render_page()
+        response.headers.update(headers)
+        response.headers["ETag"] = etag
+        return [TransactionResponse(**tx) for tx in records]
+    return cached_json(("transactions", account_id, cursor, limit), version, etag, render_page)
\ No newline at end of file
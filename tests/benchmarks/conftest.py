@@ -0,0 +1,106 @@
+"""
+Shared setup for the hot-path benchmark suite.
+
+Run with pytest-benchmark installed, e.g.:
+
+    pytest tests/benchmarks --bench-scale 1k --bench-scale 100k
+    pytest tests/benchmarks --bench-update-baseline      # record a new baseline
+
+Every benchmark records ops/sec and p50/p99/p999 latency. When the baseline
+file already holds an entry for a benchmark, a drop in ops/sec larger than
+--bench-threshold fails that benchmark. The baseline lives under
+.benchmarks/ in the rootdir, next to pytest-benchmark's own storage,
+unless --bench-baseline names another file.
+"""
+import json
+import os
+import pytest
+
+SCALES = {"1k": 1_000, "100k": 100_000, "1m": 1_000_000}
+DEFAULT_BASELINE = os.path.join(".benchmarks", "baseline.json")  # relative to the rootdir
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("bank-benchmarks")
+    group.addoption("--bench-scale", action="append", choices=sorted(SCALES),
+                    help="Number of accounts to benchmark against (repeatable, default 1k)")
+    group.addoption("--bench-baseline", default=None,
+                    help=f"JSON file holding the baseline results (default <rootdir>/{DEFAULT_BASELINE})")
+    group.addoption("--bench-threshold", type=float, default=0.20,
+                    help="Allowed fractional drop in ops/sec before a benchmark fails")
+    group.addoption("--bench-update-baseline", action="store_true",
+                    help="Overwrite the baseline with this run's results")
+
+
+def pytest_generate_tests(metafunc):
+    if "scale" in metafunc.fixturenames:
+        scales = metafunc.config.getoption("--bench-scale", None) or ["1k"]
+        metafunc.parametrize("scale", [SCALES[s] for s in scales], ids=scales, scope="module")
+
+
+def _percentile(sorted_data, fraction):
+    index = min(len(sorted_data) - 1, int(round(fraction * (len(sorted_data) - 1))))
+    return sorted_data[index]
+
+
+def _baseline_path(config):
+    return config.getoption("--bench-baseline", None) or os.path.join(str(config.rootpath), DEFAULT_BASELINE)
+
+
+def _load_baseline(config):
+    if not hasattr(config, "_bench_baseline"):
+        path = _baseline_path(config)
+        config._bench_baseline = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                config._bench_baseline = json.load(f)
+        config._bench_results = {}
+    return config._bench_baseline
+
+
+@pytest.fixture
+def bench(benchmark, request):
+    """pytest-benchmark's fixture, plus percentiles and a baseline regression check."""
+    config = request.config
+    baseline = _load_baseline(config)
+    yield benchmark
+
+    metadata = getattr(benchmark, "stats", None)
+    if not metadata:
+        return  # benchmarking disabled for this run
+    data = sorted(metadata.stats.data)
+    result = {
+        "ops": metadata.stats.ops,
+        "p50_s": _percentile(data, 0.50),
+        "p99_s": _percentile(data, 0.99),
+        "p999_s": _percentile(data, 0.999),
+    }
+    benchmark.extra_info.update(result)
+    name = request.node.name
+    config._bench_results[name] = result
+
+    previous = baseline.get(name)
+    if previous and not config.getoption("--bench-update-baseline", False):
+        threshold = config.getoption("--bench-threshold", 0.20)
+        floor = previous["ops"] * (1 - threshold)
+        if result["ops"] < floor:
+            pytest.fail(
+                f"{name} regressed: {result['ops']:.1f} ops/s vs baseline "
+                f"{previous['ops']:.1f} ops/s (threshold {threshold:.0%})"
+            )
+
+
+def pytest_sessionfinish(session):
+    config = session.config
+    results = getattr(config, "_bench_results", None)
+    if not results:
+        return
+    path = _baseline_path(config)
+    update = config.getoption("--bench-update-baseline", False)
+    baseline = dict(config._bench_baseline)
+    for name, result in results.items():
+        if update or name not in baseline:
+            baseline[name] = result
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(baseline, f, indent=4, sort_keys=True)
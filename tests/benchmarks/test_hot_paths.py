@@ -0,0 +1,127 @@
+import csv
+import os
+import random
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from domain.loans.fraud import FraudDetectionService
+from domain.loans.loan import FixedRateLoan, LoanType
+from domain.models.statement import StatementGenerator
+from domain.models.transaction import DepositTransaction
+from domain.services.account_service import BankAccountService
+from domain.services.statement_service import StatementService
+
+HISTORY_LENGTH = 6000  # transactions on the account used for statement benchmarks
+
+
+@pytest.fixture(scope="module")
+def workdir(tmp_path_factory):
+    """LimitEnforcementService and the statement exporters write into the cwd."""
+    path = tmp_path_factory.mktemp("bench")
+    previous = os.getcwd()
+    os.chdir(path)
+    yield path
+    os.chdir(previous)
+
+
+@pytest.fixture(scope="module")
+def populated_service(workdir, scale):
+    service = BankAccountService()
+    account_ids = [
+        service.create_account("savings" if i % 2 else "checking", initial_balance=1_000_000.0).account_id
+        for i in range(scale)
+    ]
+    return service, account_ids
+
+
+@pytest.fixture(scope="module")
+def ledger_csv(workdir, populated_service):
+    """A transactions.csv in the GUI's format with one row per account."""
+    _, account_ids = populated_service
+    path = os.path.join(workdir, "transactions.csv")
+    start = datetime(2025, 4, 1)
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Transaction ID", "Account ID", "Type", "Amount", "Date", "Related Account", "Balance After"])
+        for i, account_id in enumerate(account_ids):
+            writer.writerow([i, account_id, "deposit", "100.00",
+                             (start + timedelta(seconds=i)).strftime("%Y-%m-%d %H:%M:%S"), "", "100.00"])
+    return path
+
+
+def _picker(account_ids):
+    rng = random.Random(42)
+    return lambda: account_ids[rng.randrange(len(account_ids))]
+
+
+def test_deposit(bench, populated_service):
+    service, account_ids = populated_service
+    pick = _picker(account_ids)
+    bench(lambda: service.deposit(pick(), 1.0))
+
+
+def test_withdraw(bench, populated_service):
+    service, account_ids = populated_service
+    pick = _picker(account_ids)
+    bench(lambda: service.withdraw(pick(), 1.0))
+
+
+def test_transfer(bench, populated_service):
+    service, account_ids = populated_service
+    pick = _picker(account_ids)
+    bench(lambda: service.transfer(pick(), pick(), 1.0))
+
+
+def test_check_limit(bench, populated_service):
+    service, account_ids = populated_service
+    pick = _picker(account_ids)
+    bench(lambda: service.limit_service.check_limit(pick(), 0.01))
+
+
+def test_statement_generator(bench, populated_service):
+    """A year of history spread evenly; the statement covers one month of it."""
+    service, account_ids = populated_service
+    account = service.get_account(account_ids[0])
+    start = datetime(2024, 1, 1)
+    step = timedelta(days=365) / HISTORY_LENGTH
+    for i in range(HISTORY_LENGTH):
+        transaction = DepositTransaction(1.0, account.account_id)
+        transaction.timestamp = start + step * i
+        account.deposit(1.0, transaction)
+    bench(StatementGenerator().generate_statement, account, 6, 2024)
+
+
+def test_statement_service(bench, populated_service, ledger_csv):
+    service, account_ids = populated_service
+    statements = StatementService(service, ledger_csv)
+    pick = _picker(account_ids)
+    start, end = datetime(2025, 4, 1), datetime(2025, 4, 30, 23, 59, 59)
+    bench.pedantic(lambda: statements.generate_statement(pick(), start, end), rounds=5, iterations=1)
+
+
+def test_fraud_check(bench, populated_service):
+    service, account_ids = populated_service
+    fraud = FraudDetectionService()
+    account = service.get_account(account_ids[0])
+    transaction = DepositTransaction(250.0, account.account_id)
+    bench(fraud.check_transaction, transaction, account)
+
+
+def test_fixed_rate_loan_construction(bench):
+    bench(lambda: FixedRateLoan(
+        loan_id="LOAN-1",
+        account_id="ACC-1",
+        principal=Decimal("250000"),
+        annual_interest_rate=Decimal("0.065"),
+        term_months=360,
+        loan_type=LoanType.MORTGAGE
+    ))
+
+
+def test_apply_interest_batch(bench, populated_service):
+    service, account_ids = populated_service
+    bench.pedantic(service.apply_interest_batch, args=(account_ids,), rounds=3, iterations=1)
@@ -0,0 +1,331 @@
+"""
+In-process load generator for the FastAPI app.
+
+Requests are handed straight to the ASGI callable, so no server, socket or
+network is involved and the numbers reflect the app itself. Two workloads:
+
+    # synthetic mix against the routers (presentation/api/app.py)
+    python tests/load/load_generator.py --requests 20000 --concurrency 128
+
+    # replay a recorded JSONL request log
+    python tests/load/load_generator.py --replay recorded.jsonl --concurrency 32
+
+Each replay line is an object like
+    {"method": "POST", "path": "/transactions/",
+     "headers": {"Idempotency-Key": "k1", "Authorization": "Basic YWRtaW46c2VjcmV0"},
+     "json": {"account_id": 1, "amount": 10, "transaction_type": "deposit"}, "name": "deposit"}
+where only "path" is required. "name" groups lines in the report; it
+defaults to the method and path.
+"""
+import argparse
+import asyncio
+import base64
+import importlib
+import itertools
+import json
+import os
+import random
+import sys
+import time
+from collections import Counter, defaultdict
+from typing import Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+for path in (ROOT, os.path.join(ROOT, "presentation")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+DEFAULT_MIX = "create=5,deposit=30,withdraw=15,transfer=10,batch=10,history=30"
+# The routers sit behind HTTP Basic auth (api/dependencies/auth.py)
+AUTH_HEADERS = {"Authorization": "Basic " + base64.b64encode(b"admin:secret").decode()}
+
+# An operation issues one or more requests and returns their status codes
+Operation = Tuple[str, Callable[[], Awaitable[List[int]]]]
+
+
+class ASGIClient:
+    """Minimal HTTP/1.1 client that calls an ASGI app in-process."""
+    def __init__(self, app, client_address: Tuple[str, int] = ("127.0.0.1", 50000)):
+        self.app = app
+        self.client_address = client_address
+
+    async def request(self, method: str, path: str, query: str = "", headers: Optional[Dict[str, str]] = None,
+                      body: bytes = b"") -> Tuple[int, bytes]:
+        raw_headers = [(k.lower().encode("latin-1"), str(v).encode("latin-1")) for k, v in (headers or {}).items()]
+        if body:
+            raw_headers.append((b"content-length", str(len(body)).encode()))
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method.upper(),
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": query.encode(),
+            "root_path": "",
+            "headers": raw_headers,
+            "client": self.client_address,
+            "server": ("loadgen", 80),
+        }
+        response_done = asyncio.Event()
+        request_sent = False
+        status = 0
+        chunks: List[bytes] = []
+
+        async def receive():
+            nonlocal request_sent
+            if not request_sent:
+                request_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            # Streaming responses listen for a disconnect; only report one once they finish
+            await response_done.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+                if not message.get("more_body", False):
+                    response_done.set()
+
+        await self.app(scope, receive, send)
+        response_done.set()
+        return status, b"".join(chunks)
+
+    async def json_request(self, method: str, path: str, payload=None, **kwargs) -> Tuple[int, bytes]:
+        headers = dict(kwargs.pop("headers", None) or {})
+        body = b""
+        if payload is not None:
+            body = json.dumps(payload).encode()
+            headers.setdefault("content-type", "application/json")
+        return await self.request(method, path, headers=headers, body=body, **kwargs)
+
+
+class SyntheticWorkload:
+    """Weighted mix of account creation, transactions, batches and history reads.
+
+    A transfer is an atomic two-item batch: a withdrawal from one account
+    and a deposit into another. A batch is several deposits and withdrawals
+    across random accounts, each applied on its own.
+    """
+    def __init__(self, client: ASGIClient, mix: Dict[str, int], seed: int = 42, batch_size: int = 20):
+        self.client = client
+        self.rng = random.Random(seed)
+        self.batch_size = batch_size
+        self.account_ids: List[int] = []
+        self.names = list(mix)
+        self.weights = [mix[name] for name in self.names]
+
+    async def _post(self, path: str, payload: dict, query: str = "") -> Tuple[int, bytes]:
+        return await self.client.json_request("POST", path, payload, query=query, headers=AUTH_HEADERS)
+
+    async def _create(self) -> List[int]:
+        status, body = await self._post("/accounts/", {"name": f"load-{len(self.account_ids)}",
+                                                       "initial_balance": 1000.0})
+        if status == 200:
+            self.account_ids.append(json.loads(body)["id"])
+        return [status]
+
+    def _item(self, account_id: int, kind: str, amount: float) -> dict:
+        return {"account_id": account_id, "amount": round(amount, 2), "transaction_type": kind}
+
+    async def _transaction(self, account_id: int, kind: str, amount: float) -> int:
+        status, _ = await self._post("/transactions/", self._item(account_id, kind, amount))
+        return status
+
+    async def _deposit(self) -> List[int]:
+        return [await self._transaction(self.rng.choice(self.account_ids), "deposit", self.rng.uniform(1, 500))]
+
+    async def _withdraw(self) -> List[int]:
+        return [await self._transaction(self.rng.choice(self.account_ids), "withdrawal", self.rng.uniform(1, 100))]
+
+    async def _transfer(self) -> List[int]:
+        if len(self.account_ids) < 2:
+            return await self._create()
+        source, target = self.rng.sample(self.account_ids, 2)
+        amount = self.rng.uniform(1, 100)
+        items = [self._item(source, "withdrawal", amount), self._item(target, "deposit", amount)]
+        status, _ = await self._post("/transactions/batch", {"transactions": items}, query="atomic=true")
+        return [status]
+
+    async def _batch(self) -> List[int]:
+        items = [self._item(self.rng.choice(self.account_ids), self.rng.choice(["deposit", "withdrawal"]),
+                            self.rng.uniform(1, 100))
+                 for _ in range(self.batch_size)]
+        status, _ = await self._post("/transactions/batch", {"transactions": items})
+        return [status]
+
+    async def _history(self) -> List[int]:
+        status, _ = await self.client.request(
+            "GET", f"/transactions/account/{self.rng.choice(self.account_ids)}", query="limit=100",
+            headers=AUTH_HEADERS
+        )
+        return [status]
+
+    async def seed(self, count: int) -> None:
+        for _ in range(count):
+            await self._create()
+        for account_id in list(self.account_ids):
+            await self._transaction(account_id, "deposit", 10_000.0)
+
+    def operations(self) -> Iterator[Operation]:
+        handlers = {
+            "create": self._create, "deposit": self._deposit, "withdraw": self._withdraw,
+            "transfer": self._transfer, "batch": self._batch, "history": self._history,
+        }
+        while True:
+            name = self.rng.choices(self.names, self.weights)[0]
+            if name != "create" and not self.account_ids:
+                name = "create"
+            yield name, handlers[name]
+
+
+def replay_operations(client: ASGIClient, filename: str) -> Iterator[Operation]:
+    with open(filename) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            method = record.get("method", "GET")
+            name = record.get("name") or f"{method} {record['path']}"
+
+            async def run(record=record, method=method) -> List[int]:
+                status, _ = await client.json_request(
+                    method, record["path"], record.get("json"),
+                    query=record.get("query", ""), headers=record.get("headers")
+                )
+                return [status]
+            yield name, run
+
+
+def _percentile(sorted_data: List[float], fraction: float) -> float:
+    if not sorted_data:
+        return 0.0
+    index = min(len(sorted_data) - 1, int(round(fraction * (len(sorted_data) - 1))))
+    return sorted_data[index]
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Counter = Counter()
+        self.statuses: Counter = Counter()
+
+    def record(self, name: str, seconds: float, statuses: List[int]) -> None:
+        self.latencies[name].append(seconds)
+        self.statuses.update(statuses)
+        if not statuses or any(status >= 400 for status in statuses):
+            self.errors[name] += 1
+
+    def report(self, elapsed: float) -> dict:
+        def summarize(latencies: List[float], errors: int) -> dict:
+            latencies = sorted(latencies)
+            return {
+                "requests": len(latencies),
+                "throughput_rps": len(latencies) / elapsed if elapsed else 0.0,
+                "error_rate": errors / len(latencies) if latencies else 0.0,
+                "p50_ms": _percentile(latencies, 0.50) * 1000,
+                "p99_ms": _percentile(latencies, 0.99) * 1000,
+                "p999_ms": _percentile(latencies, 0.999) * 1000,
+            }
+
+        everything = list(itertools.chain.from_iterable(self.latencies.values()))
+        return {
+            "elapsed_s": elapsed,
+            "total": summarize(everything, sum(self.errors.values())),
+            "operations": {name: summarize(values, self.errors[name]) for name, values in sorted(self.latencies.items())},
+            "status_codes": {str(code): count for code, count in sorted(self.statuses.items())},
+        }
+
+
+async def run_load(operations: Iterator[Operation], concurrency: int, max_operations: Optional[int],
+                   duration: Optional[float]) -> dict:
+    recorder = Recorder()
+    source = itertools.islice(operations, max_operations) if max_operations else operations
+    deadline = time.perf_counter() + duration if duration else None
+
+    async def worker():
+        for name, operation in source:
+            if deadline and time.perf_counter() >= deadline:
+                return
+            start = time.perf_counter()
+            try:
+                statuses = await operation()
+            except Exception:
+                statuses = []
+            recorder.record(name, time.perf_counter() - start, statuses)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return recorder.report(time.perf_counter() - start)
+
+
+def print_report(report: dict) -> None:
+    print(f"elapsed: {report['elapsed_s']:.2f}s")
+    header = f"{'operation':<28}{'requests':>10}{'rps':>12}{'errors':>9}{'p50 ms':>10}{'p99 ms':>10}{'p999 ms':>10}"
+    print(header)
+    print("-" * len(header))
+    rows = list(report["operations"].items()) + [("TOTAL", report["total"])]
+    for name, stats in rows:
+        print(f"{name:<28}{stats['requests']:>10}{stats['throughput_rps']:>12.1f}{stats['error_rate']:>8.2%} "
+              f"{stats['p50_ms']:>9.3f}{stats['p99_ms']:>10.3f}{stats['p999_ms']:>10.3f}")
+    print("status codes:", report["status_codes"])
+
+
+def _parse_mix(spec: str) -> Dict[str, int]:
+    mix = {}
+    for part in spec.split(","):
+        name, weight = part.split("=")
+        mix[name.strip()] = int(weight)
+    return mix
+
+
+def _load_app(target: str):
+    module_name, _, attr = target.partition(":")
+    return getattr(importlib.import_module(module_name), attr or "app")
+
+
+def main(argv: Optional[List[str]] = None) -> dict:
+    parser = argparse.ArgumentParser(description="Drive the FastAPI app in-process and report latency/throughput")
+    parser.add_argument("--app", default="api.app:app", help="ASGI app as module:attribute")
+    parser.add_argument("--replay", help="JSONL request log to replay instead of the synthetic mix")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Synthetic operation weights")
+    parser.add_argument("--seed-accounts", type=int, default=100, help="Accounts created before measuring")
+    parser.add_argument("--requests", type=int, default=10000, help="Operations to run (0 = until --duration)")
+    parser.add_argument("--duration", type=float, help="Stop after this many seconds")
+    parser.add_argument("--concurrency", type=int, default=64, help="Concurrent in-flight operations")
+    parser.add_argument("--keep-rate-limits", action="store_true",
+                        help="Leave the rate limiter at its configured limits instead of lifting them")
+    parser.add_argument("--json", help="Also write the report to this file")
+    args = parser.parse_args(argv)
+
+    if not args.keep_rate_limits:
+        from infrastructure.api.config import settings
+        settings.rate_limit_user_rate = settings.rate_limit_user_burst = float("1e12")
+        settings.rate_limit_account_rate = settings.rate_limit_account_burst = float("1e12")
+
+    app = _load_app(args.app)
+    client = ASGIClient(app)
+
+    async def run() -> dict:
+        if args.replay:
+            operations = replay_operations(client, args.replay)
+        else:
+            workload = SyntheticWorkload(client, _parse_mix(args.mix))
+            await workload.seed(args.seed_accounts)
+            operations = workload.operations()
+        return await run_load(operations, args.concurrency, args.requests or None, args.duration)
+
+    report = asyncio.run(run())
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=4)
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# The API package is imported as `api`, from presentation/
+PRESENTATION = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "presentation")
+if PRESENTATION not in sys.path:
+    sys.path.insert(0, PRESENTATION)
@@ -0,0 +1,73 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api.app import app
+from api.routers import transaction_router
+
+ADMIN = ("admin", "secret")
+
+
+@pytest.fixture
+def client():
+    with TestClient(app) as client:
+        yield client
+
+
+def open_account(client, balance: float) -> int:
+    return client.post("/accounts/", json={"name": "batch", "initial_balance": balance}, auth=ADMIN).json()["id"]
+
+
+def balance(client, account_id: int) -> float:
+    return client.get(f"/accounts/{account_id}", auth=ADMIN).json()["balance"]
+
+
+def item(account_id: int, amount: float, kind: str = "deposit") -> dict:
+    return {"account_id": account_id, "amount": amount, "transaction_type": kind}
+
+
+def test_best_effort_batch_applies_what_it_can(client):
+    account_id = open_account(client, 10.0)
+    response = client.post("/transactions/batch", auth=ADMIN, json={"transactions": [
+        item(account_id, 5.0), item(account_id, 50.0, "withdrawal"), item(account_id, 15.0, "withdrawal")]})
+
+    outcome = response.json()
+    assert (outcome["applied"], outcome["rejected"]) == (2, 1)
+    assert [result["status"] for result in outcome["results"]] == ["applied", "rejected", "applied"]
+    assert outcome["results"][1]["error"] == "Insufficient funds"
+    assert balance(client, account_id) == 0.0
+
+
+def test_atomic_batch_rolls_back_on_any_failure(client):
+    account_id = open_account(client, 10.0)
+    response = client.post("/transactions/batch", params={"atomic": "true"}, auth=ADMIN, json={"transactions": [
+        item(account_id, 5.0), item(999999, 1.0)]})
+
+    outcome = response.json()
+    assert outcome["applied"] == 0
+    assert [result["status"] for result in outcome["results"]] == ["rolled_back", "rejected"]
+    assert balance(client, account_id) == 10.0
+
+
+def test_ndjson_batch_reports_unparseable_lines_by_position(client):
+    account_id = open_account(client, 0.0)
+    body = "\n".join([json.dumps(item(account_id, 1.0)), "{broken", json.dumps(item(account_id, 2.0))])
+    response = client.post("/transactions/batch", content=body, auth=ADMIN,
+                           headers={"Content-Type": "application/x-ndjson"})
+
+    outcome = response.json()
+    assert [result["status"] for result in outcome["results"]] == ["applied", "rejected", "applied"]
+    assert balance(client, account_id) == 3.0
+
+
+def test_oversized_batch_is_refused(client, monkeypatch):
+    monkeypatch.setattr(transaction_router, "MAX_BATCH_SIZE", 2)
+    account_id = open_account(client, 0.0)
+    lines = "\n".join(json.dumps(item(account_id, 1.0)) for _ in range(3))
+
+    assert client.post("/transactions/batch", content=lines, auth=ADMIN,
+                       headers={"Content-Type": "application/x-ndjson"}).status_code == 413
+    assert client.post("/transactions/batch", json={"transactions": [item(account_id, 1.0)] * 3},
+                       auth=ADMIN).status_code == 413
+    assert balance(client, account_id) == 0.0
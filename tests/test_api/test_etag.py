@@ -0,0 +1,54 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from api.app import app
+from api.etag import VersionedBodyCache, etag_matches, make_etag
+from infrastructure.api.config import settings
+
+ADMIN = ("admin", "secret")
+
+
+def test_if_none_match_uses_weak_comparison():
+    etag = make_etag("account-1", 3)
+    assert etag_matches(f'"other", W/{etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches(make_etag("account-1", 2), etag)
+    assert not etag_matches(None, etag)
+
+
+def test_body_is_rendered_once_per_version():
+    cache = VersionedBodyCache(max_entries=1)
+    renders = []
+
+    def render(value):
+        def rendered():
+            renders.append(value)
+            return {"value": value}, {}
+        return rendered
+
+    assert cache.get_or_render("a", 1, render(1)) == (b'{"value":1}', {})
+    assert cache.get_or_render("a", 1, render(2)) == (b'{"value":1}', {})
+    assert cache.get_or_render("a", 2, render(3)) == (b'{"value":3}', {})
+    cache.get_or_render("b", 1, render(4))  # evicts "a"
+    cache.get_or_render("a", 2, render(5))
+    assert renders == [1, 3, 4, 5]
+
+
+@pytest.mark.parametrize("use_read_model", [True, False])
+def test_conditional_get_follows_the_account_version(monkeypatch, use_read_model):
+    monkeypatch.setattr(settings, "use_read_model", use_read_model)
+    with TestClient(app) as client:
+        account_id = client.post("/accounts/", json={"name": "etag", "initial_balance": 5.0}, auth=ADMIN).json()["id"]
+        urls = (f"/accounts/{account_id}", f"/transactions/account/{account_id}")
+        etags = [client.get(url, auth=ADMIN).headers["ETag"] for url in urls]
+        for url, etag in zip(urls, etags):
+            assert client.get(url, headers={"If-None-Match": etag}, auth=ADMIN).status_code == 304
+
+        client.post("/transactions/", json={"account_id": account_id, "amount": 1.0, "transaction_type": "deposit"},
+                    auth=ADMIN)
+        changed = [client.get(url, headers={"If-None-Match": etag}, auth=ADMIN) for url, etag in zip(urls, etags)]
+
+    assert [response.status_code for response in changed] == [200, 200]
+    assert all(response.headers["ETag"] != etag for response, etag in zip(changed, etags))
+    assert changed[0].json()["balance"] == 6.0
+    assert [tx["amount"] for tx in changed[1].json()] == [1.0]
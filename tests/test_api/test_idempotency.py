@@ -0,0 +1,110 @@
+import asyncio
+import hashlib
+import json
+
+import pytest
+from fastapi import HTTPException, Request
+from fastapi.testclient import TestClient
+
+from api.idempotency import REPLAYED_HEADER, IdempotencyCache, RequestFingerprint
+from api.serialization import FastJSONResponse
+
+ADMIN = ("admin", "secret")
+
+
+def streamed_request(chunks, pulled):
+    """A POST whose body arrives in `chunks`; `pulled` counts the chunks taken so far."""
+    messages = [{"type": "http.request", "body": chunk, "more_body": index < len(chunks) - 1}
+                for index, chunk in enumerate(chunks)]
+
+    async def receive():
+        pulled.append(1)
+        return messages[len(pulled) - 1]
+
+    scope = {"type": "http", "method": "POST", "path": "/transactions/batch", "query_string": b"atomic=true",
+             "headers": [], "server": ("test", 80), "scheme": "http", "root_path": ""}
+    return Request(scope, receive)
+
+
+def expected_digest(body: bytes) -> str:
+    return hashlib.sha256(b"POST /transactions/batch?atomic=true\n" + body).hexdigest()
+
+
+def test_body_is_fingerprinted_as_the_handler_streams_it():
+    chunks = [b'{"a": 1}\n', b'{"a": 2}\n', b'{"a": 3}\n']
+    pulled = []
+    fingerprint = RequestFingerprint(streamed_request(chunks, pulled))
+
+    async def scenario():
+        seen = []
+        async for chunk in fingerprint.request.stream():
+            seen.append((chunk, len(pulled)))
+            if len(seen) == 2:
+                break  # the handler stops early; the rest is read for the fingerprint only
+        return seen, await fingerprint.hexdigest()
+
+    seen, digest = asyncio.run(scenario())
+    assert seen == [(chunks[0], 1), (chunks[1], 2)]
+    assert digest == expected_digest(b"".join(chunks))
+
+
+def run(cache, key, body, handler):
+    return asyncio.run(cache.run(key, RequestFingerprint(streamed_request([body], [])), handler))
+
+
+def test_client_errors_are_cached_as_the_final_response():
+    cache = IdempotencyCache()
+    calls = []
+
+    async def rejecting(request):
+        calls.append(await request.body())
+        raise HTTPException(status_code=409, detail="Conflict")
+
+    first = run(cache, "k", b"body", rejecting)
+    second = run(cache, "k", b"body", rejecting)
+    assert calls == [b"body"]
+    assert (first.status_code, json.loads(first.body)) == (409, {"detail": "Conflict"})
+    assert (second.status_code, second.body, second.headers[REPLAYED_HEADER]) == (409, first.body, "true")
+
+
+def test_server_errors_are_not_cached():
+    cache = IdempotencyCache()
+    calls = []
+
+    async def failing(request):
+        calls.append(1)
+        raise HTTPException(status_code=503, detail="Unavailable")
+
+    for _ in range(2):
+        with pytest.raises(HTTPException) as raised:
+            run(cache, "k", b"body", failing)
+        assert raised.value.status_code == 503
+    assert len(calls) == 2
+
+
+def test_reused_key_with_another_body_is_refused():
+    cache = IdempotencyCache()
+
+    async def created(request):
+        return FastJSONResponse({"body": (await request.body()).decode()})
+
+    assert run(cache, "k", b"first", created).status_code == 200
+    with pytest.raises(HTTPException) as raised:
+        run(cache, "k", b"second", created)
+    assert raised.value.status_code == 422
+
+
+def test_ndjson_batch_retry_is_replayed():
+    from api.app import app
+
+    body = b'{"account_id": 1, "amount": 5.0, "transaction_type": "deposit"}\nnot json\n'
+    headers = {"Content-Type": "application/x-ndjson", "Idempotency-Key": "batch-1"}
+    with TestClient(app) as client:
+        first = client.post("/transactions/batch", content=body, headers=headers, auth=ADMIN)
+        second = client.post("/transactions/batch", content=body, headers=headers, auth=ADMIN)
+        changed = client.post("/transactions/batch", content=body + b"\n\n", headers=headers, auth=ADMIN)
+
+    assert first.status_code == 200
+    assert (second.status_code, second.content) == (200, first.content)
+    assert second.headers[REPLAYED_HEADER] == "true"
+    assert changed.status_code == 422
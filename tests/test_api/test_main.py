@@ -0,0 +1,55 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from domain.services.account_service import BankAccountService
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # importing the app opens the default limits file in the cwd
+    from api import main
+    monkeypatch.setattr(main, "service", BankAccountService(limits_file=str(tmp_path / "limits.json")))
+    with TestClient(main.app) as client:
+        yield client
+
+
+def test_accounts_and_transactions_round_trip(client):
+    created = client.post("/accounts", json={"account_type": "checking"})
+    assert created.status_code == 200
+    account_id = created.json()["id"]
+    assert created.json() == {"id": account_id, "account_type": "checking", "balance": 0.0, "status": "active"}
+
+    url = f"/accounts/{account_id}/transactions"
+    for _ in range(2):  # the retry is answered from the idempotency cache
+        deposit = client.post(url, json={"amount": 50.0, "type": "deposit"}, headers={"Idempotency-Key": "k1"})
+        assert deposit.status_code == 200
+    assert client.post(url, json={"amount": 20.0, "type": "withdraw"}).json()["type"] == "withdraw"
+    declined = client.post(url, json={"amount": 500.0, "type": "withdraw"})
+    assert declined.status_code == 400
+    assert client.get("/accounts").json()[0]["balance"] == 30.0
+
+    first = client.get(url, params={"limit": 1})
+    assert [tx["type"] for tx in first.json()] == ["deposit"]
+    second = client.get(url, params={"limit": 1, "cursor": first.headers["X-Next-Cursor"]})
+    assert [tx["type"] for tx in second.json()] == ["withdraw"]
+    assert "X-Next-Cursor" not in second.headers
+
+    streamed = client.get(url, headers={"Accept": "application/x-ndjson"})
+    assert [json.loads(line)["amount"] for line in streamed.text.splitlines()] == [50.0, 20.0]
+
+
+def test_unknown_account_is_a_client_error(client):
+    assert client.get("/accounts/missing/transactions").status_code == 404
+    assert client.post("/accounts/missing/transactions", json={"amount": 1.0, "type": "deposit"}).status_code == 400
+
+
+def test_metrics_endpoint_exposes_service_operations(client):
+    account_id = client.post("/accounts", json={"account_type": "checking"}).json()["id"]
+    client.post(f"/accounts/{account_id}/transactions", json={"amount": 5.0, "type": "deposit"})
+
+    metrics = client.get("/metrics")
+    assert metrics.headers["content-type"].startswith("text/plain")
+    assert 'bank_operations_total{operation="execute_transaction",outcome="success"}' in metrics.text
+    assert 'bank_operation_duration_seconds_count{operation="limit_check"}' in metrics.text
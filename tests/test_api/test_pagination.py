@@ -0,0 +1,68 @@
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api import serialization
+from api.app import app
+from api.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor, keyset_page
+
+ADMIN = ("admin", "secret")
+START = datetime(2025, 1, 1)
+
+
+def test_cursor_round_trips_and_rejects_garbage():
+    assert decode_cursor(encode_cursor(START, 42)) == (START, 42)
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+
+def test_keyset_pages_cover_every_row_once():
+    rows = [(START + timedelta(seconds=n // 2), n) for n in range(25)]  # timestamps repeat, ids break the tie
+    seen, after, pages = [], None, 0
+    while True:
+        page, cursor = keyset_page(rows, key=lambda row: row, after=after, limit=10)
+        seen.extend(page)
+        pages += 1
+        if cursor is None:
+            break
+        after = decode_cursor(cursor)
+    assert seen == rows
+    assert pages == 3
+
+
+def test_ndjson_is_produced_lazily_in_chunks(monkeypatch):
+    monkeypatch.setattr(serialization, "NDJSON_CHUNK_ROWS", 2)
+    produced = []
+
+    def rows():
+        for n in range(5):
+            produced.append(n)
+            yield {"n": n}
+
+    chunks = serialization.ndjson_lines(rows())
+    assert next(chunks) == b'{"n":0}\n{"n":1}\n'
+    assert produced == [0, 1]  # nothing past the first chunk has been generated
+    assert b"".join(chunks) == b'{"n":2}\n{"n":3}\n{"n":4}\n'
+
+
+def test_history_endpoint_pages_and_streams():
+    with TestClient(app) as client:
+        account_id = client.post("/accounts/", json={"name": "paged", "initial_balance": 0.0}, auth=ADMIN).json()["id"]
+        for amount in (1.0, 2.0, 3.0):
+            client.post("/transactions/", json={"account_id": account_id, "amount": amount,
+                                                "transaction_type": "deposit"}, auth=ADMIN)
+
+        url = f"/transactions/account/{account_id}"
+        first = client.get(url, params={"limit": 2}, auth=ADMIN)
+        second = client.get(url, params={"limit": 2, "cursor": first.headers[NEXT_CURSOR_HEADER]}, auth=ADMIN)
+        streamed = client.get(url, headers={"Accept": "application/x-ndjson"}, auth=ADMIN)
+        invalid = client.get(url, params={"cursor": "???"}, auth=ADMIN)
+
+    assert [tx["amount"] for tx in first.json()] == [1.0, 2.0]
+    assert [tx["amount"] for tx in second.json()] == [3.0]
+    assert NEXT_CURSOR_HEADER not in second.headers
+    assert streamed.headers["content-type"].startswith("application/x-ndjson")
+    assert [json.loads(line)["amount"] for line in streamed.text.splitlines()] == [1.0, 2.0, 3.0]
+    assert invalid.status_code == 400
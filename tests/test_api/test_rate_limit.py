@@ -0,0 +1,69 @@
+import json
+
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from api.rate_limit import RateLimitMiddleware, TokenBucketTable
+
+ADMIN = ("admin", "secret")
+
+
+async def accepted(request):
+    await request.body()
+    return JSONResponse({"ok": True})
+
+
+def client(user_burst=5, account_burst=3):
+    app = Starlette(routes=[Route("/transactions/", accepted, methods=["POST"]),
+                            Route("/transactions/batch", accepted, methods=["POST"]),
+                            Route("/accounts/{account_id}", accepted, methods=["GET"])])
+    limited = RateLimitMiddleware(app, user_rate=0.001, user_burst=user_burst,
+                                  account_rate=0.001, account_burst=account_burst)
+    return TestClient(limited)
+
+
+def batch(*account_ids):
+    return {"transactions": [{"account_id": account_id, "amount": 1.0, "transaction_type": "deposit"}
+                             for account_id in account_ids]}
+
+
+def test_cost_above_burst_is_refused_and_takes_nothing():
+    table = TokenBucketTable(rate=1.0, burst=10.0)
+    assert table.try_acquire("k", now=0.0, cost=11) == float("inf")
+    assert table.try_acquire("k", now=0.0, cost=10) == 0.0
+
+
+def test_unverified_usernames_do_not_spend_a_users_tokens():
+    api = client(user_burst=2)
+    for _ in range(3):  # a wrong password is limited by address, not as admin
+        api.get("/accounts/1", auth=("admin", "wrong"))
+    assert api.get("/accounts/1", auth=ADMIN).status_code == 200
+    assert api.get("/accounts/1", auth=ADMIN).status_code == 200
+    assert api.get("/accounts/1", auth=ADMIN).status_code == 429
+
+
+def test_made_up_usernames_share_the_address_bucket():
+    api = client(user_burst=2)
+    statuses = [api.get("/accounts/1", auth=(f"user{n}", "x")).status_code for n in range(3)]
+    assert statuses == [200, 200, 429]
+
+
+def test_batch_is_charged_per_transaction():
+    api = client(user_burst=5, account_burst=3)
+    assert api.post("/transactions/batch", json=batch(1, 1, 2), auth=ADMIN).status_code == 200
+    # Account 1 has one token left, so two more items for it are refused, and nothing is spent
+    assert api.post("/transactions/batch", json=batch(1, 1), auth=ADMIN).status_code == 429
+    assert api.post("/transactions/", json=batch(1)["transactions"][0], auth=ADMIN).status_code == 200
+
+
+@pytest.mark.parametrize("account_ids", [[1, 2, 3, 4, 5, 6], [1, 1, 1, 1]])
+def test_batch_above_the_burst_is_rejected_not_discounted(account_ids):
+    api = client(user_burst=5, account_burst=3)
+    response = api.post("/transactions/batch", json=batch(*account_ids), auth=ADMIN)
+    assert response.status_code == 413
+    assert "limit" in json.loads(response.content)["detail"]
+    # The rejected batch spent nothing
+    assert api.post("/transactions/batch", json=batch(1, 2, 3), auth=ADMIN).status_code == 200
@@ -0,0 +1,62 @@
+import asyncio
+import threading
+
+from api.read_model import AccountReadModel
+
+
+def test_visible_waits_without_blocking_the_event_loop():
+    model = AccountReadModel()
+    gate = threading.Event()
+    apply = model._apply
+
+    def held_apply(changes):
+        gate.wait()
+        apply(changes)
+
+    model._apply = held_apply
+
+    async def scenario():
+        model.publish(accounts=[{"id": 1, "version": 1, "balance": 10.0}])
+        waiter = asyncio.ensure_future(model.visible(timeout=5))
+        ticks = 0
+        while ticks < 3:  # the loop keeps running other work while the write is pending
+            await asyncio.sleep(0)
+            ticks += 1
+        assert not waiter.done()
+        gate.set()
+        return await waiter
+
+    assert asyncio.run(scenario()) is True
+    assert model.account(1) == (1, b'{"id":1,"version":1,"balance":10.0}')
+
+
+def test_visible_times_out_and_returns_false():
+    model = AccountReadModel()
+    gate = threading.Event()
+    apply = model._apply
+    model._apply = lambda changes: (gate.wait(), apply(changes))
+    model.publish(accounts=[{"id": 1, "version": 1}])
+
+    assert asyncio.run(model.visible(timeout=0.01)) is False
+    gate.set()
+
+    # The waiter's loop is gone; projection carries on regardless
+    async def later():
+        model.publish(accounts=[{"id": 2, "version": 1}])
+        return await model.visible(timeout=5)
+
+    assert asyncio.run(later()) is True
+    assert model.account(2) is not None
+
+
+def test_a_bad_change_is_skipped_and_projection_continues():
+    model = AccountReadModel()
+
+    async def scenario():
+        model.publish(accounts=[{"id": 1}])  # no version: cannot be projected
+        model.publish(accounts=[{"id": 2, "version": 3}])
+        return await model.visible(timeout=5)
+
+    assert asyncio.run(scenario()) is True
+    assert model.account(1) is None
+    assert model.account(2)[0] == 3
@@ -0,0 +1,59 @@
+import copy
+import pickle
+from datetime import datetime
+
+import pytest
+
+from domain.models.account import CheckingAccount
+from domain.models.transaction import DepositTransaction, TransactionType
+from domain.services.transaction_service import (Account, InMemoryAccountRepository, InMemoryTransactionRepository,
+                                                 TransactionUseCase)
+
+
+@pytest.fixture
+def account_with_history():
+    account = CheckingAccount("ACC-1", 100.0)
+    for day in range(1, 6):
+        deposit = DepositTransaction(10.0, account.account_id)
+        deposit.timestamp = datetime(2025, 4, day)
+        account.deposit(10.0, deposit)
+    account.withdraw(25.0)
+    return account
+
+
+def test_copy_of_account_with_history_is_independent(account_with_history):
+    stored = copy.deepcopy(account_with_history)
+
+    assert stored.balance == account_with_history.balance == 125.0
+    assert stored.version == account_with_history.version
+    assert stored.get_transaction_history() == account_with_history.get_transaction_history()
+    assert stored.balance_as_of(datetime(2025, 4, 3, 12)) == account_with_history.balance_as_of(datetime(2025, 4, 3, 12))
+
+    stored.deposit(50.0)
+    assert len(stored.transaction_history) == len(account_with_history.transaction_history) + 1
+    assert account_with_history.balance == 125.0
+
+
+def test_pickled_account_with_history_reloads(account_with_history):
+    reloaded = pickle.loads(pickle.dumps(account_with_history))
+
+    assert reloaded.balance == 125.0
+    assert [t.transaction_id for t in reloaded.get_transaction_history()] == \
+           [t.transaction_id for t in account_with_history.get_transaction_history()]
+    assert reloaded.withdraw(5.0)
+
+
+def test_use_case_saves_and_reloads_account():
+    accounts = InMemoryAccountRepository()
+    accounts.accounts[1] = Account(1, 100.0)
+    use_case = TransactionUseCase(accounts, InMemoryTransactionRepository())
+
+    use_case.execute_transaction(1, 40.0, TransactionType.DEPOSIT)
+    use_case.execute_transaction(1, 30.0, TransactionType.WITHDRAW)
+
+    reloaded = accounts.find_by_id(1)
+    assert reloaded.balance == 110.0
+    assert reloaded.version == 2
+    assert [t.type for t in use_case.get_account_transactions(1)] == [TransactionType.DEPOSIT, TransactionType.WITHDRAW]
+    with pytest.raises(ValueError):
+        use_case.execute_transaction(1, 10.0, TransactionType.TRANSFER)
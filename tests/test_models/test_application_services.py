@@ -0,0 +1,95 @@
+import threading
+
+import pytest
+
+from application.services import AccountCreationService, TransactionService
+from domain.exceptions import InsufficientFunds
+from domain.models.transaction import TransactionType
+from infrastructure.api.repositories.memory.account_repository import (InMemoryAccountRepository,
+                                                                       InMemoryTransactionRepository)
+
+
+class RecordingSender:
+    def __init__(self):
+        self.messages = []
+
+    def send(self, message: str) -> None:
+        self.messages.append(message)
+
+
+@pytest.fixture
+def accounts():
+    return InMemoryAccountRepository()
+
+
+@pytest.fixture
+def service(accounts):
+    return TransactionService(accounts, InMemoryTransactionRepository(), RecordingSender())
+
+
+@pytest.fixture
+def account_id(accounts):
+    return AccountCreationService(accounts).create_account("checking", owner_id="user1", initial_deposit=100.0)
+
+
+def test_deposit_withdraw_and_transfer_through_the_repository(accounts, service, account_id):
+    other_id = AccountCreationService(accounts).create_account("savings", owner_id="user2", initial_deposit=200.0)
+
+    service.deposit(account_id, 50.0)
+    service.withdraw(account_id, 30.0)
+    service.transfer(account_id, other_id, 20.0)
+    with pytest.raises(InsufficientFunds):
+        service.withdraw(account_id, 1000.0)
+
+    assert accounts.get_account_by_id(account_id).balance == 100.0
+    assert accounts.get_account_by_id(other_id).balance == 220.0
+    assert [txn.transaction_type for txn in accounts.get_transaction_history(account_id)] == [
+        TransactionType.DEPOSIT, TransactionType.DEPOSIT, TransactionType.WITHDRAW, TransactionType.TRANSFER]
+    assert len(service.notification_sender.messages) == 3
+
+
+def test_conflicting_write_is_retried_on_a_fresh_copy(accounts, service, account_id):
+    load = accounts.get_account_by_id
+    interfered = []
+
+    def load_then_race(requested_id):
+        account = load(requested_id)
+        if not interfered:
+            # Another writer commits between this read and the write back
+            interfered.append(True)
+            rival = load(requested_id)
+            rival.deposit(5.0)
+            accounts.update_account(rival, rival.version - 1)
+        return account
+
+    accounts.get_account_by_id = load_then_race
+    service.deposit(account_id, 10.0)
+    accounts.get_account_by_id = load
+
+    stored = accounts.get_account_by_id(account_id)
+    assert stored.balance == 115.0
+    assert stored.version == 3
+    assert len(accounts.get_transaction_history(account_id)) == 3  # the failed attempt left nothing behind
+
+
+def test_concurrent_withdrawals_never_overdraw(accounts, service, account_id):
+    results = []
+
+    def withdraw():
+        for _ in range(10):
+            try:
+                service.withdraw(account_id, 1.0)
+                results.append(True)
+            except InsufficientFunds:
+                results.append(False)
+
+    threads = [threading.Thread(target=withdraw) for _ in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stored = accounts.get_account_by_id(account_id)
+    assert results.count(True) == 100
+    assert stored.balance == 0.0
+    assert len(accounts.get_transaction_history(account_id)) == 101
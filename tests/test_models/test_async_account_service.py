@@ -0,0 +1,69 @@
+import asyncio
+import json
+
+import pytest
+
+from domain.models.notifications import Notification, NotificationService
+from domain.services.async_account_service import (AsyncBankAccountService, GroupCommitTransactionLog,
+                                                   ThreadedNotifier)
+
+
+class RecordingNotification(Notification):
+    def __init__(self):
+        self.sent = []
+
+    def send(self, message: str, recipient: str) -> bool:
+        self.sent.append((recipient, message))
+        return True
+
+
+@pytest.fixture
+def log_path(tmp_path):
+    return str(tmp_path / "transactions.jsonl")
+
+
+def test_deposit_withdraw_and_transfer_complete_end_to_end(log_path):
+    notifications = NotificationService()
+    transaction_log = GroupCommitTransactionLog(log_path)
+    service = AsyncBankAccountService(notifier=ThreadedNotifier(notifications), transaction_log=transaction_log)
+
+    async def scenario():
+        source = await service.create_account("checking", 10.0, owner_id="user1")
+        target = await service.create_account("savings", 200.0, owner_id="user2")
+        inbox = RecordingNotification()
+        notifications.subscribe(source.account_id, inbox)
+
+        assert await service.deposit(source.account_id, 5.0)
+        assert await service.withdraw(source.account_id, 3.0)
+        assert await service.transfer(source.account_id, target.account_id, 2.0)
+        assert not await service.withdraw(source.account_id, 100.0)
+        return source, target, inbox
+
+    try:
+        source, target, inbox = asyncio.run(scenario())
+    finally:
+        transaction_log.close()
+
+    assert source.balance == 10.0
+    assert target.balance == 202.0
+    assert [recipient for recipient, _ in inbox.sent] == [source.account_id] * 3
+    with open(log_path) as f:
+        logged = [json.loads(line) for line in f]
+    assert [entry["type"] for entry in logged] == ["DEPOSIT", "WITHDRAW", "TRANSFER"]
+
+
+def test_concurrent_transfers_conserve_money():
+    service = AsyncBankAccountService()
+
+    async def scenario():
+        first = await service.create_account("checking", 500.0)
+        second = await service.create_account("checking", 500.0)
+        transfers = [service.transfer(first.account_id, second.account_id, 1.0) for _ in range(100)]
+        transfers += [service.transfer(second.account_id, first.account_id, 2.0) for _ in range(100)]
+        results = await asyncio.gather(*transfers)
+        return first, second, results
+
+    first, second, results = asyncio.run(scenario())
+    assert all(results)
+    assert first.balance + second.balance == 1000.0
+    assert first.balance == 600.0
@@ -9,6 +9,7 @@ from domain.models.transaction import TransactionType, DepositTransaction, Withd
 from domain.services.account_service import BankAccountService
 from domain.services.interest_service import InterestService
 from domain.services.limit_enforcement_service import LimitEnforcementService
+from domain.models.statement import StatementGenerator
 from domain.services.statement_service import StatementService
 
 class TestBankServices(unittest.TestCase):
@@ -33,9 +34,9 @@ class TestBankServices(unittest.TestCase):
     def test_interest_calculation_accuracy(self):
         """Test that interest is correctly calculated and applied to savings accounts."""
         # Interest rate: 2% annual, compounded monthly -> 0.02 / 12 = 0.00166667 per month
-        # Balance: $1000 -> Expected interest: $1000 * 0.00166667 = $1.66667
+        # Balance: $1000 -> $1000 * 0.00166667 = $1.66667, credited rounded half-up to the cent: $1.67
         self.assertTrue(self.interest_service.apply_interest_to_account(self.savings_account.account_id))
-        expected_interest = 1000.0 * (0.02 / 12)
+        expected_interest = 1.67
         self.assertAlmostEqual(self.savings_account.interest_accrued, expected_interest, places=5)
         self.assertAlmostEqual(self.savings_account.balance, 1000.0 + expected_interest, places=5)
 
@@ -55,12 +56,12 @@ class TestBankServices(unittest.TestCase):
         self.assertEqual(success_count, 2)  # Only the two savings accounts should succeed
 
         # Verify interest for savings_account
-        expected_interest1 = 1000.0 * (0.02 / 12)
+        expected_interest1 = 1.67  # $1000 * 0.02 / 12, rounded to the cent
         self.assertAlmostEqual(self.savings_account.interest_accrued, expected_interest1, places=5)
         self.assertAlmostEqual(self.savings_account.balance, 1000.0 + expected_interest1, places=5)
 
         # Verify interest for savings_account2
-        expected_interest2 = 2000.0 * (0.02 / 12)
+        expected_interest2 = 3.33  # $2000 * 0.02 / 12, rounded to the cent
         self.assertAlmostEqual(savings_account2.interest_accrued, expected_interest2, places=5)
         self.assertAlmostEqual(savings_account2.balance, 2000.0 + expected_interest2, places=5)
 
@@ -76,7 +77,8 @@ class TestBankServices(unittest.TestCase):
         # Try to deposit another $2,000 (total $11,000, exceeds limit)
         self.assertFalse(self.limit_service.check_limit(self.savings_account.account_id, 2000.0))
 
-        # Verify the limits file
+        # Verify the limits file, once the logged changes are folded into it
+        self.limit_service.snapshot()
         with open("transaction_limits.json", "r") as f:
             limits = json.load(f)
             self.assertAlmostEqual(limits[self.savings_account.account_id]["daily_limit_used"], 9000.0, places=2)
@@ -89,50 +91,84 @@ class TestBankServices(unittest.TestCase):
         # Try to deposit another $2,000 (total $31,000, exceeds limit)
         self.assertFalse(self.limit_service.check_limit(self.savings_account.account_id, 2000.0))
 
-        # Verify the limits file
+        # Verify the limits file, once the logged changes are folded into it
+        self.limit_service.snapshot()
         with open("transaction_limits.json", "r") as f:
             limits = json.load(f)
             self.assertAlmostEqual(limits[self.savings_account.account_id]["monthly_limit_used"], 29000.0, places=2)
 
     def test_daily_limit_reset(self):
         """Test that daily limits reset correctly."""
-        # Set a transaction and update the daily limit
-        self.limit_service.check_limit(self.savings_account.account_id, 5000.0)
+        with patch("domain.services.limit_enforcement_service.datetime") as mock_datetime:
+            # Set a transaction and update the daily limit
+            mock_datetime.now.return_value = datetime(2025, 5, 4, 10, 0, 0)
+            self.limit_service.check_limit(self.savings_account.account_id, 6000.0)
 
-        # Mock the date to simulate a new day
-        with patch("datetime.datetime") as mock_datetime:
+            # Simulate a new day
             mock_datetime.now.return_value = datetime(2025, 5, 5, 10, 0, 0)
-            mock_datetime.side_effect = lambda *args, **kwargs: datetime(*args, **kwargs)
             self.limit_service.reset_limits_daily()
 
-        # Verify the daily limit is reset
-        with open("transaction_limits.json", "r") as f:
-            limits = json.load(f)
-            self.assertEqual(limits[self.savings_account.account_id]["daily_limit_used"], 0.0)
-            self.assertEqual(limits[self.savings_account.account_id]["daily_reset"], "2025-05-05")
+            # Verify the daily limit is reset
+            with open("transaction_limits.json", "r") as f:
+                limits = json.load(f)
+                self.assertEqual(limits[self.savings_account.account_id]["daily_limit_used"], 0.0)
+                self.assertEqual(limits[self.savings_account.account_id]["daily_reset"], "2025-05-05")
+                self.assertEqual(limits[self.savings_account.account_id]["monthly_limit_used"], 6000.0)
 
-        # Check that we can now make a new transaction
-        self.assertTrue(self.limit_service.check_limit(self.savings_account.account_id, 5000.0))
+            # Check that we can now make a new transaction
+            self.assertTrue(self.limit_service.check_limit(self.savings_account.account_id, 6000.0))
 
     def test_monthly_limit_reset(self):
         """Test that monthly limits reset correctly."""
-        # Set a transaction and update the monthly limit
-        self.limit_service.check_limit(self.savings_account.account_id, 15000.0)
-
-        # Mock the date to simulate a new month
-        with patch("datetime.datetime") as mock_datetime:
+        with patch("domain.services.limit_enforcement_service.datetime") as mock_datetime:
+            # Set transactions on two days and update the monthly limit
+            mock_datetime.now.return_value = datetime(2025, 5, 30, 10, 0, 0)
+            self.limit_service.check_limit(self.savings_account.account_id, 10000.0)
+            mock_datetime.now.return_value = datetime(2025, 5, 31, 10, 0, 0)
+            self.limit_service.check_limit(self.savings_account.account_id, 10000.0)
+
+            # Simulate a new month
             mock_datetime.now.return_value = datetime(2025, 6, 1, 10, 0, 0)
-            mock_datetime.side_effect = lambda *args, **kwargs: datetime(*args, **kwargs)
-            self.limit_service.reset_limits_monthly()
+            self.limit_service.reset_monthly_limits()
+
+            # Verify the monthly limit is reset
+            with open("transaction_limits.json", "r") as f:
+                limits = json.load(f)
+                self.assertEqual(limits[self.savings_account.account_id]["monthly_limit_used"], 0.0)
+                self.assertEqual(limits[self.savings_account.account_id]["monthly_reset"], "2025-06-01")
+
+            # Check that we can now make a new transaction
+            self.assertTrue(self.limit_service.check_limit(self.savings_account.account_id, 10000.0))
+
+    def test_limits_reset_lazily_on_the_next_check(self):
+        """Test that a new day or month frees the limit without any reset call."""
+        account_id = self.savings_account.account_id
+        with patch("domain.services.limit_enforcement_service.datetime") as mock_datetime:
+            mock_datetime.now.return_value = datetime(2025, 5, 31, 23, 59, 0)
+            self.assertTrue(self.limit_service.check_limit(account_id, 10000.0))
+            self.assertFalse(self.limit_service.check_limit(account_id, 1.0))
+
+            mock_datetime.now.return_value = datetime(2025, 6, 1, 0, 1, 0)
+            self.assertTrue(self.limit_service.check_limit(account_id, 10000.0))
+            self.assertEqual(self.limit_service.limits[account_id]["daily_limit_used"], 1000000)
+            self.assertEqual(self.limit_service.limits[account_id]["monthly_limit_used"], 1000000)
+
+    def test_ended_periods_are_written_as_reset(self):
+        """Test that an account untouched since its day ended is saved with nothing used."""
+        account_id = self.savings_account.account_id
+        with patch("domain.services.limit_enforcement_service.datetime") as mock_datetime:
+            mock_datetime.now.return_value = datetime(2025, 5, 4, 10, 0, 0)
+            self.limit_service.check_limit(account_id, 5000.0)
+
+            mock_datetime.now.return_value = datetime(2025, 5, 6, 10, 0, 0)
+            self.limit_service.snapshot()
+            # The saved file is only a rendering; nothing in memory was swept
+            self.assertEqual(self.limit_service.limits[account_id]["daily_limit_used"], 500000)
 
-        # Verify the monthly limit is reset
         with open("transaction_limits.json", "r") as f:
-            limits = json.load(f)
-            self.assertEqual(limits[self.savings_account.account_id]["monthly_limit_used"], 0.0)
-            self.assertEqual(limits[self.savings_account.account_id]["monthly_reset"], "2025-06-01")
-
-        # Check that we can now make a new transaction
-        self.assertTrue(self.limit_service.check_limit(self.savings_account.account_id, 15000.0))
+            limits = json.load(f)[account_id]
+        self.assertEqual((limits["daily_limit_used"], limits["daily_reset"]), (0.0, "2025-05-06"))
+        self.assertEqual((limits["monthly_limit_used"], limits["monthly_reset"]), (5000.0, "2025-05-01"))
 
     @patch("builtins.open", new_callable=mock_open)
     def test_statement_data_correctness(self, mock_file):
@@ -206,10 +242,25 @@ class TestBankServices(unittest.TestCase):
             self.assertIn(f"2025-04-04,deposit,{expected_interest:.2f},-,{1000.0 + expected_interest:.2f},{expected_interest:.2f}", written_lines)
             self.assertIn(f"Total Interest Accrued,{expected_interest:.2f},,,,", written_lines)
 
+    def test_monthly_statement_for_created_account(self):
+        """Accounts opened through the service keep their type and owner, so statements can be generated."""
+        self.assertEqual(self.savings_account.account_type, AccountType.SAVINGS)
+        self.assertEqual(self.savings_account.owner_id, "user1")
+        self.assertEqual(self.checking_account.account_type, AccountType.CHECKING)
+
+        deposit = DepositTransaction(250.0, self.checking_account.account_id)
+        deposit.timestamp = datetime(2025, 4, 10, 9, 30)
+        self.checking_account.deposit(250.0, deposit)
+
+        statement = StatementGenerator().generate_statement(self.checking_account, 4, 2025)
+        self.assertEqual(statement.account_type, "checking")
+        self.assertEqual(len(statement.transactions), 1)
+        self.assertEqual(float(statement.closing_balance), 750.0)
+
     def tearDown(self):
         """Clean up after each test."""
         # Remove temporary files created during tests
-        for filename in ["transaction_limits.json", "statement_" + self.savings_account.account_id + "_20250504.csv"]:
+        for filename in ["transaction_limits.json", "transaction_limits.json.log", "statement_" + self.savings_account.account_id + "_20250504.csv"]:
             if os.path.exists(filename):
                 os.remove(filename)
 
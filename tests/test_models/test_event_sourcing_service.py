@@ -0,0 +1,105 @@
+import threading
+
+import pytest
+
+from domain.models.account import AccountType
+from domain.models.money import Money
+from domain.services.event_sourcing_service import EventSourcingService
+from domain.services.event_store import EventSourcedLedger
+
+
+@pytest.fixture
+def paths(tmp_path):
+    return str(tmp_path / "events.jsonl"), str(tmp_path / "limits.json")
+
+
+@pytest.fixture
+def service(paths):
+    log_path, limits_file = paths
+    ledger = EventSourcedLedger(log_path, snapshot_interval=5)
+    yield EventSourcingService(ledger, limits_file=limits_file)
+    ledger.close()
+
+
+def restart(service, paths):
+    """A new service over the same files, as after a process restart."""
+    service.ledger.close()
+    service.limit_service.close()
+    log_path, limits_file = paths
+    return EventSourcingService(EventSourcedLedger(log_path, snapshot_interval=5), limits_file=limits_file)
+
+
+def test_concurrent_withdrawals_never_overdraw(service):
+    account = service.create_account("checking", 100.0)
+    results = []
+
+    def withdraw():
+        for _ in range(5):
+            results.append(service.withdraw(account.account_id, 10.0))
+
+    threads = [threading.Thread(target=withdraw) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results.count(True) == 10
+    assert service.get_account(account.account_id).money_balance == Money(0)
+
+
+def test_accounts_come_back_from_the_log_after_a_restart(service, paths):
+    checking = service.create_account("checking", 500.0, owner_id="user1")
+    savings = service.create_account("savings", 1000.0, owner_id="user2")
+    for _ in range(4):
+        assert service.transfer(checking.account_id, savings.account_id, 7.0)
+    assert not service.withdraw(savings.account_id, 950.0)  # below the savings minimum
+    assert service.apply_interest_to_account(savings.account_id)
+    before = service.get_account(savings.account_id)
+
+    checking.deposit(1000.0)  # a returned Account is only a view
+    restarted = restart(service, paths)
+    try:
+        assert restarted.get_account_balance(checking.account_id) == 472.0
+        after = restarted.get_account(savings.account_id)
+        assert (after.money_balance, after.interest_accrued, after.owner_id) == (
+            before.money_balance, before.interest_accrued, "user2")
+        assert after.account_type == AccountType.SAVINGS
+        assert restarted.ledger.load() < 5  # replayed from the snapshot
+    finally:
+        restarted.ledger.close()
+        restarted.limit_service.close()
+
+
+def test_corrupt_snapshot_falls_back_to_a_full_replay(service, paths):
+    account = service.create_account("checking", 100.0)
+    for _ in range(6):
+        assert service.deposit(account.account_id, 1.0)
+    with open(service.ledger.snapshots.path, "w") as f:
+        f.write('{"sequence": 5, "offs')
+
+    restarted = restart(service, paths)
+    try:
+        assert restarted.get_account_balance(account.account_id) == 106.0
+    finally:
+        restarted.ledger.close()
+        restarted.limit_service.close()
+
+
+def test_import_keeps_the_opening_balance_of_an_account_paid_before_its_first_row(tmp_path):
+    csv_path = tmp_path / "transactions.csv"
+    csv_path.write_text(
+        "Transaction ID,Account ID,Type,Amount,Date,Related Account,Balance After\n"
+        "t1,A,DEPOSIT,10.0,2024-01-01 09:00:00,,110.0\n"
+        "t2,A,TRANSFER,30.0,2024-01-01 10:00:00,B,80.0\n"
+        "t3,B,WITHDRAW,5.0,2024-01-01 11:00:00,,75.0\n"
+    )
+    ledger = EventSourcedLedger(str(tmp_path / "events.jsonl"))
+    try:
+        assert ledger.import_csv(str(csv_path)) == 3
+        assert ledger.balance("A") == Money.of(80)
+        assert ledger.balance("B") == Money.of(75)  # opened with 50, paid 30, withdrew 5
+        assert ledger.state("B").opened
+        assert ledger.load() == 6
+        assert ledger.balance("B") == Money.of(75)
+    finally:
+        ledger.close()
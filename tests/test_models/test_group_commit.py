@@ -0,0 +1,65 @@
+import os
+import stat
+import threading
+import time
+
+import pytest
+
+from domain.services.account_service import BankAccountService
+from domain.services.group_commit import GroupCommitWriter, write_atomically
+
+
+def test_lone_writer_is_not_held_for_max_delay(tmp_path):
+    writer = GroupCommitWriter(str(tmp_path / "log"), max_delay=5.0)
+    try:
+        start = time.monotonic()
+        for _ in range(3):
+            writer.append(b"record\n")
+        assert time.monotonic() - start < 2.5
+    finally:
+        writer.close()
+    assert (tmp_path / "log").read_bytes() == b"record\n" * 3
+
+
+def test_concurrent_writers_share_fsyncs(tmp_path):
+    writer = GroupCommitWriter(str(tmp_path / "log"))
+    threads = [threading.Thread(target=lambda: [writer.append(b"x\n") for _ in range(50)]) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    writer.close()
+
+    assert writer.records == 400
+    assert writer.batches < writer.records
+    assert (tmp_path / "log").read_bytes().count(b"\n") == 400
+
+
+@pytest.mark.skipif(os.name != "posix", reason="POSIX permission bits")
+def test_write_atomically_keeps_the_file_mode(tmp_path):
+    path = str(tmp_path / "limits.json")
+    write_atomically(path, b"{}")
+    umask = os.umask(0)
+    os.umask(umask)
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o666 & ~umask
+
+    os.chmod(path, 0o640)
+    write_atomically(path, b'{"a": 1}')
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o640
+    assert open(path, "rb").read() == b'{"a": 1}'
+
+
+def test_limit_files_go_where_they_are_configured(tmp_path, monkeypatch):
+    cwd = tmp_path / "cwd"
+    cwd.mkdir()
+    monkeypatch.chdir(cwd)
+    limits_file = str(tmp_path / "data" / "limits.json")
+    os.makedirs(os.path.dirname(limits_file))
+
+    service = BankAccountService(limits_file=limits_file)
+    account = service.create_account("checking", 100.0)
+    assert service.deposit(account.account_id, 10.0)
+    service.limit_service.close()
+
+    assert sorted(os.listdir(os.path.dirname(limits_file))) == ["limits.json", "limits.json.log"]
+    assert os.listdir(cwd) == []
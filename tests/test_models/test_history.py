@@ -0,0 +1,72 @@
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from domain.models.account import CheckingAccount
+from domain.models.history import TransactionHistory
+from domain.models.money import Money
+from domain.models.transaction import DepositTransaction, WithdrawalTransaction
+from domain.services.account_service import BankAccountService
+
+START = datetime(2025, 4, 1)
+
+
+def entry(account_id: str, cents: int, minutes: int):
+    transaction = DepositTransaction(abs(cents) / 100, account_id)
+    transaction.timestamp = START + timedelta(minutes=minutes)
+    return transaction, Money(cents)
+
+
+def replayed_balance(opening: int, entries, timestamp: datetime) -> Money:
+    return Money(opening + sum(amount.cents for transaction, amount in entries if transaction.timestamp <= timestamp))
+
+
+def test_checkpoints_match_a_full_replay_after_back_dated_appends_and_removals():
+    rng = random.Random(7)
+    history = TransactionHistory(Money(10000), checkpoint_interval=4)
+    recorded = []
+    for _ in range(60):
+        transaction, amount = entry("ACC-1", rng.randint(-500, 500) or 1, rng.randint(0, 1000))
+        history.append(transaction, amount)
+        recorded.append((transaction, amount))
+        if rng.random() < 0.2:
+            removed = recorded.pop(rng.randrange(len(recorded)))
+            assert history.remove(removed[0]) == removed[1]
+
+    assert [t.timestamp for t in history] == sorted(t.timestamp for t, _ in recorded)
+    assert history.closing_balance == replayed_balance(10000, recorded, datetime.max)
+    for minutes in range(-1, 1002, 7):
+        moment = START + timedelta(minutes=minutes)
+        assert history.balance_as_of(moment) == replayed_balance(10000, recorded, moment)
+
+
+def test_removing_an_unknown_transaction_is_refused():
+    history = TransactionHistory()
+    with pytest.raises(ValueError):
+        history.remove(DepositTransaction(1.0, "ACC-1"))
+
+
+def test_account_balance_as_of():
+    account = CheckingAccount("ACC-1", 100.0)
+    for day, transaction in ((2, DepositTransaction(50.0, "ACC-1")), (3, WithdrawalTransaction(30.0, "ACC-1"))):
+        transaction.timestamp = datetime(2025, 4, day)
+        if transaction.is_credit():
+            account.deposit(transaction.amount, transaction)
+        else:
+            account.withdraw(transaction.amount, transaction)
+
+    assert account.balance_as_of(datetime(2025, 4, 1)) == Money.of(100.0)
+    assert account.balance_as_of(datetime(2025, 4, 2)) == Money.of(150.0)  # inclusive of the moment itself
+    assert account.balance_as_of(datetime(2025, 4, 30)) == Money.of(120.0)
+
+
+def test_service_balance_as_of_returns_money(tmp_path):
+    service = BankAccountService(limits_file=str(tmp_path / "limits.json"))
+    account = service.create_account("checking", 100.0)
+    service.deposit(account.account_id, 25.0)
+
+    assert service.balance_as_of(account.account_id, datetime.now()) == Money.of(125.0)
+    assert service.balance_as_of(account.account_id, datetime(2000, 1, 1)) == Money.of(100.0)
+    assert service.balance_as_of("missing", datetime.now()) is None
+    service.limit_service.close()
@@ -0,0 +1,69 @@
+import json
+import logging
+from logging.handlers import QueueHandler
+
+import pytest
+
+from domain.services.account_service import BankAccountService
+from domain.services.logging_service import LoggingService, configure_logging, shutdown_logging
+
+
+@pytest.fixture
+def log_file(tmp_path):
+    shutdown_logging()
+    filename = tmp_path / "operations.log"
+    configure_logging(str(filename))
+    yield filename
+    shutdown_logging()
+
+
+@pytest.fixture
+def service(tmp_path):
+    service = BankAccountService(limits_file=str(tmp_path / "limits.json"))
+    yield service
+    service.limit_service.close()
+
+
+def records(log_file):
+    shutdown_logging()  # drains the queue into the file
+    return [json.loads(line) for line in log_file.read_text().splitlines()]
+
+
+def test_operations_are_written_as_json_lines(log_file, service):
+    logged = LoggingService(service, read_sample_rate=0.0)
+    account = logged.create_account("checking", 100.0)
+    logged.deposit(account.account_id, 5.0)
+    logged.apply_interest_batch([account.account_id] * 3)
+
+    create, deposit, batch = records(log_file)
+    assert (create["event"], create["level"], create["account_type"]) == ("create_account", "INFO", "checking")
+    assert (deposit["event"], deposit["account_id"], deposit["amount"]) == ("deposit", account.account_id, 5.0)
+    assert batch["account_count"] == 3
+    assert "account_ids" not in batch
+
+
+def test_reads_are_sampled(log_file, service):
+    account = service.create_account("checking", 100.0)
+    LoggingService(service, read_sample_rate=0.0).get_account_balance(account.account_id)
+    assert LoggingService(service, read_sample_rate=1.0).get_account(account.account_id) is account
+
+    (read,) = records(log_file)
+    assert (read["event"], read["sample_rate"]) == ("get_account", 1.0)
+
+
+def test_configure_logging_installs_one_listener(log_file):
+    assert configure_logging("elsewhere.log") is configure_logging(str(log_file))
+    handlers = logging.getLogger("LoggingService").handlers
+    assert sum(isinstance(handler, QueueHandler) for handler in handlers) == 1
+
+
+def test_exceptions_are_rendered_before_crossing_to_the_writer_thread(log_file):
+    logger = logging.getLogger("LoggingService")
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        logger.exception("failed", extra={"fields": {"account_id": "a1"}})
+
+    (failure,) = records(log_file)
+    assert (failure["event"], failure["level"], failure["account_id"]) == ("failed", "ERROR", "a1")
+    assert "ValueError: boom" in failure["exception"]
@@ -0,0 +1,86 @@
+import threading
+
+import pytest
+
+from domain.services.account_service import BankAccountService
+from domain.services.metrics_service import (OPERATION_LATENCY, OPERATIONS_TOTAL, Counter, Histogram, MetricsRegistry,
+                                             instrumented, registry)
+
+
+def operation_count(operation: str, outcome: str) -> float:
+    return registry.counter(OPERATIONS_TOTAL, operation=operation, outcome=outcome).value
+
+
+def test_counter_sums_every_threads_increments():
+    counter = Counter()
+
+    def increment():
+        for _ in range(1000):
+            counter.inc()
+
+    threads = [threading.Thread(target=increment) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert counter.value == 8000
+
+
+def test_histogram_buckets_are_cumulative_and_inclusive():
+    histogram = Histogram(buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value)
+
+    cumulative, count, total = histogram.snapshot()
+    assert cumulative == [2, 3]  # a value equal to a bound falls in that bound's bucket
+    assert count == 4
+    assert total == pytest.approx(3.65)
+
+
+def test_prometheus_rendering():
+    metrics = MetricsRegistry()
+    metrics.counter("ops_total", "Operations", operation="deposit").inc(2)
+    metrics.histogram("latency_seconds", buckets=(0.5,), operation="deposit").observe(0.25)
+
+    assert metrics.render_prometheus().splitlines() == [
+        "# HELP ops_total Operations",
+        "# TYPE ops_total counter",
+        'ops_total{operation="deposit"} 2',
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{operation="deposit",le="0.5"} 1',
+        'latency_seconds_bucket{operation="deposit",le="+Inf"} 1',
+        'latency_seconds_sum{operation="deposit"} 0.25',
+        'latency_seconds_count{operation="deposit"} 1',
+    ]
+
+
+def test_instrumented_counts_outcomes_and_errors():
+    @instrumented("test_instrumented")
+    def operation(result):
+        if result is None:
+            raise ValueError("failed")
+        return result
+
+    operation(True)
+    operation(False)
+    with pytest.raises(ValueError):
+        operation(None)
+
+    assert [operation_count("test_instrumented", outcome) for outcome in ("success", "rejected", "error")] == [1, 1, 1]
+    assert registry.histogram(OPERATION_LATENCY, operation="test_instrumented").snapshot()[1] == 3
+
+
+def test_service_operations_are_counted_once_each(tmp_path):
+    service = BankAccountService(limits_file=str(tmp_path / "limits.json"))
+    account = service.create_account("checking", 100.0)
+    before = {name: operation_count(*name) for name in [
+        ("deposit", "success"), ("withdraw", "rejected"), ("limit_check", "success"),
+        ("notification_dispatch", "sent")]}
+
+    service.deposit(account.account_id, 10.0)
+    service.withdraw(account.account_id, 1000.0)
+
+    after = {name: operation_count(*name) - count for name, count in before.items()}
+    assert after == {("deposit", "success"): 1, ("withdraw", "rejected"): 1, ("limit_check", "success"): 2,
+                     ("notification_dispatch", "sent"): 1}
+    service.limit_service.close()
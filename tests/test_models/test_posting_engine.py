@@ -0,0 +1,89 @@
+import pytest
+
+from domain.models.account import CheckingAccount
+from domain.models.journal import EntrySide, JournalEntry, JournalLine
+from domain.models.money import Money
+from domain.services.account_service import BankAccountService
+from domain.services.posting_engine import PostingEngine
+
+
+class RacedAccount(CheckingAccount):
+    """Passes the batch check, then loses its funds before its leg is applied."""
+    raced = False
+
+    def withdraw(self, amount, transaction=None):
+        return False if self.raced else super().withdraw(amount, transaction)
+
+
+@pytest.fixture
+def accounts():
+    return {"A": CheckingAccount("A", 100.0), "B": RacedAccount("B", 100.0), "C": CheckingAccount("C", 0.0)}
+
+
+def test_failed_batch_leaves_balances_and_histories_as_they_were(accounts):
+    engine = PostingEngine(accounts.get)
+    engine.post(JournalEntry.transfer("A", "C", Money.of(30)))
+    before = {account_id: (account.balance, account.get_transaction_history())
+              for account_id, account in accounts.items()}
+
+    accounts["B"].raced = True
+    with pytest.raises(ValueError):
+        engine.post_many([JournalEntry.transfer("A", "C", Money.of(10)), JournalEntry.transfer("B", "C", Money.of(10))])
+
+    assert {account_id: (account.balance, account.get_transaction_history())
+            for account_id, account in accounts.items()} == before
+    assert len(engine.journal) == 1
+    assert engine.trial_balance().is_balanced
+
+
+class SkimmingAccount(CheckingAccount):
+    """Reports a deposit as applied but credits a cent less."""
+    def deposit(self, amount, transaction=None):
+        return super().deposit(Money.of(amount) - Money(1), transaction)
+
+
+def test_trial_balance_keeps_running_totals(accounts):
+    engine = PostingEngine(accounts.get)
+    engine.post(JournalEntry.transfer("A", "C", Money.of(30)))
+    engine.post(JournalEntry((JournalLine("B", EntrySide.DEBIT, Money.of(5)),
+                              JournalLine("C", EntrySide.CREDIT, Money.of(5)))))
+    accounts["C"].withdraw(1.0)  # outside the journal
+
+    trial = engine.trial_balance()
+    assert (trial.total_debits, trial.total_credits, trial.entries) == (Money.of(35), Money.of(35), 2)
+    assert (trial.account_debits, trial.account_credits) == (Money.of(35), Money.of(35))
+    assert trial.is_balanced
+
+
+def test_trial_balance_flags_balances_that_moved_differently(accounts):
+    accounts["D"] = SkimmingAccount("D", 0.0)
+    engine = PostingEngine(accounts.get)
+    engine.post(JournalEntry.transfer("A", "D", Money.of(30)))
+
+    trial = engine.trial_balance()
+    assert trial.total_debits == trial.total_credits == Money.of(30)
+    assert trial.account_credits == Money.of("29.99")
+    assert not trial.is_reconciled
+    assert not trial.is_balanced
+
+
+def test_journal_keeps_only_recent_entries(accounts):
+    engine = PostingEngine(accounts.get, journal_size=3)
+    for _ in range(5):
+        engine.post(JournalEntry.transfer("A", "C", Money.of(1)))
+
+    assert len(engine.journal) == 3
+    assert engine.trial_balance().entries == 5
+
+
+def test_transfer_notifies_with_the_posted_transaction(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # the limit service keeps its files in the cwd
+    service = BankAccountService()
+    source = service.create_account("checking", 100.0)
+    target = service.create_account("checking", 0.0)
+    notified = []
+    service._notify = notified.append
+
+    assert service.transfer(source.account_id, target.account_id, 10.0)
+    assert notified == [service.posting_engine.journal[-1].transaction]
+    assert source.get_transaction_history()[-1] is notified[0]
@@ -0,0 +1,112 @@
+import pytest
+
+from domain.models.money import Money
+from domain.services.limit_enforcement_service import LimitEnforcementService
+from domain.services.rolling_limits import RollingLimitEngine, RollingWindow, WindowLimit
+
+# Three 10-second buckets: a rolling 30 seconds capped at $1.00
+SHORT = WindowLimit("short", 3, 10, Money(100))
+LONG = WindowLimit("long", 6, 10, Money(150))
+
+
+class Clock:
+    def __init__(self, now: float = 0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+def test_bucket_leaves_the_window_exactly_at_its_boundary(clock):
+    engine = RollingLimitEngine([SHORT], clock)
+    assert engine.check_and_record("A", Money(60))
+
+    clock.now = 29  # bucket 2: bucket 0 is still one of the last three
+    assert not engine.check_and_record("A", Money(50))
+    assert engine.remaining("A") == {"short": Money(40)}
+
+    clock.now = 30  # bucket 3: bucket 0 has just been evicted
+    assert engine.check_and_record("A", Money(50))
+    assert engine.remaining("A") == {"short": Money(50)}
+
+
+def test_buckets_are_evicted_one_at_a_time(clock):
+    engine = RollingLimitEngine([SHORT], clock)
+    for now, cents in [(0, 10), (10, 20), (20, 30)]:
+        clock.now = now
+        assert engine.check_and_record("A", Money(cents))
+
+    used = []
+    for now in (25, 30, 40, 50):
+        clock.now = now
+        used.append(100 - engine.remaining("A")["short"].cents)
+    assert used == [60, 50, 30, 0]
+
+
+def test_a_gap_longer_than_the_window_clears_it():
+    window = RollingWindow(3, 10)
+    window.add(0, 40)
+    window.add(15, 20)
+
+    assert window.used(1000) == 0
+    assert list(window.sums) == [0, 0, 0]
+    window.add(1000, 5)
+    assert window.used(1005) == 5
+
+
+def test_clock_stepping_back_keeps_counting_into_the_newest_bucket():
+    window = RollingWindow(3, 10)
+    window.add(25, 10)
+    window.add(5, 10)  # an earlier timestamp does not reopen an evicted bucket
+
+    assert window.head == 2
+    assert window.used(25) == 20
+    assert window.used(50) == 0
+
+
+def test_refused_amount_is_recorded_in_no_window(clock):
+    engine = RollingLimitEngine([SHORT, LONG], clock)
+    assert engine.check_and_record("A", Money(100))
+    clock.now = 30
+    assert not engine.check_and_record("A", Money(60))  # fits the short window, not the long one
+
+    assert engine.remaining("A") == {"short": Money(100), "long": Money(50)}
+    assert not engine.check_and_record("A", Money(0))
+
+
+def test_records_round_trip_and_a_changed_layout_starts_empty(clock):
+    engine = RollingLimitEngine([SHORT, LONG], clock)
+    engine.check_and_record("A", Money(70))
+    records = engine.to_records()
+
+    restored = RollingLimitEngine([SHORT, LONG], clock)
+    restored.load_records(records)
+    assert restored.remaining("A") == engine.remaining("A")
+
+    resized = RollingLimitEngine([WindowLimit("short", 4, 10, Money(100)), LONG], clock)
+    resized.load_records(records)
+    assert resized.remaining("A") == {"short": Money(100), "long": Money(80)}
+
+
+class Accounts:
+    def get_account(self, account_id):
+        return object()
+
+
+def test_limit_service_keeps_windows_across_restarts(tmp_path, clock):
+    limits_file = str(tmp_path / "limits.json")
+    service = LimitEnforcementService(Accounts(), RollingLimitEngine([SHORT], clock), limits_file=limits_file)
+    assert service.check_limit("A", Money(80))
+    service.close()
+
+    engine = RollingLimitEngine([SHORT], clock)
+    reloaded = LimitEnforcementService(Accounts(), engine, limits_file=limits_file)
+    assert not reloaded.check_limit("A", Money(30))
+    clock.now = 30
+    assert reloaded.check_limit("A", Money(100))
+    reloaded.close()
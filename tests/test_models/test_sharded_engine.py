@@ -0,0 +1,84 @@
+from concurrent.futures import Future
+
+import pytest
+
+from domain.models.notifications import Notification
+from domain.services.sharded_engine import ShardedAccountEngine
+
+
+class RecordingNotification(Notification):
+    def __init__(self):
+        self.sent = []
+
+    def send(self, message: str, recipient: str) -> bool:
+        self.sent.append((recipient, message))
+        return True
+
+
+@pytest.fixture
+def engine(tmp_path):
+    with ShardedAccountEngine(shards=2, limits_file=str(tmp_path / "limits.json")) as engine:
+        yield engine
+
+
+def accounts_on_both_shards(engine, balance=100.0):
+    """A source and a destination account owned by different shards."""
+    source = engine.create_account("checking", balance)
+    while True:
+        target = engine.create_account("checking", 0.0)
+        if engine.shard_of(target) != engine.shard_of(source):
+            return source, target
+
+
+def test_cross_shard_transfer_moves_the_money_and_notifies(engine):
+    source, target = accounts_on_both_shards(engine)
+    inbox = RecordingNotification()
+    engine.notification_service.subscribe(source, inbox)
+
+    assert engine.transfer(source, target, 30.0)
+    assert not engine.transfer(source, target, 80.0)
+    assert engine.get_account_balance(source) == 70.0
+    assert engine.get_account_balance(target) == 30.0
+    assert len(inbox.sent) == 1 and target in inbox.sent[0][1]
+
+
+def test_failed_prepare_vote_aborts_both_legs(engine, monkeypatch):
+    source, target = accounts_on_both_shards(engine)
+    client = engine._clients[engine.shard_of(target)]
+    call = client.call
+
+    def failing_prepare(op, *args):
+        if op != "prepare":
+            return call(op, *args)
+        future = Future()
+        future.set_exception(RuntimeError("shard crashed while voting"))
+        return future
+
+    monkeypatch.setattr(client, "call", failing_prepare)
+    assert not engine.transfer(source, target, 60.0)
+    monkeypatch.undo()
+
+    # The source's hold was released by the abort, so the full balance is available again
+    assert engine.withdraw(source, 100.0)
+    assert engine.get_account_balance(target) == 0.0
+
+
+def test_operations_are_held_to_the_daily_limit(engine):
+    source, target = accounts_on_both_shards(engine, balance=20000.0)
+
+    assert engine.withdraw(source, 6000.0)
+    assert not engine.withdraw(source, 6000.0)
+    assert not engine.transfer(source, target, 5000.0)
+    assert engine.execute_batch([("deposit", target, 9000.0), ("deposit", target, 2000.0)]) == [True, False]
+    assert engine.get_account_balance(source) == 14000.0
+    assert engine.get_account_balance(target) == 9000.0
+
+
+def test_batch_notifies_each_successful_operation(engine):
+    account = engine.create_account("checking", 10.0)
+    inbox = RecordingNotification()
+    engine.notification_service.subscribe(account, inbox)
+
+    assert engine.execute_batch([("deposit", account, 5.0), ("withdraw", account, 50.0),
+                                 ("withdraw", account, 15.0)]) == [True, False, True]
+    assert len(inbox.sent) == 2
@@ -0,0 +1,99 @@
+import csv
+import gzip
+import io
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+
+from domain.models.money import Money, ZERO
+from domain.models.statement import MonthlyStatement, StatementLineItem
+from domain.models.statement_export import COLUMNS, CompressedCSVStatementWriter, open_statement_writer
+
+
+def statement(account_id: str, *lines) -> MonthlyStatement:
+    items = [StatementLineItem(date=datetime(2025, 4, day), description=description, amount=Money.of(amount),
+                               balance=Money.of(balance)) for day, description, amount, balance in lines]
+    return MonthlyStatement(
+        account_id=account_id,
+        account_type="checking",
+        start_date=date(2025, 4, 1),
+        end_date=date(2025, 4, 30),
+        opening_balance=Money.of("100.00"),
+        closing_balance=items[-1].balance if items else Money.of("100.00"),
+        interest_earned=ZERO,
+        transactions=items
+    )
+
+
+STATEMENTS = [
+    statement("acc-1", (2, "Deposit", "10.00", "110.00"), (3, "Withdrawal", "0.01", "109.99")),
+    statement("acc-2"),
+]
+
+
+def write_all(path: str, batch_rows: int = 1) -> None:
+    with open_statement_writer(path, batch_rows) as writer:
+        for item in STATEMENTS:
+            writer.write(item)
+    assert writer.statements == len(STATEMENTS)
+
+
+def test_gzip_csv_has_one_row_per_statement_line(tmp_path):
+    path = str(tmp_path / "statements.csv.gz")
+    write_all(path)
+
+    with gzip.open(path, "rt", newline="") as file:
+        rows = list(csv.reader(file))
+    assert rows[0] == COLUMNS
+    assert rows[1:] == [
+        ["acc-1", "checking", "2025-04-01", "2025-04-30", "100.00", "109.99", "0.00",
+         "2025-04-02", "Deposit", "10.00", "110.00"],
+        ["acc-1", "checking", "2025-04-01", "2025-04-30", "100.00", "109.99", "0.00",
+         "2025-04-03", "Withdrawal", "0.01", "109.99"],
+        ["acc-2", "checking", "2025-04-01", "2025-04-30", "100.00", "100.00", "0.00", "", "", "", ""],
+    ]
+
+
+def test_rows_are_buffered_until_the_batch_fills(tmp_path):
+    path = str(tmp_path / "statements.csv.gz")
+    writer = CompressedCSVStatementWriter(path, batch_rows=3)
+    writer.write(STATEMENTS[0])
+    assert len(writer._rows) == 2
+    writer.write(STATEMENTS[1])
+    assert writer._rows == []
+    writer.close()
+    writer.close()  # closing twice is harmless
+
+
+def test_unknown_extension_is_refused(tmp_path):
+    with pytest.raises(ValueError):
+        open_statement_writer(str(tmp_path / "statements.xlsx"))
+
+
+def test_zstd_csv_round_trips(tmp_path):
+    zstandard = pytest.importorskip("zstandard")
+    path = tmp_path / "statements.csv.zst"
+    write_all(str(path))
+
+    with zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True) as raw:
+        rows = list(csv.reader(io.TextIOWrapper(raw, encoding="utf-8", newline="")))
+    assert [row[0] for row in rows[1:]] == ["acc-1", "acc-1", "acc-2"]
+
+
+@pytest.mark.parametrize("extension", [".arrow", ".parquet"])
+def test_columnar_formats_keep_exact_cents(tmp_path, extension):
+    pyarrow = pytest.importorskip("pyarrow")
+    import pyarrow.ipc
+    import pyarrow.parquet
+
+    path = str(tmp_path / f"statements{extension}")
+    write_all(path)
+
+    if extension == ".arrow":
+        table = pyarrow.ipc.open_file(path).read_all()
+    else:
+        table = pyarrow.parquet.read_table(path)
+    assert table.column_names == COLUMNS
+    assert table.column("amount").to_pylist() == [Decimal("10.00"), Decimal("0.01"), None]
+    assert table.column("account_id").to_pylist() == ["acc-1", "acc-1", "acc-2"]
@@ -0,0 +1,102 @@
+import csv
+import gzip
+import zipfile
+
+import pytest
+
+from domain.services.statement_run import (MonthEndStatementRun, container_filename, main, partition_of,
+                                            statement_filename)
+
+LEDGER_ROWS = [
+    ["t1", "acc-1", "deposit", "100.00", "2025-03-31 23:59:59", "", "100.00"],
+    ["t2", "acc-1", "withdrawal", "30.00", "2025-04-02 09:00:00", "", "70.00"],
+    ["t3", "acc-2", "transfer", "5.00", "2025-04-15 12:00:00", "acc-1", "45.00"],
+    ["t4", "acc-1", "deposit", "10.00", "2025-04-30 23:59:59", "", "80.00"],
+    ["t5", "acc-1", "deposit", "99.00", "2025-05-01 00:00:00", "", "179.00"],
+    ["t6", "acc-3", "deposit", "7.00", "2025-01-10 08:00:00", "", "7.00"],
+]
+
+
+@pytest.fixture
+def ledger(tmp_path):
+    path = tmp_path / "transactions.csv"
+    with open(path, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(["Transaction ID", "Account ID", "Type", "Amount", "Timestamp", "Related", "Balance"])
+        writer.writerows(LEDGER_ROWS)
+    return str(path)
+
+
+def read_statement(text: str):
+    """The summary row and the transaction rows, without the footer."""
+    rows = list(csv.reader(text.splitlines()))
+    return rows[1], rows[4:-2]
+
+
+def test_partitioning_does_not_depend_on_hash_randomization():
+    # Fixed values: a worker started with another PYTHONHASHSEED must pick the same slice
+    assert [partition_of(f"acc-{n}", 8) for n in range(8)] == [7, 1, 3, 5, 6, 0, 2, 4]
+
+
+def test_statements_cover_the_month_only(ledger, tmp_path):
+    output_dir = tmp_path / "statements"
+    report = MonthEndStatementRun(ledger, str(output_dir), month=4, year=2025, workers=2, partitions=4,
+                                  account_types={"acc-1": "checking"}).run()
+
+    assert (report.statements, report.partitions, report.skipped_partitions) == (3, 4, 0)
+    summary, lines = read_statement((output_dir / statement_filename("acc-1", 4, 2025)).read_text())
+    assert summary == ["acc-1", "checking", "2025-04-01", "2025-04-30", "100.00", "80.00", "0.00"]
+    assert [line[1:] for line in lines] == [["Withdrawal", "30.00", "70.00"], ["Deposit", "10.00", "80.00"]]
+
+    # No earlier row: the opening balance is worked back from the first transaction
+    summary, lines = read_statement((output_dir / statement_filename("acc-2", 4, 2025)).read_text())
+    assert summary[4:6] == ["50.00", "45.00"]
+    assert lines[0][1] == "Transfer to acc-1"
+
+    # No activity in the month: opening and closing are the carried-forward balance
+    summary, lines = read_statement((output_dir / statement_filename("acc-3", 4, 2025)).read_text())
+    assert (summary[4:6], lines) == (["7.00", "7.00"], [])
+
+
+def test_archive_holds_every_statement(ledger, tmp_path):
+    output_dir = tmp_path / "statements"
+    MonthEndStatementRun(ledger, str(output_dir), month=4, year=2025, workers=2, partitions=3, archive=True).run()
+
+    with zipfile.ZipFile(output_dir / "statements_202504.zip") as archive:
+        assert sorted(archive.namelist()) == sorted(statement_filename(f"acc-{n}", 4, 2025) for n in (1, 2, 3))
+    assert not (output_dir / statement_filename("acc-1", 4, 2025)).exists()
+
+
+def test_rerun_resumes_from_the_checkpoint(ledger, tmp_path):
+    output_dir = str(tmp_path / "statements")
+    MonthEndStatementRun(ledger, output_dir, month=4, year=2025, workers=1, partitions=2).run()
+
+    resumed = MonthEndStatementRun(ledger, output_dir, month=4, year=2025, workers=1, partitions=2).run()
+    assert (resumed.statements, resumed.skipped_partitions) == (0, 2)
+    with pytest.raises(ValueError):
+        MonthEndStatementRun(ledger, output_dir, month=4, year=2025, workers=1, partitions=3).run()
+
+
+def test_command_line_reports_throughput(ledger, tmp_path, capsys):
+    report = main([ledger, str(tmp_path / "statements"), "--month", "4", "--year", "2025", "--workers", "1"])
+
+    assert report.statements == 3
+    assert report.statements_per_second > 0
+    assert "3 statements in" in capsys.readouterr().out
+
+
+def test_container_format_writes_one_file_per_slice(ledger, tmp_path):
+    output_dir = tmp_path / "statements"
+    report = MonthEndStatementRun(ledger, str(output_dir), month=4, year=2025, workers=2, partitions=2,
+                                  container=".csv.gz").run()
+
+    containers = sorted(output_dir.glob("statements_202504.part-*.csv.gz"))
+    assert [path.name for path in containers] == [container_filename(p, 4, 2025, ".csv.gz") for p in range(2)]
+    account_ids = []
+    for path in containers:
+        with gzip.open(path, "rt", newline="") as file:
+            account_ids.extend(row[0] for row in list(csv.reader(file))[1:])
+    assert sorted(set(account_ids)) == ["acc-1", "acc-2", "acc-3"]
+    assert report.statements == 3
+    with pytest.raises(ValueError):
+        MonthEndStatementRun(ledger, str(output_dir), month=4, year=2025, container=".xlsx")
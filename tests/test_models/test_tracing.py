@@ -0,0 +1,98 @@
+import json
+
+import pytest
+
+from domain.services.account_service import BankAccountService
+from domain.services.tracing import (InMemorySpanExporter, JSONFileSpanExporter, OTLPHttpSpanExporter, Span, Tracer,
+                                     child_span, traced)
+from domain.services.tracing_service import TracingService
+
+
+@pytest.fixture
+def service(tmp_path):
+    service = BankAccountService(limits_file=str(tmp_path / "limits.json"))
+    yield service
+    service.limit_service.close()
+
+
+def test_stages_are_recorded_as_children_of_the_operation(service):
+    exporter = InMemorySpanExporter()
+    traced_service = TracingService(service, Tracer(exporter))
+    account = service.create_account("checking", 100.0)
+
+    assert traced_service.deposit(account.account_id, 10.0)
+
+    spans = exporter.get_spans()
+    root = spans[-1]  # exported root span last
+    assert (root.name, root.parent_id, root.attributes["success"]) == ("deposit", None, True)
+    children = [span.name for span in spans if span.parent_id == root.span_id]
+    assert {"limit_check", "execution", "notification"} <= set(children)
+    assert {span.trace_id for span in spans} == {root.trace_id}
+    assert all(span.end_time_ns >= span.start_time_ns for span in spans)
+
+
+def test_failed_operations_are_exported_with_an_error_status():
+    exporter = InMemorySpanExporter()
+    tracer = Tracer(exporter)
+
+    with pytest.raises(ValueError):
+        with tracer.trace("operation"):
+            with child_span("stage"):
+                raise ValueError("boom")
+
+    stage, root = exporter.get_spans()
+    assert (stage.status, root.status) == ("error", "error")
+    assert stage.attributes["error"] == "ValueError('boom')"
+
+
+def test_unsampled_traces_export_nothing():
+    exporter = InMemorySpanExporter()
+    tracer = Tracer(exporter, sample_rate=0.0)
+
+    @traced("stage")
+    def stage():
+        return 42
+
+    with tracer.trace("operation") as span:
+        span.set_attribute("ignored", True)
+        assert stage() == 42
+    assert exporter.get_spans() == []
+
+
+def test_ring_buffer_keeps_the_most_recent_spans():
+    exporter = InMemorySpanExporter(capacity=2)
+    tracer = Tracer(exporter)
+    for name in ("a", "b", "c"):
+        with tracer.trace(name):
+            pass
+    assert [span.name for span in exporter.get_spans()] == ["b", "c"]
+
+
+def test_json_file_exporter_writes_one_line_per_span(tmp_path):
+    filename = tmp_path / "traces.jsonl"
+    tracer = Tracer(JSONFileSpanExporter(str(filename)))
+    with tracer.trace("operation", account_id="a1"):
+        with child_span("stage"):
+            pass
+
+    records = [json.loads(line) for line in filename.read_text().splitlines()]
+    assert [record["name"] for record in records] == ["stage", "operation"]
+    assert records[0]["parent_id"] == records[1]["span_id"]
+    assert records[1]["attributes"] == {"account_id": "a1"}
+
+
+def test_otlp_exporter_batches_spans_off_the_calling_thread(monkeypatch):
+    exporter = OTLPHttpSpanExporter(max_batch=2, flush_interval=0.05)
+    posted = []
+    monkeypatch.setattr(exporter, "_post", lambda spans: posted.append(exporter._payload(spans)))
+    spans = [Span("ab" * 16, f"{n:016x}", None, f"span-{n}", start_time_ns=n, end_time_ns=n + 1,
+                  attributes={"amount": 5, "ok": True}) for n in range(3)]
+
+    exporter.export(spans)
+    exporter.shutdown()
+
+    exported = [span for payload in posted for span in payload["resourceSpans"][0]["scopeSpans"][0]["spans"]]
+    assert [len(payload["resourceSpans"][0]["scopeSpans"][0]["spans"]) for payload in posted] == [2, 1]
+    assert [span["name"] for span in exported] == ["span-0", "span-1", "span-2"]
+    assert exported[0]["attributes"] == [{"key": "amount", "value": {"intValue": "5"}},
+                                         {"key": "ok", "value": {"boolValue": True}}]